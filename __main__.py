@@ -14,6 +14,8 @@ from __future__ import annotations
 
 from .server import main
 
+__all__ = ("main",)
+
 
 if __name__ == "__main__":
     main()
@@ -9,7 +9,8 @@ This script supports two primary benchmarking modes:
 
 2) Server QPS benchmarks (end-to-end TCP requests):
    - Starts the TCP server as a subprocess using a temporary config.
-   - Sends requests using multiple concurrent clients.
+   - Sends requests using multiple concurrent clients, each holding one
+     persistent connection for the whole run.
    - Measures achieved QPS and latency percentiles.
 
 Results are written as CSV files to the chosen output directory.
@@ -18,37 +19,281 @@ Results are written as CSV files to the chosen output directory.
 from __future__ import annotations
 
 import argparse
+import asyncio
+import contextlib
 import csv
+import functools
+import itertools
+import multiprocessing
+import os
 import random
 import socket
-import statistics
+import struct
 import subprocess
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import timeit
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, Sequence, TextIO
 
 from config import AppConfig
-from search_engine import EngineError, SearchEngine
+from search_engine import (
+    CACHED_ALGOS,
+    REREAD_ALGOS,
+    EngineError,
+    SearchEngine,
+)
 
 
-def percentile(values: list[float], pct: float) -> float:
-    """Compute a simple percentile value from a list.
+RESULT_EXISTS = b"STRING EXISTS\n"
+RESULT_NOT_FOUND = b"STRING NOT FOUND\n"
+RESULT_LINES = frozenset({RESULT_EXISTS, RESULT_NOT_FOUND})
+
+NS_PER_MS = 1_000_000
+NS_PER_S = 1_000_000_000
+
+READ_CHUNK_BYTES = 1 << 20
+WRITE_BUFFER_BYTES = 1 << 20
+GENERATE_CHUNK_LINES = 65536
+
+# Waits shorter than this are spun out instead of slept, since sleep()
+# wakeup jitter is of the same order as sub-millisecond send spacing.
+PACING_SPIN_NS = 500_000
+
+# QPS latencies are kept exactly up to this many requests per run, then
+# summarized by streaming percentile estimators.
+LATENCY_EXACT_SAMPLES = 10_000
+
+# Send/receive buffer size for benchmark client sockets.
+SOCKET_BUFFER_BYTES = 64 * 1024
+
+# Backoff between readiness probes while the server subprocess starts.
+READY_POLL_INTERVAL_S = 0.005
+
+# Untimed queries sent before each QPS run.
+QPS_WARMUP_QUERIES = 50
+# Seed for the warmup queries. It differs from the measured run's
+# seed, so the warmup does not pre-touch the exact queries that are
+# then timed.
+QPS_WARMUP_SEED = 789
+
+# Calls per query when timing sub-microsecond cached lookups.
+CACHED_TIMING_REPEATS = 100
+
+
+@dataclass(frozen=True)
+class AlgoMeta:
+    """Per-algorithm benchmark policy.
+
+    Attributes:
+        reread_modes: reread_on_query values the algorithm is benchmarked
+            with.
+    """
+
+    reread_modes: tuple[bool, ...]
+
+
+# Disk-based algorithms run in both modes; cached ones need the cache.
+ALGO_META: Mapping[str, AlgoMeta] = MappingProxyType(
+    {
+        **{a: AlgoMeta(reread_modes=(True, False)) for a in REREAD_ALGOS},
+        **{a: AlgoMeta(reread_modes=(False,)) for a in CACHED_ALGOS},
+    }
+)
+
+
+ALGO_FIELDS = (
+    "ts",
+    "algo",
+    "reread_on_query",
+    "lines",
+    "queries",
+    "hits",
+    "avg_ms",
+    "p50_ms",
+    "p95_ms",
+    "min_ms",
+    "max_ms",
+    "skipped",
+    "skip_reason",
+)
+
+QPS_FIELDS = (
+    "ts",
+    "algo",
+    "reread_on_query",
+    "lines",
+    "clients",
+    "qps_target",
+    "duration_s",
+    "sent",
+    "ok",
+    "errors",
+    "achieved_qps",
+    "p50_ms",
+    "p95_ms",
+    "skipped",
+    "skip_reason",
+)
+
+
+def percentile(sorted_values: list[float] | list[int], pct: float) -> float:
+    """Compute a simple percentile value from an already sorted list.
+
+    Callers sort once and reuse the sorted list for every percentile they
+    need, rather than paying for a sort per call.
 
     Args:
-        values: List of numeric values.
+        sorted_values: List of numeric values in ascending order.
         pct: Percentile to compute (0-100).
 
     Returns:
         The percentile value, or 0.0 for an empty input list.
     """
-    if not values:
+    if not sorted_values:
         return 0.0
-    values_sorted = sorted(values)
-    k = int(round((pct / 100.0) * (len(values_sorted) - 1)))
-    k = max(0, min(k, len(values_sorted) - 1))
-    return float(values_sorted[k])
+    k = int(round((pct / 100.0) * (len(sorted_values) - 1)))
+    k = max(0, min(k, len(sorted_values) - 1))
+    return float(sorted_values[k])
+
+
+class P2Quantile:
+    """Streaming estimate of one quantile using the P-square algorithm.
+
+    Five markers track the minimum, the target quantile, the maximum and
+    two midpoints, and are nudged toward their ideal positions as samples
+    arrive (Jain & Chlamtac, 1985). Memory stays constant however many
+    samples are added.
+    """
+
+    def __init__(self, pct: float) -> None:
+        """Create an estimator.
+
+        Args:
+            pct: Percentile to estimate (0-100).
+        """
+        q = pct / 100.0
+        self._pct = pct
+        self._heights: list[float] = []
+        self._pos = [1, 2, 3, 4, 5]
+        self._desired = [1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0]
+        self._step = (0.0, q / 2, q, (1 + q) / 2, 1.0)
+
+    def add(self, x: float) -> None:
+        """Add one sample to the estimate.
+
+        Args:
+            x: Sample value.
+        """
+        h = self._heights
+        if len(h) < 5:
+            h.append(x)
+            if len(h) == 5:
+                h.sort()
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+
+        pos = self._pos
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        for i in range(5):
+            self._desired[i] += self._step[i]
+
+        for i in (1, 2, 3):
+            d = self._desired[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (
+                d <= -1 and pos[i - 1] - pos[i] < -1
+            ):
+                s = 1 if d > 0 else -1
+                hp = h[i] + s / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + s)
+                    * (h[i + 1] - h[i])
+                    / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - s)
+                    * (h[i] - h[i - 1])
+                    / (pos[i] - pos[i - 1])
+                )
+                if not h[i - 1] < hp < h[i + 1]:
+                    # Parabolic step overshot a neighbour; fall back to
+                    # linear interpolation toward it.
+                    hp = h[i] + s * (h[i + s] - h[i]) / (pos[i + s] - pos[i])
+                h[i] = hp
+                pos[i] += s
+
+    def value(self) -> float:
+        """Return the current estimate, or 0.0 if no samples were added."""
+        if len(self._heights) < 5:
+            return percentile(sorted(self._heights), self._pct)
+        return float(self._heights[2])
+
+
+class LatencyStats:
+    """Bounded-memory summary of QPS request outcomes.
+
+    Counts successes and failures and keeps latencies exactly for up to
+    LATENCY_EXACT_SAMPLES requests. Past that, samples are streamed into
+    P-square estimators for p50/p95, so long or high-rate runs keep
+    constant memory instead of one sample per request.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty summary."""
+        self.ok = 0
+        self.errors = 0
+        self._samples: list[int] | None = []
+        self._p50 = P2Quantile(50)
+        self._p95 = P2Quantile(95)
+
+    @property
+    def count(self) -> int:
+        """Number of requests recorded."""
+        return self.ok + self.errors
+
+    def record(self, ok: bool, latency_ns: int) -> None:
+        """Record one request outcome.
+
+        Args:
+            ok: True if a valid result line was received.
+            latency_ns: Round-trip duration in integer nanoseconds.
+        """
+        if ok:
+            self.ok += 1
+        else:
+            self.errors += 1
+
+        samples = self._samples
+        if samples is not None:
+            samples.append(latency_ns)
+            if len(samples) < LATENCY_EXACT_SAMPLES:
+                return
+            # Switch to streaming: replay the buffer, then drop it.
+            self._samples = None
+            for ns in samples:
+                self._p50.add(ns)
+                self._p95.add(ns)
+            return
+
+        self._p50.add(latency_ns)
+        self._p95.add(latency_ns)
+
+    def percentiles(self) -> tuple[float, float]:
+        """Return the (p50, p95) latency in nanoseconds."""
+        if self._samples is not None:
+            ordered = sorted(self._samples)
+            return percentile(ordered, 50), percentile(ordered, 95)
+        return self._p50.value(), self._p95.value()
 
 
 def now_ts() -> str:
@@ -68,14 +313,38 @@ def ensure_dir(p: Path) -> None:
 def count_lines(path: Path) -> int:
     """Count the number of lines in a text file.
 
+    The file is read in binary chunks into one reused buffer and newlines are
+    counted with bytearray.count(), which avoids decoding, per-line Python
+    iteration and a new bytes object per chunk. A
+    final line without a trailing newline still counts as a line.
+
+    Results are cached by (path, mtime, size): every benchmark row for the
+    same data file reports the same line count, so the file is only scanned
+    once, while a regenerated file is counted again.
+
     Args:
         path: Path to the file.
 
     Returns:
         The number of lines in the file.
     """
-    with path.open("r", encoding="utf-8", errors="replace") as f:
-        return sum(1 for _ in f)
+    st = path.stat()
+    return _count_lines_cached(path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _count_lines_cached(path: Path, mtime_ns: int, size: int) -> int:
+    """Count lines in `path`; the stat fields only serve as cache keys."""
+    total = 0
+    last = b"\n"
+    buf = bytearray(READ_CHUNK_BYTES)
+    with path.open("rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            total += buf.count(b"\n", 0, n)
+            last = buf[n - 1: n]
+    if last != b"\n":
+        total += 1
+    return total
 
 
 def generate_data_file(path: Path, lines: int, seed: int = 123) -> list[str]:
@@ -96,16 +365,27 @@ def generate_data_file(path: Path, lines: int, seed: int = 123) -> list[str]:
     rng = random.Random(seed)
     ensure_dir(path.parent)
 
+    step = max(1, lines // 100)
     hits: list[str] = []
-    with path.open("w", encoding="utf-8", newline="\n") as f:
-        for i in range(lines):
-            s = (
-                f"{rng.randint(0, 999)};{rng.randint(0, 999)};"
-                f"{i};{rng.randint(0, 999)};"
-            )
-            f.write(s + "\n")
-            if i % max(1, lines // 100) == 0:
-                hits.append(s)
+
+    with path.open(
+        "w", encoding="utf-8", newline="\n", buffering=WRITE_BUFFER_BYTES
+    ) as f:
+        for base in range(0, lines, GENERATE_CHUNK_LINES):
+            n = min(GENERATE_CHUNK_LINES, lines - base)
+
+            # Draw the chunk's random columns in bulk rather than four
+            # randint() calls per row.
+            it = iter(rng.choices(range(1000), k=3 * n))
+            rows = [
+                f"{a};{b};{i};{c};"
+                for i, (a, b, c) in enumerate(zip(it, it, it), start=base)
+            ]
+            # One joined write per chunk instead of a write per line.
+            f.write("\n".join(rows))
+            f.write("\n")
+
+            hits.extend(rows[-base % step::step])
 
     if not hits and lines > 0:
         hits.append("0;0;0;0;")
@@ -130,13 +410,36 @@ def make_queries(
         A list of query strings.
     """
     rng = random.Random(seed)
-    q: list[str] = []
-    for _ in range(total):
-        if rng.random() < hit_ratio:
-            q.append(rng.choice(hits))
-        else:
-            q.append(f"MISS;{rng.randint(0, 10_000_000)};")
-    return q
+    if not hits:
+        hit_ratio = 0.0
+
+    # Draw every per-query decision up front, then draw exactly as many
+    # hit picks and miss ids as the decisions call for (one C-level
+    # choices() loop each) and combine them in one pass.
+    is_hit = [rng.random() < hit_ratio for _ in range(total)]
+    n_hits = sum(is_hit)
+    hit_picks = iter(rng.choices(hits, k=n_hits))
+    miss_ids = iter(rng.choices(range(10_000_001), k=total - n_hits))
+
+    return [
+        next(hit_picks) if use_hit else f"MISS;{next(miss_ids)};"
+        for use_hit in is_hit
+    ]
+
+
+def encode_queries(queries: list[str]) -> list[bytes]:
+    """Encode queries into newline-terminated wire payloads.
+
+    Encoding happens once before a QPS run so the send path only has to
+    write ready-made bytes.
+
+    Args:
+        queries: Query strings (without newlines).
+
+    Returns:
+        UTF-8 encoded query lines, each ending with a newline.
+    """
+    return [(q + "\n").encode("utf-8") for q in queries]
 
 
 def generate_hits_from_file(path: Path, max_hits: int = 200) -> list[str]:
@@ -150,11 +453,11 @@ def generate_hits_from_file(path: Path, max_hits: int = 200) -> list[str]:
         A list of hit strings read from the file (line terminators stripped).
     """
     hits: list[str] = []
-    with path.open("r", encoding="utf-8", errors="replace") as f:
+    with path.open("rb") as f:
         for i, line in enumerate(f):
             if i >= max_hits:
                 break
-            hits.append(line.rstrip("\r\n"))
+            hits.append(line.rstrip(b"\r\n").decode("utf-8", "replace"))
     return hits
 
 
@@ -163,17 +466,21 @@ def benchmark_algo(
     algo: str,
     reread_on_query: bool,
     queries: list[str],
+    lines: int | None = None,
 ) -> dict[str, Any]:
     """Benchmark per-query latency for a given algorithm and mode.
 
     This uses SearchEngine.exists directly (no TCP), collecting per-query
-    durations and summary statistics.
+    durations and summary statistics. For cached algorithms each query is
+    timed over CACHED_TIMING_REPEATS calls with timeit, since a single call
+    is close to the clock's own overhead.
 
     Args:
         file_path: Data file path.
         algo: Algorithm name.
         reread_on_query: Whether to re-read the file per query.
         queries: Query strings to execute.
+        lines: Known line count of the data file; counted if omitted.
 
     Returns:
         A results dictionary suitable for CSV export.
@@ -182,6 +489,10 @@ def benchmark_algo(
         EngineError: If the engine fails to initialize or execute.
         RuntimeError: For unexpected runtime failures.
     """
+    # Row fields fixed for the whole run, computed once at entry.
+    ts = now_ts()
+    reread_str = "true" if reread_on_query else "false"
+
     cfg = AppConfig(
         linuxpath=file_path,
         reread_on_query=reread_on_query,
@@ -189,39 +500,123 @@ def benchmark_algo(
     )
     engine = SearchEngine.from_config(cfg)
 
-    if not reread_on_query:
-        engine.warmup()
-
-    durations_ms: list[float] = []
-    hits = 0
-
-    for q in queries[:10]:
-        engine.exists(q)
-
-    for q in queries:
-        t0 = time.perf_counter()
-        ok = engine.exists(q)
-        t1 = time.perf_counter()
-        durations_ms.append((t1 - t0) * 1000.0)
-        hits += 1 if ok else 0
+    try:
+        if not reread_on_query:
+            engine.warmup()
+
+        # Preallocated and filled by index, so the timed loop never grows it.
+        durations_ns: list[int] = [0] * len(queries)
+        total_ns = 0
+        hits = 0
+
+        for q in queries[:10]:
+            engine.exists(q)
+
+        if algo in CACHED_ALGOS:
+            # In-memory lookups can take less time than a pair of clock reads,
+            # so time a batch of repetitions per query and keep the average.
+            for i, q in enumerate(queries):
+                timer = timeit.Timer(
+                    functools.partial(engine.exists, q),
+                    timer=time.perf_counter_ns,
+                )
+                ns = timer.timeit(number=CACHED_TIMING_REPEATS)
+                ns //= CACHED_TIMING_REPEATS
+                durations_ns[i] = ns
+                total_ns += ns
+                hits += 1 if engine.exists(q) else 0
+        else:
+            for i, q in enumerate(queries):
+                t0 = time.perf_counter_ns()
+                ok = engine.exists(q)
+                t1 = time.perf_counter_ns()
+                durations_ns[i] = t1 - t0
+                total_ns += t1 - t0
+                hits += 1 if ok else 0
+
+        # Sort in place: the samples are not needed in arrival order, and this
+        # avoids allocating a second list of the same size.
+        durations_ns.sort()
+    finally:
+        # Stops a grep_fx worker, unmaps mmap_scan's file and closes the
+        # one hash_set keeps open, which would otherwise outlive the case
+        # and pile up across a sweep.
+        engine.close()
 
     return {
-        "ts": now_ts(),
+        "ts": ts,
         "algo": algo,
-        "reread_on_query": str(reread_on_query).lower(),
-        "lines": count_lines(file_path),
+        "reread_on_query": reread_str,
+        "lines": lines if lines is not None else count_lines(file_path),
         "queries": len(queries),
         "hits": hits,
-        "avg_ms": statistics.mean(durations_ms),
-        "p50_ms": percentile(durations_ms, 50),
-        "p95_ms": percentile(durations_ms, 95),
-        "min_ms": min(durations_ms),
-        "max_ms": max(durations_ms),
+        "avg_ms": total_ns / len(durations_ns) / NS_PER_MS,
+        "p50_ms": percentile(durations_ns, 50) / NS_PER_MS,
+        "p95_ms": percentile(durations_ns, 95) / NS_PER_MS,
+        "min_ms": durations_ns[0] / NS_PER_MS,
+        "max_ms": durations_ns[-1] / NS_PER_MS,
         "skipped": "",
         "skip_reason": "",
     }
 
 
+@dataclass(frozen=True)
+class AlgoCase:
+    """One (data file, algorithm, mode) combination of the algo sweep.
+
+    Attributes:
+        data_file: Data file path.
+        lines: Number of lines in the data file.
+        algo: Algorithm name.
+        reread_on_query: Whether to re-read the file per query.
+        queries: Query strings to execute.
+    """
+
+    data_file: Path
+    lines: int
+    algo: str
+    reread_on_query: bool
+    queries: tuple[str, ...]
+
+
+def run_algo_case(case: AlgoCase) -> dict[str, Any]:
+    """Run one algo benchmark case, turning failures into a skipped row.
+
+    This is a module-level function so it can be dispatched to worker
+    processes.
+
+    Args:
+        case: Benchmark case to run.
+
+    Returns:
+        A results dictionary suitable for CSV export.
+    """
+    try:
+        return benchmark_algo(
+            case.data_file,
+            case.algo,
+            case.reread_on_query,
+            list(case.queries),
+            lines=case.lines,
+        )
+    except (EngineError, RuntimeError) as exc:
+        return {
+            "ts": now_ts(),
+            "algo": case.algo,
+            "reread_on_query": "true" if case.reread_on_query else "false",
+            "lines": case.lines,
+            "queries": len(case.queries),
+            "hits": 0,
+            "avg_ms": "",
+            "p50_ms": "",
+            "p95_ms": "",
+            "min_ms": "",
+            "max_ms": "",
+            "skipped": "yes",
+            "skip_reason": str(exc),
+        }
+
+
 def get_free_port() -> int:
     """Return a free ephemeral port bound on localhost.
 
@@ -241,110 +636,357 @@ def write_temp_config(
 ) -> None:
     """Write a temporary config file for starting the benchmark server.
 
+    The file is left untouched if it already has the expected content.
+
     Args:
         cfg_path: Output path for the temporary config.
         data_file: Data file path to embed in the config.
         reread_on_query: Whether the server should reread the file per query.
         algo: Algorithm name to set in config.
     """
-    cfg_path.write_text(
-        "\n".join(
-            [
-                "foo=bar",
-                f"linuxpath={data_file}",
-                f"reread_on_query={'True' if reread_on_query else 'False'}",
-                f"search_algo={algo}",
-                "",
-            ]
-        ),
-        encoding="utf-8",
+    text = "\n".join(
+        [
+            "foo=bar",
+            f"linuxpath={data_file}",
+            f"reread_on_query={'True' if reread_on_query else 'False'}",
+            f"search_algo={algo}",
+            "",
+        ]
+    )
+
+    # Consecutive QPS steps for the same case produce identical configs.
+    try:
+        if cfg_path.read_text(encoding="utf-8") == text:
+            return
+    except OSError:
+        pass
+
+    cfg_path.write_text(text, encoding="utf-8")
+
+
+def wait_for_server(
+    proc: subprocess.Popen[bytes],
+    err_path: Path,
+    host: str,
+    port: int,
+    timeout_s: float = 5.0,
+) -> None:
+    """Block until the server subprocess accepts TCP connections.
+
+    The listening port is probed with short connect attempts, so the
+    benchmark starts as soon as the server is ready instead of after a fixed
+    sleep.
+
+    Args:
+        proc: Server subprocess being started.
+        err_path: File the server's stderr is written to.
+        host: Host the server binds to.
+        port: Port the server listens on.
+        timeout_s: Maximum time to wait for the server to become ready.
+
+    Raises:
+        RuntimeError: If the server exits early or does not accept
+            connections within timeout_s.
+    """
+    deadline = time.perf_counter() + timeout_s
+    while time.perf_counter() < deadline:
+        rc = proc.poll()
+        if rc is not None:
+            err = err_path.read_text(encoding="utf-8", errors="replace")
+            raise RuntimeError(
+                "Server failed to start.\n"
+                f"exit_code={rc}\n"
+                f"--- stderr ---\n{err}\n"
+            )
+        try:
+            with socket.create_connection((host, port), timeout=0.05):
+                return
+        except OSError:
+            time.sleep(READY_POLL_INTERVAL_S)
+
+    raise RuntimeError(
+        f"Server did not accept connections on {host}:{port} "
+        f"within {timeout_s:.1f}s"
     )
 
 
-def recv_all(sock: socket.socket, bufsize: int = 4096) -> bytes:
-    """Receive all data until the server closes the connection.
+class PersistentClient:
+    """A single persistent TCP connection used by one QPS worker.
+
+    The server keeps connections open and answers each newline-delimited
+    query with a DEBUG line followed by a result line. Reusing one stream per
+    worker keeps connect/close overhead out of the measured latency, so the
+    benchmark reflects the server and engine rather than connection churn.
+
+    Instances are created with `connect()` and driven from the asyncio event
+    loop, so many connections can be kept busy from a single thread.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        timeout_s: float,
+    ) -> None:
+        """Wrap an already connected stream pair.
+
+        Args:
+            reader: Stream reader for the connection.
+            writer: Stream writer for the connection.
+            timeout_s: Timeout applied to each request round trip.
+        """
+        self._reader = reader
+        self._writer = writer
+        self._timeout_s = timeout_s
+
+    @classmethod
+    async def connect(
+        cls, host: str, port: int, timeout_s: float = 3.0
+    ) -> "PersistentClient":
+        """Open a connection to the server.
+
+        Args:
+            host: Server host to connect to.
+            port: Server port to connect to.
+            timeout_s: Timeout for connect and per-request operations.
+
+        Returns:
+            A connected PersistentClient.
+
+        Raises:
+            OSError: If the connection cannot be established.
+            asyncio.TimeoutError: If connecting takes longer than timeout_s.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Fixed buffers, set before connect so they apply from the
+            # handshake on, skip loopback autotuning on the first requests.
+            sock.setsockopt(
+                socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_BYTES
+            )
+            sock.setsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_BYTES
+            )
+            # Abortive close: reconnects after a failed request must not
+            # leave TIME_WAIT sockets behind on the client side.
+            sock.setsockopt(
+                socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+            )
+            loop = asyncio.get_running_loop()
+            await asyncio.wait_for(
+                loop.sock_connect(sock, (host, port)), timeout=timeout_s
+            )
+            reader, writer = await asyncio.open_connection(sock=sock)
+        except BaseException:
+            sock.close()
+            raise
+        return cls(reader, writer, timeout_s)
+
+    async def request(self, payload: bytes) -> bool:
+        """Send one query line and read its framed reply.
+
+        Args:
+            payload: Encoded query line, including the trailing newline.
+
+        Returns:
+            True if a valid result line was received, otherwise False (the
+            server closed the connection before replying).
+
+        Raises:
+            OSError: If sending or receiving fails.
+            asyncio.TimeoutError: If no reply arrives within the timeout.
+        """
+        self._writer.write(payload)
+        return await asyncio.wait_for(self._read_reply(), self._timeout_s)
+
+    async def _read_reply(self) -> bool:
+        """Read lines until a result line or EOF is observed."""
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                return False
+            if line in RESULT_LINES:
+                return True
+
+    def close(self) -> None:
+        """Close the connection."""
+        try:
+            self._writer.close()
+        except OSError:
+            pass
+
+
+async def one_request(
+    client: PersistentClient, payload: bytes
+) -> tuple[bool, int]:
+    """Send one query over a persistent connection and measure latency.
 
     Args:
-        sock: Connected socket.
-        bufsize: Bytes per recv() call.
+        client: Connected client owned by the calling worker.
+        payload: Encoded query line, including the trailing newline.
 
     Returns:
-        All bytes read from the socket.
+        A tuple of:
+        - ok: True if a valid result line was received.
+        - latency_ns: Round-trip duration in integer nanoseconds.
     """
-    chunks: list[bytes] = []
-    while True:
-        part = sock.recv(bufsize)
-        if not part:
-            break
-        chunks.append(part)
-    return b"".join(chunks)
+    t0 = time.perf_counter_ns()
+    try:
+        ok = await client.request(payload)
+    except (OSError, asyncio.TimeoutError):
+        ok = False
+    t1 = time.perf_counter_ns()
+    return ok, t1 - t0
 
 
-def one_request(
+async def qps_worker(
     host: str,
     port: int,
-    query: str,
-    timeout_s: float = 3.0,
-) -> tuple[bool, float]:
-    """Send one TCP request and measure end-to-end latency.
+    client: PersistentClient | None,
+    schedule: Iterator[tuple[int, bytes]],
+    stats: LatencyStats,
+) -> None:
+    """Run one QPS client worker until the shared schedule is exhausted.
 
-    The request opens a new connection, sends one query, reads the entire
-    response, and returns whether a well-formed response terminator is present.
+    The worker repeatedly claims the next (deadline, query) slot from the
+    schedule shared by all workers, waits for that deadline itself and sends
+    the query over its persistent connection. After a failed request the
+    connection is discarded and re-established, since a late reply would
+    otherwise be attributed to the next query.
 
     Args:
         host: Server host to connect to.
         port: Server port to connect to.
-        query: Query string (without newline).
-        timeout_s: Timeout for connect and socket operations.
+        client: Already connected client, or None to connect on first use.
+        schedule: Shared iterator of (deadline_ns, encoded query line).
+        stats: Shared summary every request outcome is recorded into.
+    """
+    try:
+        for deadline_ns, payload in schedule:
+            await wait_until_ns(deadline_ns)
+
+            if client is None:
+                t0 = time.perf_counter_ns()
+                try:
+                    client = await PersistentClient.connect(host, port)
+                except (OSError, asyncio.TimeoutError):
+                    t1 = time.perf_counter_ns()
+                    stats.record(False, t1 - t0)
+                    continue
+
+            ok, ns = await one_request(client, payload)
+            stats.record(ok, ns)
+            if not ok:
+                client.close()
+                client = None
+    finally:
+        if client is not None:
+            client.close()
+
+
+async def wait_until_ns(deadline_ns: int) -> None:
+    """Wait until a perf_counter_ns() deadline with sub-millisecond accuracy.
+
+    Long waits are slept for all but the final PACING_SPIN_NS; the remainder
+    is spun out while yielding to the event loop so workers keep running.
+
+    Args:
+        deadline_ns: Target time as a time.perf_counter_ns() value.
+    """
+    wait_ns = deadline_ns - time.perf_counter_ns()
+    if wait_ns > PACING_SPIN_NS:
+        await asyncio.sleep((wait_ns - PACING_SPIN_NS) / NS_PER_S)
+
+    while time.perf_counter_ns() < deadline_ns:
+        await asyncio.sleep(0)
+
+
+async def drive_qps(
+    host: str,
+    port: int,
+    payloads: list[bytes],
+    warmup: list[bytes],
+    qps_target: int,
+    duration_s: float,
+    clients: int,
+) -> LatencyStats:
+    """Pace queries at a target rate across persistent client workers.
+
+    All connections are opened and a short untimed warmup is sent over one
+    of them (QPS_WARMUP_QUERIES); then every query gets a precomputed
+    send deadline and workers claim the next slot from a shared schedule,
+    each pacing its own sends. A single event loop runs all `clients`
+    workers, avoiding one OS thread per connection on the load-generator
+    side, and there is no central producer to serialize submission.
+
+    Args:
+        host: Server host to connect to.
+        port: Server port to connect to.
+        payloads: Encoded query lines to send, in order.
+        warmup: Encoded untimed query lines sent before the run.
+        qps_target: Target QPS (requests per second) to attempt.
+        duration_s: Benchmark duration in seconds.
+        clients: Number of concurrent client workers (connections).
 
     Returns:
-        A tuple of:
-        - ok: True if the response ends with a valid result line.
-        - latency_ms: End-to-end duration in milliseconds.
+        Outcome counts and latency estimates for all requests sent.
     """
-    t0 = time.perf_counter()
-    try:
-        with socket.create_connection((host, port), timeout=timeout_s) as s:
-            s.settimeout(timeout_s)
-            s.sendall((query + "\n").encode("utf-8"))
-            raw = recv_all(s)
+    connected = [
+        c if isinstance(c, PersistentClient) else None
+        for c in await asyncio.gather(
+            *(PersistentClient.connect(host, port) for _ in range(clients)),
+            return_exceptions=True,
+        )
+    ]
+
+    # Untimed warmup so cold-start costs (page faults, lazy cache builds,
+    # first-connection setup in the server) stay out of the measurement.
+    if connected and connected[0] is not None:
+        for payload in warmup:
+            ok, _ns = await one_request(connected[0], payload)
+            if not ok:
+                connected[0].close()
+                connected[0] = None
+                break
 
-        text = raw.decode("utf-8", errors="replace")
-        ok = text.endswith(("STRING EXISTS\n", "STRING NOT FOUND\n"))
+    spacing_ns = NS_PER_S // max(1, qps_target)
+    duration_ns = int(duration_s * NS_PER_S)
+    count = min(len(payloads), duration_ns // max(1, spacing_ns) + 1)
+    start_ns = time.perf_counter_ns()
+    # Slots are produced lazily as workers claim them, so pending work is
+    # bounded by the number of workers rather than the number of queries.
+    # Workers only advance it between awaits, on the same thread.
+    schedule = (
+        (start_ns + i * spacing_ns, payload)
+        for i, payload in enumerate(itertools.islice(payloads, count))
+    )
 
-        t1 = time.perf_counter()
-        return ok, (t1 - t0) * 1000.0
-    except Exception:
-        t1 = time.perf_counter()
-        return False, (t1 - t0) * 1000.0
+    stats = LatencyStats()
+    await asyncio.gather(
+        *(qps_worker(host, port, c, schedule, stats) for c in connected)
+    )
+    return stats
 
 
-def benchmark_server_qps(
+@contextlib.contextmanager
+def running_server(
     data_file: Path,
     algo: str,
     reread_on_query: bool,
-    qps_target: int,
-    duration_s: float,
-    clients: int,
     tmp_dir: Path,
-) -> dict[str, Any]:
-    """Benchmark end-to-end request throughput and latency.
-
-    This function starts the server as a subprocess, then submits TCP requests
-    using multiple client workers, attempting to send at a target QPS for a
-    fixed duration.
+) -> Iterator[int]:
+    """Run the server as a subprocess for the duration of a ``with`` block.
 
     Args:
         data_file: Data file to configure the server with.
         algo: Algorithm name.
         reread_on_query: Whether the server should reread the file per query.
-        qps_target: Target QPS (requests per second) to attempt.
-        duration_s: Benchmark duration in seconds.
-        clients: Number of concurrent client workers.
         tmp_dir: Temporary directory for config files.
 
-    Returns:
-        A results dictionary suitable for CSV export.
+    Yields:
+        The local port the server is listening on.
 
     Raises:
         RuntimeError: If the server fails to start.
@@ -353,70 +995,35 @@ def benchmark_server_qps(
     cfg_path = tmp_dir / "bench_app.conf"
     write_temp_config(cfg_path, data_file, reread_on_query, algo)
 
-    proc = subprocess.Popen(
-        [
-            sys.executable,
-            "-m",
-            "server",
-            "--host",
-            "127.0.0.1",
-            "--port",
-            str(port),
-            "--config",
-            str(cfg_path),
-        ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-
-    time.sleep(0.35)
-    if proc.poll() is not None:
-        out, err = proc.communicate(timeout=2)
-        raise RuntimeError(
-            "Server failed to start.\n"
-            f"--- stdout ---\n{out}\n"
-            f"--- stderr ---\n{err}\n"
+    # The server's stderr goes to a file: it could fill an unread
+    # pipe and block during a long run, but not a file.
+    err_path = tmp_dir / "bench_server.err"
+    with err_path.open("wb") as err_file:
+        proc = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "server",
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(port),
+                "--config",
+                str(cfg_path),
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=err_file,
         )
 
-    queries = make_queries(
-        hits=generate_hits_from_file(data_file, max_hits=200),
-        total=int(qps_target * duration_s),
-    )
-
-    sent = 0
-    ok_count = 0
-    errors = 0
-    latencies_ms: list[float] = []
-
-    t_end = time.perf_counter() + duration_s
-
     try:
-        with ThreadPoolExecutor(max_workers=clients) as ex:
-            futures = []
-            spacing = 1.0 / max(1, qps_target)
-            next_time = time.perf_counter()
-
-            for q in queries:
-                now = time.perf_counter()
-                if now < next_time:
-                    time.sleep(next_time - now)
-                next_time += spacing
-
-                if time.perf_counter() > t_end:
-                    break
-
-                futures.append(ex.submit(one_request, "127.0.0.1", port, q))
-                sent += 1
-
-            for fut in as_completed(futures):
-                ok, ms = fut.result()
-                latencies_ms.append(ms)
-                if ok:
-                    ok_count += 1
-                else:
-                    errors += 1
+        wait_for_server(proc, err_path, "127.0.0.1", port)
+    except RuntimeError:
+        proc.kill()
+        proc.wait()
+        raise
 
+    try:
+        yield port
     finally:
         proc.terminate()
         try:
@@ -424,54 +1031,210 @@ def benchmark_server_qps(
         except subprocess.TimeoutExpired:
             proc.kill()
 
-    achieved_qps = ok_count / max(duration_s, 0.001)
+
+def benchmark_server_qps(
+    port: int,
+    data_file: Path,
+    algo: str,
+    reread_on_query: bool,
+    qps_target: int,
+    duration_s: float,
+    clients: int,
+    lines: int | None = None,
+    hits: list[str] | None = None,
+) -> dict[str, Any]:
+    """Benchmark end-to-end request throughput and latency.
+
+    This function feeds queries to multiple client workers (one persistent
+    connection each) against an already running server, attempting to
+    send at a target QPS for a fixed duration.
+
+    Args:
+        port: Local port of a server started with ``running_server``.
+        data_file: Data file the server is configured with.
+        algo: Algorithm name.
+        reread_on_query: Whether the server rereads the file per query.
+        qps_target: Target QPS (requests per second) to attempt.
+        duration_s: Benchmark duration in seconds.
+        clients: Number of concurrent client workers.
+        lines: Known line count of the data file; counted if omitted.
+        hits: Known hit lines of the data file; sampled from it if omitted.
+
+    Returns:
+        A results dictionary suitable for CSV export.
+    """
+    # Row fields fixed for the whole run, computed once at entry.
+    ts = now_ts()
+    reread_str = "true" if reread_on_query else "false"
+
+    if hits is None:
+        hits = generate_hits_from_file(data_file, max_hits=200)
+    payloads = encode_queries(
+        make_queries(hits=hits, total=int(qps_target * duration_s))
+    )
+    warmup = encode_queries(
+        make_queries(
+            hits=hits, total=QPS_WARMUP_QUERIES, seed=QPS_WARMUP_SEED
+        )
+    )
+
+    stats = asyncio.run(
+        drive_qps(
+            "127.0.0.1",
+            port,
+            payloads,
+            warmup,
+            qps_target,
+            duration_s,
+            clients,
+        )
+    )
+    achieved_qps = stats.ok / max(duration_s, 0.001)
+    p50_ns, p95_ns = stats.percentiles()
 
     return {
-        "ts": now_ts(),
+        "ts": ts,
         "algo": algo,
-        "reread_on_query": str(reread_on_query).lower(),
-        "lines": count_lines(data_file),
+        "reread_on_query": reread_str,
+        "lines": lines if lines is not None else count_lines(data_file),
         "clients": clients,
         "qps_target": qps_target,
         "duration_s": duration_s,
-        "sent": sent,
-        "ok": ok_count,
-        "errors": errors,
+        "sent": stats.count,
+        "ok": stats.ok,
+        "errors": stats.errors,
         "achieved_qps": achieved_qps,
-        "p50_ms": percentile(latencies_ms, 50),
-        "p95_ms": percentile(latencies_ms, 95),
+        "p50_ms": p50_ns / NS_PER_MS,
+        "p95_ms": p95_ns / NS_PER_MS,
         "skipped": "",
         "skip_reason": "",
     }
 
 
-def write_csv(path: Path, rows: list[dict[str, Any]]) -> None:
-    """Write results as a CSV file.
+def run_qps_cases(
+    data_file: Path,
+    lines: int,
+    algo: str,
+    reread_on_query: bool,
+    qps_targets: Sequence[int],
+    duration_s: float,
+    clients: int,
+    tmp_dir: Path,
+) -> Iterator[dict[str, Any]]:
+    """Run every QPS target against one server, yielding a row per target.
 
-    The CSV header uses a stable field order computed as the union of keys in
-    insertion order.
+    The server is started once per ``(data_file, algo, reread_on_query)``
+    and shared by all targets. Failures become skipped rows.
 
     Args:
-        path: Output CSV file path.
-        rows: Result rows to write.
+        data_file: Data file to configure the server with.
+        lines: Number of lines in the data file.
+        algo: Algorithm name.
+        reread_on_query: Whether the server should reread the file per query.
+        qps_targets: Target QPS values to attempt, in order.
+        duration_s: Benchmark duration in seconds.
+        clients: Number of concurrent client workers.
+        tmp_dir: Temporary directory for config files.
+
+    Yields:
+        A results dictionary suitable for CSV export, one per target.
     """
-    if not rows:
-        return
-    ensure_dir(path.parent)
+    reread_str = "true" if reread_on_query else "false"
+
+    def skip_row(qps_target: int, exc: Exception) -> dict[str, Any]:
+        return {
+            "ts": now_ts(),
+            "algo": algo,
+            "reread_on_query": reread_str,
+            "lines": lines,
+            "clients": clients,
+            "qps_target": qps_target,
+            "duration_s": duration_s,
+            "sent": 0,
+            "ok": 0,
+            "errors": 0,
+            "achieved_qps": 0,
+            "p50_ms": "",
+            "p95_ms": "",
+            "skipped": "yes",
+            "skip_reason": str(exc),
+        }
+
+    hits = generate_hits_from_file(data_file, max_hits=200)
+    done = 0
+    try:
+        with running_server(data_file, algo, reread_on_query, tmp_dir) as port:
+            for qps_target in qps_targets:
+                try:
+                    row = benchmark_server_qps(
+                        port=port,
+                        data_file=data_file,
+                        algo=algo,
+                        reread_on_query=reread_on_query,
+                        qps_target=qps_target,
+                        duration_s=duration_s,
+                        clients=clients,
+                        lines=lines,
+                        hits=hits,
+                    )
+                except (EngineError, RuntimeError) as exc:
+                    row = skip_row(qps_target, exc)
+                done += 1
+                yield row
+    except (EngineError, RuntimeError) as exc:
+        for qps_target in qps_targets[done:]:
+            yield skip_row(qps_target, exc)
+
+
+class CsvResultWriter:
+    """Stream benchmark result rows to a CSV file as they are produced.
+
+    The file and its header are created when the first row is written, and
+    each row is flushed immediately so partial results survive an aborted
+    sweep. The header uses a fixed field order; keys not in it are ignored
+    and missing keys are written as empty cells.
+    """
+
+    def __init__(self, path: Path, fieldnames: Sequence[str]) -> None:
+        """Prepare a writer for the given output file.
+
+        Args:
+            path: Output CSV file path.
+            fieldnames: Column order for the CSV header.
+        """
+        self._path = path
+        self._fieldnames = list(fieldnames)
+        self._fh: TextIO | None = None
+        self._writer: Any = None
+
+    def write(self, row: dict[str, Any]) -> None:
+        """Append one result row, creating the file on first use.
+
+        Args:
+            row: Result row to write.
+        """
+        if self._writer is None:
+            ensure_dir(self._path.parent)
+            self._fh = self._path.open("w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._fh)
+            self._writer.writerow(self._fieldnames)
+
+        assert self._fh is not None
+        self._writer.writerow([row.get(k, "") for k in self._fieldnames])
+        self._fh.flush()
 
-    keys: list[str] = []
-    seen = set()
-    for r in rows:
-        for k in r.keys():
-            if k not in seen:
-                seen.add(k)
-                keys.append(k)
+    def close(self) -> None:
+        """Close the output file if it was opened."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            self._writer = None
 
-    with path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=keys)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+    def __enter__(self) -> "CsvResultWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
 
 def parse_args() -> argparse.Namespace:
@@ -512,7 +1275,10 @@ def parse_args() -> argparse.Namespace:
     )
     p.add_argument(
         "--algos",
-        default="linear_scan,mmap_scan,grep_fx,set_cache,sorted_bisect",
+        default=(
+            "linear_scan,mmap_scan,grep_fx,set_cache,sorted_bisect,"
+            "eytzinger,bloom_bisect,hash_set,sorted_arena"
+        ),
         help="Comma-separated algos.",
     )
     p.add_argument("--mode", choices=["algo", "qps", "both"], default="both")
@@ -527,12 +1293,30 @@ def parse_args() -> argparse.Namespace:
         default=5.0,
         help="Duration seconds per QPS step.",
     )
+    p.add_argument(
+        "--qps-reread-modes",
+        default="false",
+        help=(
+            "Comma-separated reread_on_query modes to load-test "
+            "(true,false). Defaults to false only: with rereads, latency "
+            "is dominated by file size rather than load."
+        ),
+    )
     p.add_argument(
         "--clients",
         type=int,
         default=50,
         help="Concurrent client workers for QPS tests.",
     )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help=(
+            "Worker processes for the algo benchmarks (default: CPU "
+            "count). QPS benchmarks always run serially."
+        ),
+    )
     p.add_argument(
         "--verbose",
         action="store_true",
@@ -558,6 +1342,13 @@ def main() -> None:
         [int(x.strip()) for x in args.qps_targets.split(",") if x.strip()]
     )
 
+    qps_reread_modes: set[bool] = set()
+    for x in args.qps_reread_modes.split(","):
+        v = x.strip().lower()
+        if v not in {"true", "false"}:
+            raise SystemExit(f"Invalid --qps-reread-modes value: {x!r}")
+        qps_reread_modes.add(v == "true")
+
     supported: set[str] | None = None
     if hasattr(SearchEngine, "supported_algorithms"):
         try:
@@ -575,26 +1366,37 @@ def main() -> None:
     est_runs = 0
     for _n in sizes:
         for algo in algos:
-            reread_modes = (
-                [True, False]
-                if algo in {"linear_scan", "mmap_scan", "grep_fx"}
-                else [False]
-            )
-            for _reread in reread_modes:
+            for reread in ALGO_META[algo].reread_modes:
                 if args.mode in {"algo", "both"}:
                     est_runs += 1
-                if args.mode in {"qps", "both"}:
+                if (
+                    args.mode in {"qps", "both"}
+                    and reread in qps_reread_modes
+                ):
                     est_runs += len(qps_targets)
 
     if args.verbose:
         print(f"Planned runs: {est_runs}  (mode={args.mode})", flush=True)
 
-    algo_rows: list[dict[str, Any]] = []
-    qps_rows: list[dict[str, Any]] = []
-
     done = 0
 
-    for n in sizes:
+    algo_out = CsvResultWriter(outdir / "results_algo.csv", ALGO_FIELDS)
+    qps_out = CsvResultWriter(outdir / "results_qps.csv", QPS_FIELDS)
+
+    def record_algo(row: dict[str, Any]) -> None:
+        nonlocal done
+        done += 1
+        if args.verbose:
+            print(
+                f"[{done}/{est_runs}] algo: lines={row['lines']} "
+                f"algo={row['algo']} reread={row['reread_on_query']}",
+                flush=True,
+            )
+            if row["skipped"]:
+                print(f"  -> skipped: {row['skip_reason']}", flush=True)
+        algo_out.write(row)
+
+    def prepare_size(n: int) -> tuple[Path, tuple[str, ...]]:
         data_file = datadir / f"data_{n}.txt"
         hits = generate_data_file(data_file, n, seed=123)
         queries = make_queries(
@@ -603,97 +1405,62 @@ def main() -> None:
             hit_ratio=args.hit_ratio,
             seed=456,
         )
+        return data_file, tuple(queries)
 
-        for algo in algos:
-            reread_modes = (
-                [True, False]
-                if algo in {"linear_scan", "mmap_scan", "grep_fx"}
-                else [False]
-            )
+    jobs = args.jobs if args.jobs is not None else (os.cpu_count() or 1)
 
-            for reread in reread_modes:
-                if args.mode in {"algo", "both"}:
-                    done += 1
-                    if args.verbose:
-                        print(
-                            f"[{done}/{est_runs}] algo: "
-                            f"lines={n} algo={algo} reread={reread}",
-                            flush=True,
-                        )
-                    try:
-                        row = benchmark_algo(data_file, algo, reread, queries)
-                    except (EngineError, RuntimeError) as exc:
-                        if args.verbose:
-                            print(f"  -> skipped: {exc}", flush=True)
-                        algo_rows.append(
-                            {
-                                "ts": now_ts(),
-                                "algo": algo,
-                                "reread_on_query": str(reread).lower(),
-                                "lines": n,
-                                "queries": len(queries),
-                                "hits": 0,
-                                "avg_ms": "",
-                                "p50_ms": "",
-                                "p95_ms": "",
-                                "min_ms": "",
-                                "max_ms": "",
-                                "skipped": "yes",
-                                "skip_reason": str(exc),
-                            }
-                        )
-                    else:
-                        algo_rows.append(row)
-
-                if args.mode in {"qps", "both"}:
-                    for qps in qps_targets:
-                        done += 1
-                        if args.verbose:
-                            print(
-                                f"[{done}/{est_runs}] qps:  "
-                                f"lines={n} algo={algo} reread={reread} "
-                                f"qps={qps}",
-                                flush=True,
-                            )
-                        try:
-                            row2 = benchmark_server_qps(
-                                data_file=data_file,
-                                algo=algo,
-                                reread_on_query=reread,
-                                qps_target=qps,
-                                duration_s=args.qps_duration,
-                                clients=args.clients,
-                                tmp_dir=tmp_dir,
-                            )
-                        except (EngineError, RuntimeError) as exc:
+    with algo_out, qps_out:
+        prepared = {n: prepare_size(n) for n in sizes}
+
+        if args.mode in {"algo", "both"}:
+            cases = [
+                AlgoCase(data_file, n, algo, reread, queries)
+                for n, (data_file, queries) in prepared.items()
+                for algo in algos
+                for reread in ALGO_META[algo].reread_modes
+            ]
+            if jobs > 1:
+                # Algo runs share no state, so they can run in parallel
+                # worker processes; Pool.imap keeps the CSV order stable.
+                with multiprocessing.Pool(processes=jobs) as pool:
+                    for row in pool.imap(run_algo_case, cases):
+                        record_algo(row)
+            else:
+                for case in cases:
+                    record_algo(run_algo_case(case))
+
+        if args.mode in {"qps", "both"}:
+            # QPS runs stay serial: they load the machine to measure the
+            # server, so concurrent runs would distort each other.
+            for n, (data_file, _queries) in prepared.items():
+                for algo in algos:
+                    for reread in ALGO_META[algo].reread_modes:
+                        if reread not in qps_reread_modes:
+                            continue
+                        for row in run_qps_cases(
+                            data_file=data_file,
+                            lines=n,
+                            algo=algo,
+                            reread_on_query=reread,
+                            qps_targets=qps_targets,
+                            duration_s=args.qps_duration,
+                            clients=args.clients,
+                            tmp_dir=tmp_dir,
+                        ):
+                            done += 1
                             if args.verbose:
-                                print(f"  -> skipped: {exc}", flush=True)
-                            qps_rows.append(
-                                {
-                                    "ts": now_ts(),
-                                    "algo": algo,
-                                    "reread_on_query": str(reread).lower(),
-                                    "lines": n,
-                                    "clients": args.clients,
-                                    "qps_target": qps,
-                                    "duration_s": args.qps_duration,
-                                    "sent": 0,
-                                    "ok": 0,
-                                    "errors": 0,
-                                    "achieved_qps": 0,
-                                    "p50_ms": "",
-                                    "p95_ms": "",
-                                    "skipped": "yes",
-                                    "skip_reason": str(exc),
-                                }
-                            )
-                        else:
-                            qps_rows.append(row2)
-
-    if algo_rows:
-        write_csv(outdir / "results_algo.csv", algo_rows)
-    if qps_rows:
-        write_csv(outdir / "results_qps.csv", qps_rows)
+                                print(
+                                    f"[{done}/{est_runs}] qps:  "
+                                    f"lines={n} algo={algo} reread={reread} "
+                                    f"qps={row['qps_target']}",
+                                    flush=True,
+                                )
+                                if row["skipped"]:
+                                    print(
+                                        f"  -> skipped: {row['skip_reason']}",
+                                        flush=True,
+                                    )
+                            qps_out.write(row)
 
     print(f"Wrote results to: {outdir}", flush=True)
 
@@ -4,7 +4,8 @@ TCP String Lookup Client.
 
 This client connects to the TCP String Lookup Server, sends a single newline-
 terminated query, then reads and prints the server response
-(debug line + result line).
+(debug line + result line). LookupClient exposes the same exchange over a
+persistent connection for sending many queries.
 
 TLS is optional. When a config file is provided via --config, the client will
 use SSL settings from that file to determine whether to wrap the connection in
@@ -14,19 +15,37 @@ TLS and whether to verify the server certificate.
 from __future__ import annotations
 
 import argparse
+import functools
+import os
 import socket
 import ssl
 import sys
-from typing import List
+import time
 
-from config import ConfigError, load_config
+from config import ConfigError, load_config, ssl_enabled_in
 
 
-RECV_BUFSIZE = 4096  # bytes to request per recv() call
+RECV_BUFSIZE = 65536  # bytes to request per recv() call
+SOCKET_RCVBUF_BYTES = 1 << 20  # kernel receive buffer (SO_RCVBUF)
 RECV_TIMEOUT_SECONDS = 5.0  # prevent hanging forever if server stalls
+RECV_LIMIT_BYTES = 1024 * 1024  # max response bytes read before giving up
+RECV_INITIAL_BYTES = 4096  # first receive buffer; grown only when filled
+
+# Resolved addresses by (host, port): (expiry, [(family, sockaddr)]).
+ADDR_CACHE_TTL_SECONDS = 60.0
+_ADDR_CACHE: dict[
+    tuple[str, int], tuple[float, list[tuple[int, tuple]]]
+] = {}
+
+# TLS sessions from earlier connections in this process, keyed by
+# (host, port), stored with the context that created them.
+_TLS_SESSIONS: dict[
+    tuple[str, int], tuple[ssl.SSLContext, ssl.SSLSession]
+] = {}
 
 RESULT_EXISTS = b"STRING EXISTS\n"
 RESULT_NOT_FOUND = b"STRING NOT FOUND\n"
+_RESULT_LINES = (RESULT_EXISTS, RESULT_NOT_FOUND)
 
 
 def parse_args() -> argparse.Namespace:
@@ -43,6 +62,16 @@ def parse_args() -> argparse.Namespace:
         required=False,
         help="Optional config file path (used for SSL settings).",
     )
+    parser.add_argument(
+        "--cpu-affinity",
+        type=_parse_cpu_list,
+        default=None,
+        help=(
+            "Pin the client to these CPUs, e.g. '2' or '0,2-3'. Pick the "
+            "CPUs that service the NIC's interrupts (see "
+            "/proc/irq/<irq>/smp_affinity_list). Linux only."
+        ),
+    )
     parser.add_argument(
         "query",
         help="Query string to send (exact full-line match).",
@@ -50,6 +79,34 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def _parse_cpu_list(value: str) -> set[int]:
+    """Parse a CPU list such as '0,2-3' into a set of CPU numbers.
+
+    Args:
+        value: Comma-separated CPU numbers and inclusive ranges.
+
+    Returns:
+        The selected CPU numbers.
+
+    Raises:
+        argparse.ArgumentTypeError: If the list is empty or malformed.
+    """
+    cpus: set[int] = set()
+    try:
+        for part in value.split(","):
+            first, sep, last = part.strip().partition("-")
+            lo = int(first)
+            hi = int(last) if sep else lo
+            if lo < 0 or hi < lo:
+                raise ValueError(part)
+            cpus.update(range(lo, hi + 1))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            f"invalid CPU list: {value!r}"
+        ) from exc
+    return cpus
+
+
 def recv_until_result(sock: socket.socket) -> bytes:
     """Receive server output until a result line is observed.
 
@@ -68,27 +125,151 @@ def recv_until_result(sock: socket.socket) -> bytes:
         whatever was received before the connection closed or
         a safety limit was reached.
     """
-    chunks: List[bytes] = []
-    buf = b""
+    # One buffer filled in place by recv_into(), so reads do not allocate
+    # a new bytes object per call. It starts small, since a reply is
+    # usually one short DEBUG line and a result line, and doubles only
+    # when a reply fills it, up to the RECV_LIMIT_BYTES safety limit.
+    buf = bytearray(RECV_INITIAL_BYTES)
+    offset = 0
+    # Start of the line currently being received. Each new chunk is only
+    # scanned for newlines, and each completed line is compared once
+    # against the terminators (neither contains an inner newline).
+    line_start = 0
+
+    while offset < RECV_LIMIT_BYTES:
+        if offset == len(buf):
+            buf.extend(bytes(min(len(buf), RECV_LIMIT_BYTES - len(buf))))
+        with memoryview(buf) as view:
+            n = sock.recv_into(view[offset:offset + RECV_BUFSIZE])
+        if not n:
+            break
 
-    while True:
-        data = sock.recv(RECV_BUFSIZE)
-        if not data:
-            chunks.append(buf)
+        end = offset + n
+        found = False
+        nl = buf.find(b"\n", offset, end)
+        while nl != -1:
+            if buf.startswith(_RESULT_LINES, line_start, nl + 1):
+                found = True
+                break
+            line_start = nl + 1
+            nl = buf.find(b"\n", line_start, end)
+        offset = end
+
+        if found:
             break
 
-        buf += data
+    del buf[offset:]
+    return bytes(buf)
 
-        if RESULT_EXISTS in buf or RESULT_NOT_FOUND in buf:
-            chunks.append(buf)
-            break
 
-        # Safety: prevent unbounded growth if something goes wrong.
-        if len(buf) > 1024 * 1024:  # 1MB
-            chunks.append(buf)
-            break
+def _resolve(host: str, port: int) -> list[tuple[int, tuple]]:
+    """Resolve a TCP address, reusing recent answers for the same target.
+
+    Results are kept for ADDR_CACHE_TTL_SECONDS, so repeated connections to
+    a hostname in one process do not each go through the resolver.
+
+    Args:
+        host: Hostname or IP address.
+        port: TCP port.
+
+    Returns:
+        (address family, socket address) pairs in resolver order.
+
+    Raises:
+        socket.gaierror: If the host cannot be resolved.
+    """
+    key = (host, port)
+    now = time.monotonic()
+    cached = _ADDR_CACHE.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    addrs = [
+        (family, sockaddr)
+        for family, _type, _proto, _name, sockaddr in socket.getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+    ]
+    _ADDR_CACHE[key] = (now + ADDR_CACHE_TTL_SECONDS, addrs)
+    return addrs
+
+
+def _connect(host: str, port: int, timeout_s: float) -> socket.socket:
+    """Connect to the first resolved address of (host, port) that answers.
+
+    Addresses are tried in resolver order, as socket.create_connection()
+    does, so a host whose first answer is unreachable (say, an AAAA record
+    without IPv6 routing) still connects over the next one.
+
+    Args:
+        host: Hostname or IP address.
+        port: TCP port.
+        timeout_s: Timeout for each connect attempt, kept on the socket.
+
+    Returns:
+        The connected socket.
 
-    return b"".join(chunks)
+    Raises:
+        OSError: The last connect error, if no address accepts.
+    """
+    err: OSError | None = None
+    for family, sockaddr in _resolve(host, port):
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(timeout_s)
+            # Ship small queries at once rather than waiting on Nagle.
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Set before connecting so the advertised window reflects it.
+            sock.setsockopt(
+                socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF_BYTES
+            )
+            sock.connect(sockaddr)
+        except OSError as exc:
+            sock.close()
+            err = exc
+            continue
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    # The cached addresses may be stale; resolve afresh next time.
+    _ADDR_CACHE.pop((host, port), None)
+    raise err if err is not None else OSError(f"no address for {host}")
+
+
+@functools.lru_cache(maxsize=8)
+def _build_client_ssl_context(
+    ssl_verify: bool,
+    cafile: str | None,
+    cafile_mtime_ns: int,
+) -> ssl.SSLContext:
+    """Build a client TLS context, memoized on its inputs.
+
+    Creating a context and parsing the CA file cost far more than wrapping
+    a socket, so one context is reused until the CA file changes.
+
+    Args:
+        ssl_verify: Whether to verify the server certificate.
+        cafile: Trust anchor path for self-signed certificates, if any.
+        cafile_mtime_ns: CA file modification time, part of the cache key.
+
+    Returns:
+        A configured SSLContext.
+    """
+    if ssl_verify:
+        ctx = ssl.create_default_context(purpose=ssl.Purpose.SERVER_AUTH)
+
+        # For self-signed certificate verification, a CA file is required.
+        if cafile is not None:
+            ctx.load_verify_locations(cafile=cafile)
+
+        # When ssl_verify=True, we keep the default check_hostname=True.
+        # Verification may fail if the server cert SAN does not match `host`.
+        return ctx
+
+    # Local-only encryption without server identity verification.
+    return ssl._create_unverified_context()
 
 
 def _wrap_client_ssl(
@@ -122,27 +303,111 @@ def _wrap_client_ssl(
         return raw_sock
 
     try:
+        # Plaintext configs only need the one key, not a full load.
+        if not ssl_enabled_in(config_path):
+            return raw_sock
         cfg = load_config(config_path)
     except ConfigError as exc:
         raise SystemExit(f"Config error: {exc}") from exc
 
-    if not cfg.ssl_enabled:
-        return raw_sock
+    cafile = str(cfg.ssl_cafile) if cfg.ssl_cafile is not None else None
+    cafile_mtime_ns = -1
+    if cfg.ssl_verify and cafile is not None:
+        try:
+            cafile_mtime_ns = os.stat(cafile).st_mtime_ns
+        except OSError:
+            # Leave the error to load_verify_locations(), which reports it.
+            pass
 
-    if cfg.ssl_verify:
-        ctx = ssl.create_default_context(purpose=ssl.Purpose.SERVER_AUTH)
+    ctx = _build_client_ssl_context(cfg.ssl_verify, cafile, cafile_mtime_ns)
+    key = (host, raw_sock.getpeername()[1])
+    cached = _TLS_SESSIONS.get(key)
+    # A session can only be resumed by the context that created it.
+    session = cached[1] if cached is not None and cached[0] is ctx else None
+    return ctx.wrap_socket(raw_sock, server_hostname=host, session=session)
 
-        # For self-signed certificate verification, a CA file is required.
-        if cfg.ssl_cafile is not None:
-            ctx.load_verify_locations(cafile=str(cfg.ssl_cafile))
 
-        # When ssl_verify=True, we keep the default check_hostname=True.
-        # Verification may fail if the server cert SAN does not match `host`.
-    else:
-        # Local-only encryption without server identity verification.
-        ctx = ssl._create_unverified_context()
+def _remember_tls_session(sock: socket.socket, host: str) -> None:
+    """Keep the TLS session of a finished exchange for later resumption.
+
+    With TLS 1.3 the server sends its session ticket after the handshake,
+    so this is called once a response has been read.
+
+    Args:
+        sock: Socket returned by _wrap_client_ssl().
+        host: Hostname/IP the socket was wrapped for.
+    """
+    if not isinstance(sock, ssl.SSLSocket) or sock.session is None:
+        return
+    key = (host, sock.getpeername()[1])
+    _TLS_SESSIONS[key] = (sock.context, sock.session)
+
 
-    return ctx.wrap_socket(raw_sock, server_hostname=host)
+class LookupClient:
+    """A persistent connection to the TCP String Lookup Server.
+
+    The server keeps connections open, so one client can send any number
+    of queries while paying the TCP (and TLS) handshake only once.
+
+    Example:
+        with LookupClient("127.0.0.1", 44445) as client:
+            client.lookup("hello")
+            client.lookup("world")
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        config_path: str | None = None,
+        timeout_s: float = RECV_TIMEOUT_SECONDS,
+    ) -> None:
+        """Connect to the server, wrapping in TLS if the config enables it.
+
+        Args:
+            host: Server host to connect to.
+            port: Server port to connect to.
+            config_path: Optional config file providing SSL settings.
+            timeout_s: Timeout for connecting and for each response.
+
+        Raises:
+            SystemExit: If the config cannot be loaded.
+            OSError: If the connection or TLS handshake fails.
+        """
+        self._host = host
+        raw_sock = _connect(host, port, timeout_s)
+        try:
+            self._sock = _wrap_client_ssl(raw_sock, host, config_path)
+        except BaseException:
+            raw_sock.close()
+            raise
+
+    def lookup(self, query: str) -> bytes:
+        """Send one query and return its response (debug + result line).
+
+        Args:
+            query: Query string (without a trailing newline).
+
+        Returns:
+            Bytes received up to and including the result line.
+
+        Raises:
+            OSError: If sending or receiving fails.
+        """
+        self._sock.sendall((query + "\n").encode("utf-8"))
+        response = recv_until_result(self._sock)
+        _remember_tls_session(self._sock, self._host)
+        return response
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._sock.close()
+
+    def __enter__(self) -> "LookupClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
 
 def _die(msg: str, code: int = 2) -> "None":
@@ -162,23 +427,25 @@ def _die(msg: str, code: int = 2) -> "None":
 def main() -> None:
     """Run the client entry point."""
     args = parse_args()
-    query_line = args.query + "\n"
 
-    try:
-        with socket.create_connection(
-            (args.host, args.port),
-            timeout=RECV_TIMEOUT_SECONDS,
-        ) as raw_sock:
-            raw_sock.settimeout(RECV_TIMEOUT_SECONDS)
-
-            sock = _wrap_client_ssl(raw_sock, args.host, args.config)
+    if args.cpu_affinity is not None:
+        # Receiving on the CPU that takes the NIC interrupt avoids pulling
+        # socket data across NUMA nodes/chiplets.
+        if not hasattr(os, "sched_setaffinity"):
+            _die("--cpu-affinity is not supported on this platform.")
+        try:
+            os.sched_setaffinity(0, args.cpu_affinity)
+        except OSError as exc:
+            _die(f"Cannot set CPU affinity: {exc}")
 
-            sock.sendall(query_line.encode("utf-8"))
-
-            # Read one response (debug + result), then exit cleanly.
-            response = recv_until_result(sock)
+    try:
+        # Read one response (debug + result), then exit cleanly.
+        with LookupClient(args.host, args.port, args.config) as client:
+            response = client.lookup(args.query)
 
-        print(response.decode("utf-8", errors="replace"), end="")
+        # The response is already encoded; skip a decode/encode round-trip.
+        sys.stdout.buffer.write(response)
+        sys.stdout.flush()
 
     except ConnectionResetError:
         # Common when server expects TLS but client spoke plain TCP.
@@ -16,6 +16,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Callable, Iterable
 
 
 class ConfigError(ValueError):
@@ -53,6 +54,20 @@ class AppConfig:
     ssl_cafile: Path | None = None
 
 
+_BOOL_VALUES: dict[str, bool] = {
+    "true": True,
+    "1": True,
+    "yes": True,
+    "y": True,
+    "on": True,
+    "false": False,
+    "0": False,
+    "no": False,
+    "n": False,
+    "off": False,
+}
+
+
 def _parse_bool(value: str) -> bool:
     """Parse a boolean config value.
 
@@ -68,12 +83,153 @@ def _parse_bool(value: str) -> bool:
     Raises:
         ConfigError: If the value cannot be interpreted as a boolean.
     """
-    v = value.strip().lower()
-    if v in {"true", "1", "yes", "y", "on"}:
-        return True
-    if v in {"false", "0", "no", "n", "off"}:
-        return False
-    raise ConfigError(f"Invalid boolean value: {value!r}")
+    parsed = _BOOL_VALUES.get(value.strip().lower())
+    if parsed is None:
+        raise ConfigError(f"Invalid boolean value: {value!r}")
+    return parsed
+
+
+def _parse_linuxpath(value: str) -> Path:
+    """Parse the required data file path.
+
+    Args:
+        value: Stripped value from the config file.
+
+    Returns:
+        The configured path.
+
+    Raises:
+        ConfigError: If the value is empty.
+    """
+    if not value:
+        raise ConfigError("linuxpath is present but empty")
+    return Path(value)
+
+
+def _parse_search_algo(value: str) -> str:
+    """Parse the search algorithm name (validated after parsing).
+
+    Args:
+        value: Stripped value from the config file.
+
+    Returns:
+        The algorithm name.
+
+    Raises:
+        ConfigError: If the value is empty.
+    """
+    if not value:
+        raise ConfigError("search_algo is present but empty")
+    return value
+
+
+def _parse_optional_path(value: str) -> Path | None:
+    """Parse an optional path; an empty value means unset.
+
+    Args:
+        value: Stripped value from the config file.
+
+    Returns:
+        The configured path, or None if the value is empty.
+    """
+    return Path(value) if value else None
+
+
+_ALLOWED_ALGOS = frozenset(
+    {
+        "linear_scan",
+        "mmap_scan",
+        "grep_fx",
+        "set_cache",
+        "sorted_bisect",
+        "eytzinger",
+        "bloom_bisect",
+        "hash_set",
+        "sorted_arena",
+    }
+)
+
+# Value parser per supported key. Each receives the stripped value.
+_KEY_PARSERS: dict[str, Callable[[str], Any]] = {
+    "linuxpath": _parse_linuxpath,
+    "reread_on_query": _parse_bool,
+    "search_algo": _parse_search_algo,
+    "ssl_enabled": _parse_bool,
+    "ssl_certfile": _parse_optional_path,
+    "ssl_keyfile": _parse_optional_path,
+    "ssl_verify": _parse_bool,
+    "ssl_cafile": _parse_optional_path,
+}
+
+
+def _parse_config_lines(lines: Iterable[str]) -> dict[str, Any]:
+    """Parse key=value lines into values for the supported keys.
+
+    Args:
+        lines: Config file lines, with or without line endings.
+
+    Returns:
+        Parsed values by key, for the supported keys that were present.
+
+    Raises:
+        ConfigError: If a supported key has an invalid value.
+    """
+    values: dict[str, Any] = {}
+
+    for line in lines:
+        stripped = line.strip()
+
+        if not stripped or stripped.startswith("#"):
+            continue
+
+        key, sep, value = stripped.partition("=")
+        if not sep:
+            continue
+
+        # The line is already stripped, so only the inner sides remain.
+        key = key.rstrip()
+        parser = _KEY_PARSERS.get(key)
+        if parser is None:
+            # Unknown keys are ignored.
+            continue
+        values[key] = parser(value.lstrip())
+
+    return values
+
+
+def ssl_enabled_in(config_path: str | Path) -> bool:
+    """Return the ssl_enabled setting of a config file without loading it.
+
+    Only the ssl_enabled key is parsed and nothing else is validated, so
+    plaintext callers can skip the full load. As in load_config(), the
+    last ssl_enabled line wins.
+
+    Args:
+        config_path: Path to the configuration file.
+
+    Returns:
+        The ssl_enabled value, or False if the key is absent.
+
+    Raises:
+        ConfigError: If the file cannot be read or the value is invalid.
+    """
+    path = Path(config_path)
+    enabled = False
+
+    try:
+        with path.open("r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                key, sep, value = line.strip().partition("=")
+                if sep and key.rstrip() == "ssl_enabled":
+                    enabled = _parse_bool(value)
+    except FileNotFoundError as exc:
+        raise ConfigError(f"Config file not found: {path}") from exc
+    except OSError as exc:
+        raise ConfigError(
+            f"Failed to read config file: {path} ({exc})"
+        ) from exc
+
+    return enabled
 
 
 def load_config(config_path: str | Path) -> AppConfig:
@@ -110,7 +266,9 @@ def load_config(config_path: str | Path) -> AppConfig:
     path = Path(config_path)
 
     try:
-        raw = path.read_text(encoding="utf-8", errors="replace")
+        # Lines are parsed as they are read, without a full-text copy.
+        with path.open("r", encoding="utf-8", errors="replace") as f:
+            values = _parse_config_lines(f)
     except FileNotFoundError as exc:
         raise ConfigError(f"Config file not found: {path}") from exc
     except OSError as exc:
@@ -118,83 +276,21 @@ def load_config(config_path: str | Path) -> AppConfig:
             f"Failed to read config file: {path} ({exc})"
         ) from exc
 
-    linuxpath: Path | None = None
-    reread_on_query: bool = True
-    search_algo: str = "linear_scan"
-
-    ssl_enabled: bool = False
-    ssl_certfile: Path | None = None
-    ssl_keyfile: Path | None = None
-    ssl_verify: bool = True
-    ssl_cafile: Path | None = None
-
-    for line in raw.splitlines():
-        stripped = line.strip()
-
-        if not stripped or stripped.startswith("#"):
-            continue
-
-        if stripped.startswith("linuxpath="):
-            value = stripped[len("linuxpath="):].strip()
-            if not value:
-                raise ConfigError("linuxpath is present but empty")
-            linuxpath = Path(value)
-            continue
-
-        if stripped.startswith("reread_on_query="):
-            value = stripped[len("reread_on_query="):].strip()
-            reread_on_query = _parse_bool(value)
-            continue
-
-        if stripped.startswith("search_algo="):
-            value = stripped[len("search_algo="):].strip()
-            if not value:
-                raise ConfigError("search_algo is present but empty")
-            search_algo = value
-            continue
-
-        if stripped.startswith("ssl_enabled="):
-            value = stripped[len("ssl_enabled="):].strip()
-            ssl_enabled = _parse_bool(value)
-            continue
-
-        if stripped.startswith("ssl_certfile="):
-            value = stripped[len("ssl_certfile="):].strip()
-            ssl_certfile = Path(value) if value else None
-            continue
-
-        if stripped.startswith("ssl_keyfile="):
-            value = stripped[len("ssl_keyfile="):].strip()
-            ssl_keyfile = Path(value) if value else None
-            continue
-
-        if stripped.startswith("ssl_verify="):
-            value = stripped[len("ssl_verify="):].strip()
-            ssl_verify = _parse_bool(value)
-            continue
-
-        if stripped.startswith("ssl_cafile="):
-            value = stripped[len("ssl_cafile="):].strip()
-            ssl_cafile = Path(value) if value else None
-            continue
-
-        # Unknown keys are ignored.
-
+    linuxpath: Path | None = values.get("linuxpath")
     if linuxpath is None:
         raise ConfigError("Missing required config entry: linuxpath=")
 
-    allowed = {
-        "linear_scan",
-        "mmap_scan",
-        "grep_fx",
-        "set_cache",
-        "sorted_bisect",
-    }
+    search_algo: str = values.get("search_algo", "linear_scan")
+    ssl_enabled: bool = values.get("ssl_enabled", False)
+    ssl_certfile: Path | None = values.get("ssl_certfile")
+    ssl_keyfile: Path | None = values.get("ssl_keyfile")
+    ssl_verify: bool = values.get("ssl_verify", True)
+    ssl_cafile: Path | None = values.get("ssl_cafile")
 
-    if search_algo not in allowed:
+    if search_algo not in _ALLOWED_ALGOS:
         raise ConfigError(
             f"Unsupported search_algo={search_algo!r}. "
-            f"Allowed: {sorted(allowed)}"
+            f"Allowed: {sorted(_ALLOWED_ALGOS)}"
         )
 
     if ssl_enabled:
@@ -212,7 +308,7 @@ def load_config(config_path: str | Path) -> AppConfig:
 
     return AppConfig(
         linuxpath=linuxpath,
-        reread_on_query=reread_on_query,
+        reread_on_query=values.get("reread_on_query", True),
         search_algo=search_algo,
         ssl_enabled=ssl_enabled,
         ssl_certfile=ssl_certfile,
@@ -15,23 +15,82 @@ Errors are surfaced as SearchError with context.
 
 from __future__ import annotations
 
+from array import array
 from bisect import bisect_left
 from pathlib import Path
+from typing import IO, Any, BinaryIO, Iterable, Iterator
 
+import io
 import mmap
+import os
 import subprocess
+import threading
+
+
+# Read size for search_linear_scan; large reads keep per-call overhead low.
+LINEAR_SCAN_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Byte values that end a line (LF and CR; CRLF is covered by both).
+_LINE_TERMINATORS = frozenset(b"\r\n")
+
+# What bytes that are not valid UTF-8 decode to with errors="replace". A
+# query containing it can equal such a line, which no byte comparison with
+# the encoded query finds.
+_REPLACEMENT_CHAR = "\ufffd"
+
+# Characters str.splitlines() treats as line breaks besides CR and LF.
+_EXTRA_LINE_SEPARATORS = "\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+# Extra pattern GrepWorker sends after every query to delimit its answer.
+# Queries containing CR are never sent to the worker, so none can match it.
+_GREP_SENTINEL = b"\r"
 
 
 class SearchError(RuntimeError):
     """Raised when the search subsystem cannot read the data file."""
 
 
+def _open_sequential(file_path: Path, mode: str, **kwargs: Any) -> IO[Any]:
+    """Open a file that will be read once, front to back.
+
+    POSIX_FADV_SEQUENTIAL widens kernel readahead for the descriptor and
+    POSIX_FADV_WILLNEED starts reading the file in before the first read().
+    Platforms without posix_fadvise() are left at defaults.
+
+    Args:
+        file_path: Path to open.
+        mode: Mode passed to Path.open().
+        **kwargs: Further Path.open() arguments.
+
+    Returns:
+        The open file object.
+
+    Raises:
+        OSError: If the file cannot be opened.
+    """
+    f = file_path.open(mode, **kwargs)
+    for name in ("POSIX_FADV_SEQUENTIAL", "POSIX_FADV_WILLNEED"):
+        advice = getattr(os, name, None)
+        if advice is None:
+            continue
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, advice)
+        except (AttributeError, OSError):
+            # The hint is optional; reads are correct without it.
+            break
+    return f
+
+
 def search_linear_scan(file_path: Path, query: str) -> bool:
     """Search by sequentially scanning the file for an exact line match.
 
-    This function reads the file line by line on each call and
-    returns True only
-    if a line equals the query (after stripping line terminators).
+    This function reads the file in large binary chunks on each call and
+    locates the encoded query with bytes.find(), accepting a hit only when
+    it is bounded by line terminators (LF, CR or CRLF) or the file edges.
+    No per-line Python objects are created.
+
+    Empty queries and queries containing U+FFFD are compared with the
+    decoded lines instead (see _search_decoded_lines()).
 
     Args:
         file_path: Path to the data file.
@@ -44,13 +103,47 @@ def search_linear_scan(file_path: Path, query: str) -> bool:
         SearchError: If the file cannot be read.
     """
     try:
-        with file_path.open(
-            "r", encoding="utf-8", errors="replace", newline=""
+        q = query.encode("utf-8")
+        if not q or _REPLACEMENT_CHAR in query:
+            # The chunk scan cannot express these: an empty query matches
+            # an empty line, and U+FFFD also stands for bytes that are not
+            # valid UTF-8. Both are rare, so compare decoded lines instead.
+            return _search_decoded_lines(file_path, query)
+        if b"\n" in q or b"\r" in q:
+            return False
+
+        with _open_sequential(file_path, "rb", buffering=0) as f:
+            return _scan_chunks_for_line(f, q)
+    except FileNotFoundError as exc:
+        raise SearchError(f"Data file not found: {file_path}") from exc
+    except OSError as exc:
+        raise SearchError(
+            f"Failed reading data file: {file_path} ({exc})"
+        ) from exc
+
+
+def _search_decoded_lines(file_path: Path, query: str) -> bool:
+    """Return True if query equals a line of the file read as text.
+
+    Lines end at LF, CR or CRLF and are decoded as UTF-8 with replacement,
+    as build_set_cache() reads them. The byte-level scans fall back to this
+    for queries they cannot look for as bytes.
+
+    Args:
+        file_path: Path to the data file.
+        query: Query string to match against full lines.
+
+    Returns:
+        True if an exact full-line match is found, otherwise False.
+
+    Raises:
+        SearchError: If the file cannot be read.
+    """
+    try:
+        with _open_sequential(
+            file_path, "r", encoding="utf-8", errors="replace", newline=""
         ) as f:
-            for line in f:
-                if line.rstrip("\r\n") == query:
-                    return True
-        return False
+            return any(line.rstrip("\r\n") == query for line in f)
     except FileNotFoundError as exc:
         raise SearchError(f"Data file not found: {file_path}") from exc
     except OSError as exc:
@@ -59,29 +152,106 @@ def search_linear_scan(file_path: Path, query: str) -> bool:
         ) from exc
 
 
-def build_set_cache(file_path: Path) -> set[str]:
+def _scan_chunks_for_line(f: BinaryIO, q: bytes) -> bool:
+    """Return True if q occurs as a whole line in the binary stream f.
+
+    Chunks are read LINEAR_SCAN_CHUNK_BYTES at a time. The last len(q) + 1
+    bytes of each chunk are carried into the next one, so a match (and the
+    byte before it) that straddles a chunk boundary is still validated.
+
+    Args:
+        f: Binary file opened for reading.
+        q: Encoded, non-empty query without line terminators.
+
+    Returns:
+        True if an exact full-line match is found, otherwise False.
+    """
+    qlen = len(q)
+    keep = qlen + 1
+    buf = b""
+    # File offset of buf[0], to recognise a match at the start of the file.
+    buf_offset = 0
+
+    while True:
+        data = f.read(LINEAR_SCAN_CHUNK_BYTES)
+        eof = not data
+        buf = buf + data if buf else data
+        n = len(buf)
+
+        pos = buf.find(q)
+        while pos != -1:
+            end = pos + qlen
+            if end == n and not eof:
+                break  # Need the next byte to check the boundary.
+
+            if pos:
+                before_ok = buf[pos - 1] in _LINE_TERMINATORS
+            else:
+                # At a carried-over start, this candidate was already
+                # checked against its preceding byte in the last round.
+                before_ok = buf_offset == 0
+            after_ok = end == n or buf[end] in _LINE_TERMINATORS
+            if before_ok and after_ok:
+                return True
+
+            pos = buf.find(q, pos + 1)
+
+        if eof:
+            return False
+
+        if n > keep:
+            buf_offset += n - keep
+            buf = buf[-keep:]
+
+
+def _read_lines(file_path: Path) -> list[str]:
+    """Return all lines of the file, without their terminators.
+
+    Lines end at LF, CR or CRLF and are decoded as UTF-8 with replacement,
+    as iterating the file in text mode with newline="" would give. The
+    file is read and decoded in one go and split by str.splitlines() in C;
+    that method also breaks at a few other separators (VT, FF, FS, GS, RS,
+    NEL, U+2028, U+2029), so text containing any of them is split by the
+    line iterator instead.
+
+    Args:
+        file_path: Path to the data file.
+
+    Returns:
+        The lines, in file order.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    with _open_sequential(file_path, "rb", buffering=0) as f:
+        text = f.read().decode("utf-8", errors="replace")
+    if not any(sep in text for sep in _EXTRA_LINE_SEPARATORS):
+        return text.splitlines()
+
+    with io.StringIO(text, newline="") as f:
+        return [line.rstrip("\r\n") for line in f]
+
+
+def build_set_cache(file_path: Path) -> frozenset[str]:
     """Build a set cache of all lines in the file.
 
-    The resulting set enables fast membership checks with `query in cache`.
+    The resulting frozenset enables fast membership checks with
+    `query in cache`. It is built by the frozenset constructor from the
+    lines split in C by _read_lines(), and is immutable, so it can be
+    shared by server threads as is.
 
     Args:
         file_path: Path to the data file.
 
     Returns:
-        A set containing all lines from the file
+        A frozenset containing all lines from the file
         (with line terminators stripped).
 
     Raises:
         SearchError: If the file cannot be read.
     """
     try:
-        lines: set[str] = set()
-        with file_path.open(
-            "r", encoding="utf-8", errors="replace", newline=""
-        ) as f:
-            for line in f:
-                lines.add(line.rstrip("\r\n"))
-        return lines
+        return frozenset(_read_lines(file_path))
     except FileNotFoundError as exc:
         raise SearchError(f"Data file not found: {file_path}") from exc
     except OSError as exc:
@@ -90,7 +260,7 @@ def build_set_cache(file_path: Path) -> set[str]:
         ) from exc
 
 
-def search_set_cache(cache: set[str], query: str) -> bool:
+def search_set_cache(cache: frozenset[str], query: str) -> bool:
     """Search for a query in a pre-built set cache.
 
     Args:
@@ -119,12 +289,7 @@ def build_sorted_list(file_path: Path) -> list[str]:
         SearchError: If the file cannot be read.
     """
     try:
-        lines: list[str] = []
-        with file_path.open(
-            "r", encoding="utf-8", errors="replace", newline=""
-        ) as f:
-            for line in f:
-                lines.append(line.rstrip("\r\n"))
+        lines = _read_lines(file_path)
         lines.sort()
         return lines
     except FileNotFoundError as exc:
@@ -150,6 +315,360 @@ def search_sorted_bisect(sorted_lines: list[str], query: str) -> bool:
     return idx < len(sorted_lines) and sorted_lines[idx] == query
 
 
+class BloomFilter:
+    """Fixed-size Bloom filter for rejecting absent lines cheaply.
+
+    Besides the bit array, a 256-entry table records which first characters
+    (code point modulo 256) occur, rejecting many misses with one index.
+    Two bit positions are taken from the low and high halves of Python's
+    str hash (already cached on str objects), which keeps the per-query
+    Python work small; a filter is only valid in the process that built it.
+    """
+
+    __slots__ = ("_bits", "_mask", "_first")
+
+    def __init__(self, m_bits: int = 1 << 22) -> None:
+        """Create an empty filter.
+
+        Args:
+            m_bits: Number of bits; a power of two, at least 8.
+
+        Raises:
+            ValueError: If m_bits is not a power of two of at least 8.
+        """
+        if m_bits < 8 or m_bits & (m_bits - 1):
+            raise ValueError("m_bits must be a power of two >= 8")
+        self._bits = bytearray(m_bits // 8)
+        self._mask = m_bits - 1
+        self._first = bytearray(256)
+
+    def add(self, value: str) -> None:
+        """Add a value to the filter."""
+        self._first[ord(value[0]) & 0xFF if value else 0] = 1
+        h = hash(value)
+        a = h & self._mask
+        b = (h >> 32) & self._mask
+        self._bits[a >> 3] |= 1 << (a & 7)
+        self._bits[b >> 3] |= 1 << (b & 7)
+
+    def might_contain(self, value: str) -> bool:
+        """Return False if value was definitely never added."""
+        if not self._first[ord(value[0]) & 0xFF if value else 0]:
+            return False
+        h = hash(value)
+        a = h & self._mask
+        b = (h >> 32) & self._mask
+        bits = self._bits
+        return bool(
+            bits[a >> 3] & (1 << (a & 7)) and bits[b >> 3] & (1 << (b & 7))
+        )
+
+
+def build_bloom_sorted_list(
+    file_path: Path,
+) -> tuple[BloomFilter, list[str]]:
+    """Build a sorted line list together with a Bloom pre-filter over it.
+
+    Args:
+        file_path: Path to the data file.
+
+    Returns:
+        A tuple of (filter, sorted lines).
+
+    Raises:
+        SearchError: If the file cannot be read.
+    """
+    sorted_lines = build_sorted_list(file_path)
+    bloom = BloomFilter()
+    for line in sorted_lines:
+        bloom.add(line)
+    return bloom, sorted_lines
+
+
+def search_bloom_bisect(
+    index: tuple[BloomFilter, list[str]], query: str
+) -> bool:
+    """Search a sorted list, rejecting most misses via its Bloom filter.
+
+    Args:
+        index: Tuple built by build_bloom_sorted_list().
+        query: Query string to locate.
+
+    Returns:
+        True if the query exists as an exact element, otherwise False.
+    """
+    bloom, sorted_lines = index
+    return bloom.might_contain(query) and search_sorted_bisect(
+        sorted_lines, query
+    )
+
+
+class HashSetCache:
+    """Sorted 64-bit line fingerprints, verified against the file on a hit.
+
+    Each line is reduced to Python's 64-bit hash of its bytes, kept in a
+    sorted array('q') next to an array('Q') with the line's byte offset:
+    16 bytes per line, whatever the line length. A lookup bisects the
+    fingerprints and confirms a candidate by pread()ing the line back from
+    the data file, so hash collisions never produce a false hit. Repeated
+    lines are stored once.
+
+    Lines are split at LF, CR or CRLF and compared as UTF-8 bytes, like
+    search_linear_scan(); lines that are not valid UTF-8 are also kept
+    decoded with replacement, the form queries for them arrive in. The file
+    stays open for verification: replacing the file does not affect results,
+    but rewriting it in place does, so rebuild the cache after such changes.
+    Fingerprints use Python's hash, so a cache is only valid in the process
+    that built it.
+    """
+
+    __slots__ = ("_hashes", "_offsets", "_replaced", "_file")
+
+    def __init__(self, file_path: Path) -> None:
+        """Fingerprint every line of the file.
+
+        Args:
+            file_path: Path to the data file.
+
+        Raises:
+            OSError: If the file cannot be opened or read.
+        """
+        # Kept open (and closed with the cache) for verification reads.
+        self._file = file_path.open("rb", buffering=0)
+        try:
+            data = self._file.read()
+        except OSError:
+            self._file.close()
+            raise
+
+        # Offset of the first occurrence of each distinct line.
+        first: dict[bytes, int] = {}
+        offset = 0
+        for raw in data.splitlines(keepends=True):
+            first.setdefault(raw.rstrip(b"\r\n"), offset)
+            offset += len(raw)
+        # A line that is not valid UTF-8 never equals an encoded query; keep
+        # it decoded with replacement, the form a query for it arrives in.
+        replaced: set[str] = set()
+        if not data.isascii():
+            for line in first:
+                try:
+                    line.decode("utf-8")
+                except UnicodeDecodeError:
+                    replaced.add(line.decode("utf-8", "replace"))
+        self._replaced = frozenset(replaced)
+        entries = sorted((hash(line), off) for line, off in first.items())
+        del data, first
+        self._hashes = array("q", [h for h, _ in entries])
+        self._offsets = array("Q", [off for _, off in entries])
+
+    def __contains__(self, value: str) -> bool:
+        """Return True if value is an exact line of the data file."""
+        if _REPLACEMENT_CHAR in value and value in self._replaced:
+            return True
+        q = value.encode("utf-8", "surrogatepass")
+        if b"\n" in q or b"\r" in q:
+            return False
+
+        h = hash(q)
+        hashes = self._hashes
+        i = bisect_left(hashes, h)
+        while i < len(hashes) and hashes[i] == h:
+            # The line must be q followed by a terminator or EOF.
+            line = os.pread(
+                self._file.fileno(), len(q) + 1, self._offsets[i]
+            )
+            if line == q or line[:-1] == q and line[-1] in _LINE_TERMINATORS:
+                return True
+            i += 1
+        return False
+
+    def close(self) -> None:
+        """Close the data file used for verification."""
+        self._file.close()
+
+
+def build_hash_set(file_path: Path) -> HashSetCache:
+    """Build a HashSetCache over the file.
+
+    Args:
+        file_path: Path to the data file.
+
+    Returns:
+        The fingerprint cache.
+
+    Raises:
+        SearchError: If the file cannot be read.
+    """
+    try:
+        return HashSetCache(file_path)
+    except FileNotFoundError as exc:
+        raise SearchError(f"Data file not found: {file_path}") from exc
+    except OSError as exc:
+        raise SearchError(
+            f"Failed reading data file: {file_path} ({exc})"
+        ) from exc
+
+
+def search_hash_set(cache: HashSetCache, query: str) -> bool:
+    """Search for a query in a pre-built HashSetCache.
+
+    Args:
+        cache: Cache built by build_hash_set().
+        query: Query string to check.
+
+    Returns:
+        True if the query exists as an exact line, otherwise False.
+
+    Raises:
+        SearchError: If the data file cannot be read for verification.
+    """
+    try:
+        return query in cache
+    except OSError as exc:
+        raise SearchError(f"Failed verifying hash_set hit ({exc})") from exc
+
+
+def build_sorted_arena(file_path: Path) -> tuple[bytes, array[int]]:
+    """Build a sorted, de-duplicated line arena for binary search.
+
+    The distinct lines are UTF-8 encoded, sorted and concatenated into one
+    bytes arena; line i spans offsets[i]:offsets[i + 1]. This keeps two
+    objects in total instead of one str per line. Byte order of UTF-8 is
+    code point order, so lines sort as sorted_bisect's str lines do.
+
+    Args:
+        file_path: Path to the data file.
+
+    Returns:
+        A tuple of (arena, offsets), with len(offsets) == line count + 1.
+
+    Raises:
+        SearchError: If the file cannot be read.
+    """
+    try:
+        lines = _read_lines(file_path)
+    except FileNotFoundError as exc:
+        raise SearchError(f"Data file not found: {file_path}") from exc
+    except OSError as exc:
+        raise SearchError(
+            f"Failed reading data file: {file_path} ({exc})"
+        ) from exc
+
+    encoded = sorted({line.encode("utf-8", "surrogatepass") for line in lines})
+    offsets = array("Q", [0])
+    end = 0
+    for line_bytes in encoded:
+        end += len(line_bytes)
+        offsets.append(end)
+    return b"".join(encoded), offsets
+
+
+def search_sorted_arena(
+    index: tuple[bytes, array[int]], query: str
+) -> bool:
+    """Binary-search a sorted line arena for an exact line.
+
+    Args:
+        index: Tuple built by build_sorted_arena().
+        query: Query string to locate.
+
+    Returns:
+        True if the query exists as an exact line, otherwise False.
+    """
+    arena, offsets = index
+    q = query.encode("utf-8", "surrogatepass")
+    lo = 0
+    hi = len(offsets) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if arena[offsets[mid]: offsets[mid + 1]] < q:
+            lo = mid + 1
+        else:
+            hi = mid
+    return (
+        lo < len(offsets) - 1
+        and arena[offsets[lo]: offsets[lo + 1]] == q
+    )
+
+
+def build_eytzinger_list(file_path: Path) -> list[str]:
+    """Build an Eytzinger-ordered list of all lines in the file.
+
+    The sorted lines are laid out as an implicit binary search tree in
+    breadth-first order: the root is at index 1 and the children of node k
+    are at 2k and 2k + 1 (index 0 is unused). A lookup then only ever walks
+    forward through the list.
+
+    Args:
+        file_path: Path to the data file.
+
+    Returns:
+        The Eytzinger-ordered lines, with a placeholder at index 0.
+
+    Raises:
+        SearchError: If the file cannot be read.
+    """
+    sorted_lines = build_sorted_list(file_path)
+    n = len(sorted_lines)
+    layout = [""] * (n + 1)
+
+    # In-order walk of the implicit tree assigns the sorted values.
+    values = iter(sorted_lines)
+    stack: list[int] = []
+    k = 1
+    while stack or k <= n:
+        while k <= n:
+            stack.append(k)
+            k *= 2
+        k = stack.pop()
+        layout[k] = next(values)
+        k = 2 * k + 1
+
+    return layout
+
+
+def search_eytzinger(layout: list[str], query: str) -> bool:
+    """Search for a query in an Eytzinger-ordered list.
+
+    Args:
+        layout: List built by build_eytzinger_list().
+        query: Query string to locate.
+
+    Returns:
+        True if the query exists as an exact element, otherwise False.
+    """
+    n = len(layout) - 1
+    k = 1
+    while k <= n:
+        k = 2 * k + (layout[k] < query)
+    # Undo the trailing right turns (and the final one) to reach the
+    # lower-bound node; k == 0 means every element is smaller.
+    k >>= (k ^ (k + 1)).bit_length()
+    return k != 0 and layout[k] == query
+
+
+def _advise_sequential(mm: mmap.mmap) -> None:
+    """Hint the kernel that a mapping will be read once, front to back.
+
+    MADV_SEQUENTIAL enables aggressive readahead and early page reuse, and
+    MADV_WILLNEED starts reading the file in before the scan touches it.
+    Platforms without madvise() (or these flags) are left at defaults.
+
+    Args:
+        mm: Mapping about to be scanned.
+    """
+    for name in ("MADV_SEQUENTIAL", "MADV_WILLNEED"):
+        advice = getattr(mmap, name, None)
+        if advice is None:
+            continue
+        try:
+            mm.madvise(advice)
+        except (AttributeError, OSError):
+            # The hint is optional; the scan is correct without it.
+            return
+
+
 def search_mmap_scan(file_path: Path, query: str) -> bool:
     """Search using a memory-mapped file scan with boundary validation.
 
@@ -159,6 +678,9 @@ def search_mmap_scan(file_path: Path, query: str) -> bool:
       matches.
     - Handles both LF and CRLF line endings.
 
+    The file is mapped for this call only; see map_file() and search_mmap()
+    to reuse one mapping across queries.
+
     Args:
         file_path: Path to the data file.
         query: Query string to match against full lines.
@@ -169,67 +691,397 @@ def search_mmap_scan(file_path: Path, query: str) -> bool:
     Raises:
         SearchError: If the file cannot be read or memory-mapped.
     """
-    try:
-        q = query.encode("utf-8")
-        if not q:
-            return False
+    if not query:
+        return False
 
+    mm = map_file(file_path)
+    if mm is None:
+        return False
+    with mm:
+        return search_mmap(mm, query)
+
+
+def map_file(file_path: Path) -> mmap.mmap | None:
+    """Memory-map a data file read-only, advised for sequential scans.
+
+    The returned mapping stays valid after this function returns (the file
+    descriptor is not needed once mapped) and is released when closed or
+    garbage collected.
+
+    Args:
+        file_path: Path to the data file.
+
+    Returns:
+        The mapping, or None if the file is empty (which cannot be mapped).
+
+    Raises:
+        SearchError: If the file cannot be read or memory-mapped.
+    """
+    try:
         with file_path.open("rb") as f:
             # If the file is empty, mmap of size 0 fails; handle explicitly.
             try:
                 mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
             except ValueError:
-                return False
+                return None
+    except FileNotFoundError as exc:
+        raise SearchError(f"Data file not found: {file_path}") from exc
+    except OSError as exc:
+        raise SearchError(
+            f"Failed mmap reading data file: {file_path} ({exc})"
+        ) from exc
+
+    _advise_sequential(mm)
+    return mm
+
 
-            with mm:
-                n = mm.size()
-                start = 0
-
-                while True:
-                    pos = mm.find(q, start)
-                    if pos == -1:
-                        return False
-
-                    before_ok = (pos == 0) or (mm[pos - 1: pos] == b"\n")
-
-                    after_pos = pos + len(q)
-                    if after_pos == n:
-                        after_ok = True  # EOF boundary
-                    else:
-                        nxt = mm[after_pos: after_pos + 1]
-                        if nxt == b"\n":
-                            after_ok = True
-                        elif nxt == b"\r":
-                            # Accept CRLF: must be followed by '\n' or be EOF.
-                            if after_pos + 1 == n:
-                                after_ok = True
-                            else:
-                                after_ok = (
-                                    mm[after_pos + 1: after_pos + 2] == b"\n"
-                                )
-                        else:
-                            after_ok = False
-
-                    if before_ok and after_ok:
-                        return True
-
-                    start = pos + 1
+def search_mmap(mm: mmap.mmap, query: str) -> bool:
+    """Search an existing file mapping for an exact full-line match.
 
+    Args:
+        mm: Mapping returned by map_file().
+        query: Query string to match against full lines.
+
+    Returns:
+        True if an exact full-line match is found, otherwise False.
+    """
+    q = query.encode("utf-8")
+    if not q:
+        return False
+    if _REPLACEMENT_CHAR in query:
+        # See search_linear_scan(); compare the decoded lines instead.
+        with io.StringIO(str(mm, "utf-8", "replace"), newline="") as f:
+            return any(line.rstrip("\r\n") == query for line in f)
+
+    # len() is the mapped length; size() would report the current file
+    # size, which differs once a long-lived mapping's file has changed.
+    n = len(mm)
+    qlen = len(q)
+    needle = b"\n" + q
+
+    # Only candidates at a line start can match, so let find() skip the
+    # rest in C by searching for LF + query; the file's first line is the
+    # one start without a preceding LF. Bounded find() and indexing (which
+    # yields ints) compare in place, without allocating bytes slices.
+    pos = mm.find(q, 0, qlen)
+    if pos == -1:
+        pos = mm.find(needle)
+        if pos != -1:
+            pos += 1
+
+    while pos != -1:
+        after_pos = pos + qlen
+        if after_pos == n:
+            return True  # EOF boundary
+
+        nxt = mm[after_pos]
+        if nxt == 0x0A:  # LF
+            return True
+        if nxt == 0x0D:  # CR
+            # Accept CRLF: must be followed by '\n' or be EOF.
+            if after_pos + 1 == n or mm[after_pos + 1] == 0x0A:
+                return True
+
+        pos = mm.find(needle, pos)
+        if pos != -1:
+            pos += 1
+
+    return False
+
+
+def _scan_chunks_for_lf_line(f: BinaryIO, q: bytes) -> bool:
+    """Return True if q occurs in f as a line, as search_mmap() bounds it.
+
+    A line starts at the file start or after LF and ends at LF, CRLF, a
+    final CR or the end of the file. Chunks are read as in
+    _scan_chunks_for_line(); the last len(q) + 2 bytes of each are carried
+    into the next one, so a match straddling a chunk boundary is seen with
+    the byte before it and the two after it.
+
+    Args:
+        f: Binary file opened for reading.
+        q: Encoded, non-empty query.
+
+    Returns:
+        True if an exact full-line match is found, otherwise False.
+    """
+    qlen = len(q)
+    keep = qlen + 2
+    buf = b""
+    # File offset of buf[0], to recognise a match at the start of the file.
+    buf_offset = 0
+
+    while True:
+        data = f.read(LINEAR_SCAN_CHUNK_BYTES)
+        eof = not data
+        buf = buf + data if buf else data
+        n = len(buf)
+
+        pos = buf.find(q)
+        while pos != -1:
+            end = pos + qlen
+            if end + 2 > n and not eof:
+                break  # Need the next two bytes to check the boundary.
+
+            if pos:
+                before_ok = buf[pos - 1] == 0x0A
+            else:
+                # At a carried-over start, this candidate was already
+                # checked against its preceding byte in the last round.
+                before_ok = buf_offset == 0
+            if end == n or buf[end] == 0x0A:
+                after_ok = True
+            else:
+                # Accept CRLF, or a CR that ends the file.
+                after_ok = buf[end] == 0x0D and (
+                    end + 1 == n or buf[end + 1] == 0x0A
+                )
+            if before_ok and after_ok:
+                return True
+
+            pos = buf.find(q, pos + 1)
+
+        if eof:
+            return False
+
+        if n > keep:
+            buf_offset += n - keep
+            buf = buf[-keep:]
+
+
+def search_mmap_read(file_path: Path, query: str) -> bool:
+    """Search like search_mmap(), reading the file instead of mapping it.
+
+    SearchEngine uses this for mmap_scan with reread_on_query=True. The
+    file may then be truncated in place while a query scans it; a mapping
+    faults (SIGBUS) on pages past the new end of the file, while read()
+    just returns less data.
+
+    Args:
+        file_path: Path to the data file.
+        query: Query string to match against full lines.
+
+    Returns:
+        True if an exact full-line match is found, otherwise False.
+
+    Raises:
+        SearchError: If the file cannot be read.
+    """
+    q = query.encode("utf-8")
+    if not q:
+        return False
+    if _REPLACEMENT_CHAR in query:
+        # See search_linear_scan().
+        return _search_decoded_lines(file_path, query)
+
+    try:
+        with _open_sequential(file_path, "rb", buffering=0) as f:
+            return _scan_chunks_for_lf_line(f, q)
     except FileNotFoundError as exc:
         raise SearchError(f"Data file not found: {file_path}") from exc
     except OSError as exc:
         raise SearchError(
-            f"Failed mmap reading data file: {file_path} ({exc})"
+            f"Failed reading data file: {file_path} ({exc})"
+        ) from exc
+
+
+def _line_blocks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Regroup raw chunks into blocks that end right after an LF.
+
+    Only the final block may lack a trailing LF, so no line (and no CRLF
+    pair) is ever split between two blocks.
+
+    Args:
+        chunks: Consecutive pieces of the file content.
+
+    Yields:
+        Blocks of whole lines, in file order.
+    """
+    carry = b""
+    for data in chunks:
+        buf = carry + data if carry else data
+        cut = buf.rfind(b"\n") + 1
+        if cut:
+            yield buf[:cut]
+        carry = buf[cut:]
+    if carry:
+        yield carry
+
+
+def search_linear_scan_batch(
+    file_path: Path, queries: list[str]
+) -> list[bool]:
+    """Answer several queries with a single sequential scan of the file.
+
+    Lines are split like search_linear_scan() bounds them (LF, CR or CRLF)
+    and intersected, a block at a time, with the set of pending queries in
+    C; the scan stops early once every query has been found. Queries
+    containing U+FFFD are answered by search_linear_scan() itself.
+
+    Args:
+        file_path: Path to the data file.
+        queries: Query strings to match against full lines.
+
+    Returns:
+        One result per query, in order, equal to what search_linear_scan()
+        returns for it.
+
+    Raises:
+        SearchError: If the file cannot be read.
+    """
+    encoded = [q.encode("utf-8") for q in queries]
+    wanted = {
+        q
+        for q, query in zip(encoded, queries)
+        if b"\n" not in q and b"\r" not in q and _REPLACEMENT_CHAR not in query
+    }
+    found: set[bytes] = set()
+
+    try:
+        with _open_sequential(file_path, "rb", buffering=0) as f:
+            chunks = iter(lambda: f.read(LINEAR_SCAN_CHUNK_BYTES), b"")
+            for block in _line_blocks(chunks):
+                if len(found) == len(wanted):
+                    break
+                found.update(wanted.intersection(block.splitlines()))
+    except FileNotFoundError as exc:
+        raise SearchError(f"Data file not found: {file_path}") from exc
+    except OSError as exc:
+        raise SearchError(
+            f"Failed reading data file: {file_path} ({exc})"
+        ) from exc
+
+    return [
+        q in found if q in wanted else search_linear_scan(file_path, query)
+        for q, query in zip(encoded, queries)
+    ]
+
+
+def _find_lf_lines(
+    chunks: Iterable[bytes], targets: set[bytes]
+) -> set[bytes]:
+    """Return the targets that occur as lines of the chunked content.
+
+    Lines are split on LF with one trailing CR ignored, matching the
+    boundaries search_mmap() accepts. The scan stops early once every
+    target has been found.
+
+    Args:
+        chunks: Consecutive pieces of the file content.
+        targets: Encoded, non-empty queries without LF.
+
+    Returns:
+        The targets that were found.
+    """
+    # Accepted line content -> queries it answers (LF and CRLF endings);
+    # one line can answer both q and q + CR.
+    wanted: dict[bytes, list[bytes]] = {}
+    for q in targets:
+        wanted.setdefault(q, []).append(q)
+        wanted.setdefault(q + b"\r", []).append(q)
+    found: set[bytes] = set()
+
+    for block in _line_blocks(chunks):
+        if len(found) == len(targets):
+            break
+        for line in wanted.keys() & block.split(b"\n"):
+            found.update(wanted[line])
+    return found
+
+
+def search_mmap_batch(mm: mmap.mmap, queries: list[str]) -> list[bool]:
+    """Answer several queries with a single pass over a file mapping.
+
+    Lines are split on LF with one trailing CR ignored, matching the
+    boundaries search_mmap() accepts. Queries containing LF can span lines
+    there, and queries containing U+FFFD need decoding, so both are answered
+    by search_mmap() itself.
+
+    Args:
+        mm: Mapping returned by map_file().
+        queries: Query strings to match against full lines.
+
+    Returns:
+        One result per query, in order, equal to what search_mmap()
+        returns for it.
+    """
+    encoded = [q.encode("utf-8") for q in queries]
+    targets = {
+        q
+        for q, query in zip(encoded, queries)
+        if q and b"\n" not in q and _REPLACEMENT_CHAR not in query
+    }
+    step = LINEAR_SCAN_CHUNK_BYTES
+    chunks = (mm[i: i + step] for i in range(0, len(mm), step))
+    found = _find_lf_lines(chunks, targets)
+
+    return [
+        q in found if q in targets else search_mmap(mm, query)
+        for q, query in zip(encoded, queries)
+    ]
+
+
+def search_mmap_read_batch(
+    file_path: Path, queries: list[str]
+) -> list[bool]:
+    """Answer several queries like search_mmap_batch(), reading the file.
+
+    The read-based counterpart used for mmap_scan with
+    reread_on_query=True; see search_mmap_read().
+
+    Args:
+        file_path: Path to the data file.
+        queries: Query strings to match against full lines.
+
+    Returns:
+        One result per query, in order, equal to what search_mmap_read()
+        returns for it.
+
+    Raises:
+        SearchError: If the file cannot be read.
+    """
+    encoded = [q.encode("utf-8") for q in queries]
+    targets = {
+        q
+        for q, query in zip(encoded, queries)
+        if q and b"\n" not in q and _REPLACEMENT_CHAR not in query
+    }
+    try:
+        with _open_sequential(file_path, "rb", buffering=0) as f:
+            chunks = iter(lambda: f.read(LINEAR_SCAN_CHUNK_BYTES), b"")
+            found = _find_lf_lines(chunks, targets)
+    except FileNotFoundError as exc:
+        raise SearchError(f"Data file not found: {file_path}") from exc
+    except OSError as exc:
+        raise SearchError(
+            f"Failed reading data file: {file_path} ({exc})"
         ) from exc
 
+    return [
+        q in found if q in targets else search_mmap_read(file_path, query)
+        for q, query in zip(encoded, queries)
+    ]
+
+
+def _grep_env() -> dict[str, str]:
+    """Return the environment for grep processes: the current one under C.
+
+    LC_ALL=C makes grep compare raw bytes instead of decoding multibyte
+    characters, which is faster and matches the byte-wise comparisons of
+    search_linear_scan() and search_mmap_scan().
+    """
+    return dict(os.environ, LC_ALL="C")
+
 
 def search_grep_fx(file_path: Path, query: str) -> bool:
     """Search using GNU grep for an exact full-line match.
 
     Uses `grep -F -x` to match the query as a fixed string (-F) and require the
-    whole line to match (-x).
+    whole line to match (-x), with -q to stop at the first match, in the C
+    locale (see _grep_env()).
     This spawns a subprocess per query, which can be a
     reasonable approach when rereading the file per query is acceptable.
+    With reread_on_query=False SearchEngine uses GrepWorker instead.
 
     Args:
         file_path: Path to the data file.
@@ -241,11 +1093,16 @@ def search_grep_fx(file_path: Path, query: str) -> bool:
     Raises:
         SearchError: If grep is unavailable or cannot be executed.
     """
+    if _REPLACEMENT_CHAR in query:
+        # grep compares bytes as well; see search_linear_scan().
+        return _search_decoded_lines(file_path, query)
+
     try:
         result = subprocess.run(
-            ["grep", "-F", "-x", "--", query, str(file_path)],
+            ["grep", "-q", "-F", "-x", "--", query, str(file_path)],
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
+            env=_grep_env(),
             check=False,
         )
         return result.returncode == 0
@@ -253,3 +1110,125 @@ def search_grep_fx(file_path: Path, query: str) -> bool:
         raise SearchError("grep not found on system") from exc
     except OSError as exc:
         raise SearchError(f"Failed running grep: {exc}") from exc
+
+
+class GrepWorker:
+    """Long-lived grep process answering exact-line lookups over pipes.
+
+    The data file is loaded once as grep's fixed-string pattern list
+    (`grep -F -x -f FILE`) and queries are fed on stdin, one per line, so no
+    process is spawned per query. Every query is followed by a sentinel line
+    that always matches: the answer is "found" when the query is echoed back
+    before the sentinel.
+
+    Patterns are read at startup, so the worker is only suitable when
+    reread_on_query=False. Queries the pipe protocol cannot carry (CR or
+    LF), queries containing U+FFFD (see search_grep_fx()) and queries
+    arriving after the worker died use search_grep_fx instead. Lookups are
+    serialised with a lock, so server threads can share one worker.
+
+    Attributes:
+        file_path: Path to the data file loaded by grep.
+    """
+
+    def __init__(self, file_path: Path) -> None:
+        """Spawn the grep process for file_path.
+
+        Raises:
+            SearchError: If grep is unavailable or cannot be executed.
+        """
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        try:
+            self._proc: subprocess.Popen[bytes] | None = subprocess.Popen(
+                [
+                    "grep",
+                    "--line-buffered",
+                    "-F",
+                    "-x",
+                    "-f",
+                    str(file_path),
+                    "-e",
+                    os.fsdecode(_GREP_SENTINEL),
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=_grep_env(),
+                bufsize=0,
+            )
+        except FileNotFoundError as exc:
+            raise SearchError("grep not found on system") from exc
+        except OSError as exc:
+            raise SearchError(f"Failed running grep: {exc}") from exc
+
+    def exists(self, query: str) -> bool:
+        """Return True if query is an exact line of the data file.
+
+        Args:
+            query: Query string to match against full lines.
+
+        Returns:
+            True if the worker (or the one-shot fallback) finds the line.
+
+        Raises:
+            SearchError: If the one-shot fallback cannot run grep.
+        """
+        q = os.fsencode(query)
+        pipeable = b"\n" not in q and b"\r" not in q
+        if pipeable and _REPLACEMENT_CHAR not in query:
+            with self._lock:
+                found = self._ask(q)
+            if found is not None:
+                return found
+        return search_grep_fx(self.file_path, query)
+
+    def _ask(self, q: bytes) -> bool | None:
+        """Send one query to the worker; return None if it is unusable."""
+        proc = self._proc
+        if proc is None:
+            return None
+        assert proc.stdin is not None and proc.stdout is not None
+
+        sentinel_line = _GREP_SENTINEL + b"\n"
+        try:
+            proc.stdin.write(q + b"\n" + sentinel_line)
+            line = proc.stdout.readline()
+            if line == sentinel_line:
+                return False
+            if line and proc.stdout.readline() == sentinel_line:
+                return True
+        except OSError:
+            pass
+        # EOF, a broken pipe or an unexpected reply: retire the worker.
+        self._stop()
+        return None
+
+    def _stop(self) -> None:
+        """Terminate the grep process (caller holds the lock or owns it)."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        for stream in (proc.stdin, proc.stdout):
+            if stream is not None:
+                stream.close()
+        proc.kill()
+        proc.wait()
+
+    def close(self) -> None:
+        """Terminate the grep process. Later lookups use the fallback."""
+        with self._lock:
+            self._stop()
+
+    def detach(self) -> None:
+        """Drop a worker inherited through fork() without stopping it.
+
+        Only this process's copies of the pipes are closed; the grep process
+        keeps serving the parent. Later lookups here use the fallback.
+        """
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        for stream in (proc.stdin, proc.stdout):
+            if stream is not None:
+                stream.close()
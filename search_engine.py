@@ -14,19 +14,37 @@ which is wrapped as EngineError at this layer.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import functools
+import mmap
+from array import array
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 
 from config import AppConfig
 from search import (
+    BloomFilter,
+    GrepWorker,
+    HashSetCache,
     SearchError,
+    build_bloom_sorted_list,
+    build_eytzinger_list,
+    build_hash_set,
     build_set_cache,
+    build_sorted_arena,
     build_sorted_list,
+    map_file,
+    search_bloom_bisect,
+    search_eytzinger,
     search_grep_fx,
+    search_hash_set,
     search_linear_scan,
-    search_mmap_scan,
-    search_set_cache,
+    search_linear_scan_batch,
+    search_mmap,
+    search_mmap_batch,
+    search_mmap_read,
+    search_mmap_read_batch,
+    search_sorted_arena,
     search_sorted_bisect,
 )
 
@@ -35,29 +53,116 @@ class EngineError(RuntimeError):
     """Raised when the search engine cannot operate correctly."""
 
 
-CACHED_ALGOS = {"set_cache", "sorted_bisect"}
+CACHED_ALGOS = {
+    "set_cache",
+    "sorted_bisect",
+    "eytzinger",
+    "bloom_bisect",
+    "hash_set",
+    "sorted_arena",
+}
 REREAD_ALGOS = {"linear_scan", "mmap_scan", "grep_fx"}
 ALL_ALGOS = CACHED_ALGOS | REREAD_ALGOS
 
-CacheType = Union[set[str], list[str]]
+# Below this many queries, separate scans are cheaper than one batch pass
+# (which splits every line instead of running a single bytes.find()).
+BATCH_SCAN_MIN_QUERIES = 8
+
+# Slots in the direct-mapped memo of recent answers kept in front of the
+# scanning algorithms when reread_on_query=False; a power of two.
+QUERY_MEMO_SLOTS = 64
+
+CacheType = Union[
+    frozenset[str],
+    list[str],
+    tuple[BloomFilter, list[str]],
+    HashSetCache,
+    tuple[bytes, "array[int]"],
+]
+
+
+def _memoize_recent(
+    impl: Callable[[str], bool], slots: int = QUERY_MEMO_SLOTS
+) -> Callable[[str], bool]:
+    """Wrap a lookup with a small direct-mapped memo of recent answers.
+
+    Each query maps to one slot by its (cached) str hash; a repeated query
+    found in its slot is answered without running impl. Slots hold
+    immutable (query, result) tuples and are replaced with a single list
+    store, so server threads can share the memo without a lock.
+
+    Args:
+        impl: Lookup to memoize; its answers must not change over time.
+        slots: Number of slots; a power of two.
+
+    Returns:
+        The memoized lookup.
+    """
+    table: list[Optional[tuple[str, bool]]] = [None] * slots
+    mask = slots - 1
+
+    def lookup(query: str) -> bool:
+        i = hash(query) & mask
+        entry = table[i]
+        if entry is not None and entry[0] == query:
+            return entry[1]
+        found = impl(query)
+        table[i] = (query, found)
+        return found
+
+    return lookup
 
 
 @dataclass
+class _EngineState:
+    """Mutable per-engine state, kept apart so SearchEngine can be frozen.
+
+    Attributes:
+        cache: Optional cache used by cached algorithms
+            when reread_on_query=False.
+        mm: Persistent mapping of the data file used by mmap_scan.
+        mm_mapped: Whether the data file has been mapped into mm.
+        grep: Persistent grep process used by grep_fx
+            when reread_on_query=False.
+        impl: Lookup callable bound by warmup() for the selected algorithm.
+    """
+
+    cache: Optional[CacheType] = None
+    mm: Optional[mmap.mmap] = None
+    mm_mapped: bool = False
+    grep: Optional[GrepWorker] = None
+    impl: Optional[Callable[[str], bool]] = None
+
+
+@dataclass(frozen=True)
 class SearchEngine:
     """Engine that routes queries to the configured search algorithm.
 
+    The configuration fields are immutable, so they are validated once at
+    construction and never re-checked per query.
+
     Attributes:
         file_path: Path to the data file used for lookups.
         reread_on_query: Whether to read/search the file anew for each query.
         search_algo: Selected search algorithm name.
-        _cache: Optional cache used by cached algorithms
-            when reread_on_query=False.
+        _state: Caches, mappings and the bound lookup built by warmup().
     """
 
     file_path: Path
     reread_on_query: bool
     search_algo: str
-    _cache: Optional[CacheType] = None
+    _state: _EngineState = field(
+        default_factory=_EngineState, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Validate the configuration.
+
+        Raises:
+            EngineError: If the algorithm is unsupported or
+                incompatible with the current reread_on_query setting.
+        """
+        self._validate_compatibility()
 
     @classmethod
     def supported_algorithms(cls) -> set[str]:
@@ -74,13 +179,11 @@ class SearchEngine:
         Returns:
             A SearchEngine instance validated against the selected mode.
         """
-        engine = cls(
+        return cls(
             file_path=cfg.linuxpath,
             reread_on_query=cfg.reread_on_query,
             search_algo=cfg.search_algo,
         )
-        engine._validate_compatibility()
-        return engine
 
     def _validate_compatibility(self) -> None:
         """Validate that the selected mode and algorithm are compatible.
@@ -101,36 +204,187 @@ class SearchEngine:
     def warmup(self) -> None:
         """Prepare the engine for query execution.
 
-        For cached algorithms, this builds and stores the cache. For non-cached
-        algorithms, warmup is a no-op.
+        For cached algorithms, this builds and stores the cache. For mmap_scan
+        it maps the data file and for grep_fx it starts a persistent grep
+        process; for linear_scan, warmup is a no-op.
 
         Warmup is only useful when reread_on_query=False.
         If reread_on_query=True, any existing cache is cleared.
 
+        In every mode, warmup also binds the lookup callable used by exists(),
+        so queries skip the per-call algorithm dispatch.
+
         Raises:
             EngineError: If the data file cannot be read or cached.
         """
-        self._validate_compatibility()
+        self._state.impl = None
 
         if self.reread_on_query:
-            self._cache = None
+            self._state.cache = None
+            self._state.impl = self._bind_impl()
             return
 
         try:
             if self.search_algo == "set_cache":
-                self._cache = build_set_cache(self.file_path)
+                self._state.cache = build_set_cache(self.file_path)
             elif self.search_algo == "sorted_bisect":
-                self._cache = build_sorted_list(self.file_path)
+                self._state.cache = build_sorted_list(self.file_path)
+            elif self.search_algo == "eytzinger":
+                self._state.cache = build_eytzinger_list(self.file_path)
+            elif self.search_algo == "bloom_bisect":
+                self._state.cache = build_bloom_sorted_list(self.file_path)
+            elif self.search_algo == "hash_set":
+                self._state.cache = build_hash_set(self.file_path)
+            elif self.search_algo == "sorted_arena":
+                self._state.cache = build_sorted_arena(self.file_path)
+            elif self.search_algo == "mmap_scan":
+                # Map up front so the first query does not pay for it.
+                self._state.cache = None
+                self._mapped_file()
+            elif self.search_algo == "grep_fx":
+                self._state.cache = None
+                self._grep_worker()
             else:
-                # linear_scan/mmap_scan/grep_fx do not require
-                # an in-memory cache.
-                self._cache = None
+                # linear_scan does not require an in-memory cache.
+                self._state.cache = None
         except SearchError as exc:
             raise EngineError(str(exc)) from exc
 
+        self._state.impl = self._bind_impl()
+
+    def _bind_impl(self) -> Callable[[str], bool]:
+        """Return the lookup callable for the algorithm and current state.
+
+        Called by warmup() once the cache, mapping or worker is ready. With
+        reread_on_query=False, the scanning algorithms are wrapped with a
+        memo of recent answers (see _memoize_recent()).
+
+        Raises:
+            EngineError: If the algorithm is unsupported.
+        """
+        algo = self.search_algo
+        impl: Callable[[str], bool]
+        if algo in REREAD_ALGOS:
+            if algo == "linear_scan":
+                impl = functools.partial(search_linear_scan, self.file_path)
+            elif algo == "mmap_scan":
+                impl = self._search_mmap
+            elif self.reread_on_query:
+                impl = functools.partial(search_grep_fx, self.file_path)
+            else:
+                impl = self._grep_worker().exists
+
+            # Without rereads the file is treated as static, so repeated
+            # queries can skip the scan. Cached algorithms are already
+            # cheaper than the memo.
+            return impl if self.reread_on_query else _memoize_recent(impl)
+
+        cache = self._state.cache
+        if algo == "set_cache":
+            assert isinstance(cache, frozenset)
+            # Same as search_set_cache(), minus one Python call per query.
+            return cache.__contains__
+        if algo == "sorted_bisect":
+            assert isinstance(cache, list)
+            return functools.partial(search_sorted_bisect, cache)
+        if algo == "eytzinger":
+            assert isinstance(cache, list)
+            return functools.partial(search_eytzinger, cache)
+        if algo == "bloom_bisect":
+            assert isinstance(cache, tuple)
+            return functools.partial(search_bloom_bisect, cache)
+        if algo == "hash_set":
+            assert isinstance(cache, HashSetCache)
+            return functools.partial(search_hash_set, cache)
+        if algo == "sorted_arena":
+            assert isinstance(cache, tuple)
+            return functools.partial(search_sorted_arena, cache)
+
+        raise EngineError(f"Unsupported search_algo={algo!r}")
+
+    def _mapped_file(self) -> Optional[mmap.mmap]:
+        """Return the data file mapping for mmap_scan, mapping on first use.
+
+        The mapping is created once and reused across queries. It is only
+        used with reread_on_query=False: with rereads the file can be
+        truncated in place while a query scans it, and a mapping faults
+        (SIGBUS) on pages past the new end of the file, so those queries
+        read the file instead (see search_mmap_read()).
+
+        Returns:
+            The mapping, or None if the file is empty.
+
+        Raises:
+            SearchError: If the file cannot be mapped.
+        """
+        if not self._state.mm_mapped:
+            self._state.mm = map_file(self.file_path)
+            self._state.mm_mapped = True
+        return self._state.mm
+
+    def _grep_worker(self) -> GrepWorker:
+        """Return the persistent grep_fx worker, starting it if needed.
+
+        Raises:
+            SearchError: If grep cannot be started.
+        """
+        if self._state.grep is None:
+            self._state.grep = GrepWorker(self.file_path)
+        return self._state.grep
+
+    def after_fork(self) -> None:
+        """Give a forked child process its own grep_fx worker.
+
+        Caches, the mmap_scan mapping and the hash_set file are inherited
+        and shared with the parent (read-only, copy-on-write), but a grep
+        worker's pipes cannot be shared: the inherited one is detached
+        and, if the engine was warmed up, a new one is started.
+
+        Call in the child right after fork(), before serving queries.
+
+        Raises:
+            EngineError: If a new grep worker cannot be started.
+        """
+        if self._state.grep is None:
+            return
+        self._state.grep.detach()
+        self._state.grep = None
+        if self._state.impl is not None:
+            try:
+                self._state.impl = self._bind_impl()
+            except SearchError as exc:
+                raise EngineError(str(exc)) from exc
+
+    def close(self) -> None:
+        """Release the mmap_scan mapping, grep_fx worker and hash_set file.
+
+        Call only once no queries are running (e.g. at shutdown).
+        """
+        if self._state.mm is not None:
+            self._state.mm.close()
+        self._state.mm = None
+        self._state.mm_mapped = False
+        if self._state.grep is not None:
+            self._state.grep.close()
+        self._state.grep = None
+        if isinstance(self._state.cache, HashSetCache):
+            self._state.cache.close()
+            self._state.cache = None
+        self._state.impl = None
+
+    def _search_mmap(self, query: str) -> bool:
+        """Run mmap_scan: by reads with rereads, else on the mapping."""
+        if self.reread_on_query:
+            return search_mmap_read(self.file_path, query)
+        mm = self._mapped_file()
+        return mm is not None and search_mmap(mm, query)
+
     def exists(self, query: str) -> bool:
         """Check whether the query exists as an exact line in the data file.
 
+        Runs the lookup callable bound by warmup(), warming up lazily on the
+        first query if warmup() has not been called.
+
         Args:
             query: Query string to check.
 
@@ -141,45 +395,61 @@ class SearchEngine:
             EngineError: If the underlying search operation fails or the
                 configuration is invalid.
         """
-        self._validate_compatibility()
+        impl = self._state.impl
+        if impl is None:
+            self.warmup()
+            impl = self._state.impl
+            assert impl is not None
 
-        if self.reread_on_query:
-            try:
-                if self.search_algo == "linear_scan":
-                    return search_linear_scan(self.file_path, query)
-                if self.search_algo == "mmap_scan":
-                    return search_mmap_scan(self.file_path, query)
-                if self.search_algo == "grep_fx":
-                    return search_grep_fx(self.file_path, query)
-            except SearchError as exc:
-                raise EngineError(str(exc)) from exc
+        try:
+            return impl(query)
+        except SearchError as exc:
+            raise EngineError(str(exc)) from exc
 
-            raise EngineError(f"Unsupported search_algo={self.search_algo!r}")
+    def scans_in_batch(self, count: int) -> bool:
+        """Return whether exists_batch() shares one file pass among queries.
 
-        if self.search_algo == "linear_scan":
-            try:
-                return search_linear_scan(self.file_path, query)
-            except SearchError as exc:
-                raise EngineError(str(exc)) from exc
+        Args:
+            count: Number of queries in the batch.
 
-        if self.search_algo in {"mmap_scan", "grep_fx"}:
-            try:
-                if self.search_algo == "mmap_scan":
-                    return search_mmap_scan(self.file_path, query)
-                return search_grep_fx(self.file_path, query)
-            except SearchError as exc:
-                raise EngineError(str(exc)) from exc
+        Returns:
+            True if `count` queries are answered by a single linear_scan or
+            mmap_scan pass, False if they are looked up one at a time.
+        """
+        return count >= BATCH_SCAN_MIN_QUERIES and self.search_algo in {
+            "linear_scan",
+            "mmap_scan",
+        }
 
-        # Cached algos: allow lazy warmup.
-        if self._cache is None:
-            self.warmup()
+    def exists_batch(self, queries: list[str]) -> list[bool]:
+        """Check several queries, sharing one file pass where possible.
 
-        if self.search_algo == "set_cache":
-            assert isinstance(self._cache, set)
-            return search_set_cache(self._cache, query)
+        linear_scan and mmap_scan answer a batch of at least
+        BATCH_SCAN_MIN_QUERIES queries with a single scan of the data file;
+        other algorithms (and smaller batches) are answered one query at a
+        time. Results always equal those of exists().
 
-        if self.search_algo == "sorted_bisect":
-            assert isinstance(self._cache, list)
-            return search_sorted_bisect(self._cache, query)
+        Args:
+            queries: Query strings to check.
+
+        Returns:
+            One result per query, in order.
 
-        raise EngineError(f"Unsupported search_algo={self.search_algo!r}")
+        Raises:
+            EngineError: If the underlying search operation fails or the
+                configuration is invalid.
+        """
+        if not self.scans_in_batch(len(queries)):
+            return [self.exists(query) for query in queries]
+
+        try:
+            if self.search_algo == "linear_scan":
+                return search_linear_scan_batch(self.file_path, queries)
+            if self.reread_on_query:
+                return search_mmap_read_batch(self.file_path, queries)
+            mm = self._mapped_file()
+            if mm is None:
+                return [False] * len(queries)
+            return search_mmap_batch(mm, queries)
+        except SearchError as exc:
+            raise EngineError(str(exc)) from exc
@@ -6,20 +6,31 @@ This module implements a newline-delimited TCP server
 that accepts queries over a persistent connection.
 For each query line received, it returns:
 
-- A DEBUG line with the client IP, query, and elapsed time in milliseconds.
+- A DEBUG line with the client IP, query, and elapsed time in milliseconds
+  (omitted when started with --no-debug).
 - A result line: "STRING EXISTS" or "STRING NOT FOUND".
 
-TLS is optional. If configured, accepted connections are wrapped with an SSL
-context in the per-client thread to avoid blocking the accept loop.
+Connections are multiplexed by a selector loop and served by a bounded
+worker pool. TLS is optional. If configured, accepted connections are
+wrapped with an SSL context on a worker to avoid blocking the selector loop,
+and stay non-blocking afterwards.
 """
 
 from __future__ import annotations
 
 import argparse
+import heapq
+import itertools
+import os
+import select
+import selectors
+import signal
 import socket
 import ssl
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional
 
@@ -27,9 +38,58 @@ from config import ConfigError, load_config
 from search_engine import EngineError, SearchEngine
 
 
+# Bound once: lookups are timed with integer nanoseconds, no float maths.
+_perf_ns = time.perf_counter_ns
+
 MAX_PAYLOAD_BYTES = 1024
 RESPONSE_EXISTS = b"STRING EXISTS\n"
 RESPONSE_NOT_FOUND = b"STRING NOT FOUND\n"
+RESPONSE_TOO_LONG = (
+    b"DEBUG: error=ValueError: query too long\n" + RESPONSE_NOT_FOUND
+)
+
+# Pieces of the per-query DEBUG line, kept as bytes so replies are built
+# by concatenation rather than formatted and encoded per query.
+DEBUG_IP_PREFIX = b"DEBUG: ip="
+DEBUG_QUERY_PREFIX = b" query="
+DEBUG_ELAPSED_PREFIX = b" elapsed_ms="
+
+# Bytes that repr() shows unchanged inside single quotes: printable ASCII
+# other than the quote and the backslash. A query made only of these is
+# echoed as b"'" + raw + b"'", byte-for-byte what repr() would produce.
+_REPR_PLAIN_BYTES = bytes(
+    b for b in range(0x20, 0x7F) if b not in (ord("'"), ord("\\"))
+)
+
+
+# Upper bound on worker threads serving client I/O and lookups.
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Threads running TLS handshake steps, kept apart from the lookup workers
+# so a burst of new TLS connections does not queue ahead of queries.
+HANDSHAKE_WORKERS = max(4, os.cpu_count() or 1)
+
+# Size of each connection's receive buffer, and the most read per
+# recv_into(). The buffer grows to hold a longer partial line and is cut
+# back to this size once that line has been consumed.
+RECV_BUFSIZE = 16384
+
+# Overall limit for a TLS handshake, and for finishing a write on a plain
+# client socket. TLS sockets stay non-blocking after the handshake.
+HANDSHAKE_TIMEOUT_S = 5.0
+CLIENT_IO_TIMEOUT_S = 5.0
+
+# Default SO_RCVBUF/SO_SNDBUF for client sockets; the kernel caps the value
+# at net.core.rmem_max / wmem_max.
+SOCKET_BUFFER_BYTES = 1 << 20
+
+# Linux-only; None elsewhere.
+_TCP_QUICKACK = getattr(socket, "TCP_QUICKACK", None)
+
+# TLS 1.2 cipher suites, in server preference order: forward-secret AEAD
+# only, AES-GCM first (AES-NI), ChaCha20-Poly1305 for clients without it.
+# TLS 1.3 suites are OpenSSL's defaults, which are all AEAD already.
+TLS12_CIPHERS = "ECDHE+AES128GCM:ECDHE+AES256GCM:ECDHE+CHACHA20"
 
 
 @dataclass(frozen=True)
@@ -39,22 +99,160 @@ class ServerConfig:
     Attributes:
         host: Interface address to bind to.
         port: TCP port to listen on.
+        workers: Size of the worker pool serving client connections.
+        socket_buffer_bytes: SO_RCVBUF/SO_SNDBUF for the listening and
+            accepted sockets; 0 keeps the OS defaults.
+        debug_enabled: Send a DEBUG line before each result line. When
+            False, lookups are not timed and only result lines are sent.
+        tls_handshake_timeout: Seconds a client gets to complete the TLS
+            handshake before it is disconnected.
+        handshake_workers: Size of the pool that accepts TLS connections
+            and advances their handshakes.
     """
 
     host: str
     port: int
+    workers: int = DEFAULT_WORKERS
+    socket_buffer_bytes: int = SOCKET_BUFFER_BYTES
+    debug_enabled: bool = True
+    tls_handshake_timeout: float = HANDSHAKE_TIMEOUT_S
+    handshake_workers: int = HANDSHAKE_WORKERS
+
+
+def _quickack(sock: socket.socket) -> None:
+    """Ask the kernel to ACK the bytes received so far without delay.
+
+    Used when received data is left unanswered (a partial line or TLS
+    record). Otherwise the delayed ACK (up to ~40 ms) can hold back the
+    rest of the line behind Nagle's algorithm on the client. The flag is
+    cleared by the kernel after use, so it is set again each time.
+
+    Args:
+        sock: Connected client socket (plain or TLS-wrapped).
+    """
+    if _TCP_QUICKACK is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, _TCP_QUICKACK, 1)
+    except OSError:
+        pass
+
+
+class _ClientSession:
+    """Per-connection state carried between readiness events."""
+
+    __slots__ = (
+        "conn",
+        "fd",
+        "client_ip",
+        "debug_prefix",
+        "buf",
+        "end",
+        "out",
+        "want_write",
+        "handshake_deadline",
+    )
+
+    def __init__(self, conn: socket.socket, client_ip: str) -> None:
+        self.conn = conn
+        self.fd = conn.fileno()
+        self.client_ip = client_ip
+        # Start of every DEBUG line for this client, up to the query.
+        self.debug_prefix = (
+            DEBUG_IP_PREFIX + client_ip.encode("ascii") + DEBUG_QUERY_PREFIX
+        )
+        # Received bytes live in buf[:end]; only a partial line remains
+        # there between readiness events.
+        self.buf = bytearray(RECV_BUFSIZE)
+        self.end = 0
+        # Reply bytes a non-blocking TLS socket could not take yet.
+        self.out = b""
+        # Wait for the socket to become writable rather than readable.
+        self.want_write = False
+        # time.monotonic() limit while a TLS handshake is in progress.
+        self.handshake_deadline: Optional[float] = None
+
+    def recv(self) -> int:
+        """Read available bytes into the receive buffer.
+
+        Returns:
+            Number of bytes read; 0 means the client closed the connection.
+
+        Raises:
+            ssl.SSLWantReadError: Only part of a TLS record has arrived.
+            ssl.SSLWantWriteError: TLS must send data before reading on.
+            OSError: The read failed.
+        """
+        conn = self.conn
+        # Decrypted TLS bytes already buffered in the SSL object do not
+        # make the socket readable again, so take them now as well.
+        pending = getattr(conn, "pending", None)
+        total = 0
+        while True:
+            if self.end == len(self.buf):
+                self.buf.extend(bytes(RECV_BUFSIZE))
+            with memoryview(self.buf) as view:
+                n = conn.recv_into(view[self.end:])
+            self.end += n
+            total += n
+            if not n or pending is None or not pending():
+                return total
+
+    def take_lines(self) -> list[bytes]:
+        """Remove and return the complete lines received so far.
+
+        Returns:
+            Lines without their trailing LF; empty if no line is complete.
+        """
+        buf = self.buf
+        end = self.end
+        nl = buf.rfind(b"\n", 0, end)
+        if nl < 0:
+            return []
+        lines = bytes(buf[:nl]).split(b"\n")
+        rest = end - nl - 1
+        buf[:rest] = buf[nl + 1:end]
+        self.end = rest
+        if len(buf) > RECV_BUFSIZE and rest <= RECV_BUFSIZE:
+            # Give back the room a long line needed.
+            del buf[RECV_BUFSIZE:]
+        return lines
+
+
+# epoll interest for client sockets: one-shot, so each readiness event is
+# dispatched to exactly one worker until that worker re-arms the socket.
+_EPOLL_CLIENT_EVENTS = (
+    getattr(select, "EPOLLIN", 0)
+    | getattr(select, "EPOLLRDHUP", 0)
+    | getattr(select, "EPOLLONESHOT", 0)
+)
+# The same, for a TLS session waiting to finish a write.
+_EPOLL_CLIENT_WRITE_EVENTS = (
+    getattr(select, "EPOLLOUT", 0)
+    | getattr(select, "EPOLLRDHUP", 0)
+    | getattr(select, "EPOLLONESHOT", 0)
+)
 
 
 class TCPStringLookupServer:
-    """A threaded TCP server that performs newline-delimited string lookups.
+    """A TCP server that performs newline-delimited string lookups.
+
+    One event-loop thread watches the listening socket and every idle
+    persistent connection. When a client socket becomes readable, it is
+    handed to a bounded worker pool, which reads what has arrived, answers
+    every complete query line and then re-arms the socket. Idle
+    connections therefore cost a poller entry, not a thread, and the loop
+    never wakes up for them.
 
-    The server listens on the configured host/port and
-    spawns a daemon thread per client connection.
-    Each client connection is handled as a persistent session
-    that reads newline-delimited queries and responds per query.
+    On Linux the loop uses epoll directly: client sockets are registered
+    EPOLLONESHOT, so workers re-arm them with a single epoll_ctl() call
+    from their own thread. Elsewhere a selectors.DefaultSelector is used,
+    and workers hand sessions back to the loop thread to re-register.
 
     TLS support is optional. If an SSL context is provided, client sockets are
-    wrapped with TLS after accept and before request handling.
+    wrapped with TLS after accept and before request handling. Accepting and
+    handshaking run on a separate, smaller pool, so lookup workers stay
+    free for queries while new TLS connections arrive.
     """
 
     def __init__(
@@ -66,7 +264,7 @@ class TCPStringLookupServer:
         """Initialize the server.
 
         Args:
-            cfg: Network bind configuration (host/port).
+            cfg: Network bind configuration (host/port) and pool size.
             engine: Search engine used to answer existence queries.
             ssl_context: Optional server-side SSL context for TLS connections.
         """
@@ -75,162 +273,589 @@ class TCPStringLookupServer:
         self._ssl_context = ssl_context
         self._sock: Optional[socket.socket] = None
         self._stop_event = threading.Event()
+        self._epoll = select.epoll() if hasattr(select, "epoll") else None
+        self._sel: Optional[selectors.BaseSelector] = (
+            None if self._epoll is not None else selectors.DefaultSelector()
+        )
+        # Sessions registered with epoll, by file descriptor.
+        self._sessions: dict[int, _ClientSession] = {}
+        # Selector fallback: sessions to (re-)register, filled by workers.
+        self._rearm: deque[_ClientSession] = deque()
+        # Pending TLS handshakes as (deadline, seq, session), earliest
+        # first. The loop enforces each deadline, so a client that goes
+        # silent mid-handshake is still disconnected.
+        self._handshake_deadlines: list[
+            tuple[float, int, _ClientSession]
+        ] = []
+        self._deadline_lock = threading.Lock()
+        self._deadline_seq = itertools.count()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
 
     def start(self) -> None:
-        """Start listening and accepting connections (blocking).
+        """Start listening and serving connections (blocking).
 
-        This method binds and listens on the configured address, then accepts
-        connections in a loop until `stop()` is called.
-        Each accepted connection is handled in its own daemon thread.
+        This method binds and listens on the configured address, then runs
+        the event loop until `stop()` is called.
         """
         self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            # Lets several server processes share the port.
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        # Set before listen() so accepted sockets start with these buffers
+        # (and a matching TCP window scale).
+        self._tune_socket(self._sock)
         self._sock.bind((self._cfg.host, self._cfg.port))
         self._sock.listen(128)
-        self._sock.settimeout(0.5)  # allows graceful shutdown checks
+        self._sock.setblocking(False)
+
+        pool = ThreadPoolExecutor(
+            max_workers=self._cfg.workers, thread_name_prefix="lookup"
+        )
+        hs_pool = pool
+        if self._ssl_context is not None:
+            hs_pool = ThreadPoolExecutor(
+                max_workers=self._cfg.handshake_workers,
+                thread_name_prefix="handshake",
+            )
+        # A signal may be delivered to a worker thread, which would leave
+        # the loop thread blocked in poll() and its Python handler (e.g.
+        # KeyboardInterrupt, or stop() on SIGTERM) pending. Routing signals
+        # to the wake socket makes the loop return and run the handler.
+        old_wakeup_fd: Optional[int] = None
+        if threading.current_thread() is threading.main_thread():
+            old_wakeup_fd = signal.set_wakeup_fd(
+                self._wake_w.fileno(), warn_on_full_buffer=False
+            )
+        try:
+            if self._epoll is not None:
+                self._run_epoll(self._epoll, pool, hs_pool)
+            else:
+                assert self._sel is not None
+                self._run_selector(self._sel, pool, hs_pool)
+        finally:
+            if old_wakeup_fd is not None:
+                signal.set_wakeup_fd(old_wakeup_fd)
+            pool.shutdown(wait=False, cancel_futures=True)
+            hs_pool.shutdown(wait=False, cancel_futures=True)
+            for session in list(self._sessions.values()):
+                self._close_session(session)
+            for session in self._rearm:
+                self._close_session(session)
+            if self._sel is not None:
+                for key in list(self._sel.get_map().values()):
+                    if isinstance(key.data, _ClientSession):
+                        self._close_session(key.data)
+                self._sel.close()
+            if self._epoll is not None:
+                self._epoll.close()
+
+    def _run_epoll(
+        self,
+        ep: select.epoll,
+        pool: ThreadPoolExecutor,
+        hs_pool: ThreadPoolExecutor,
+    ) -> None:
+        """Run the event loop on epoll until stop() is called.
+
+        Args:
+            ep: The server's epoll object.
+            pool: Workers serving queries.
+            hs_pool: Workers accepting connections and running handshakes
+                (the same pool as `pool` without TLS).
+        """
+        assert self._sock is not None
+        listen_fd = self._sock.fileno()
+        wake_fd = self._wake_r.fileno()
+        # accept() is drained until EAGAIN, so edge-triggered is enough.
+        ep.register(listen_fd, select.EPOLLIN | select.EPOLLET)
+        ep.register(wake_fd, select.EPOLLIN)
 
         while not self._stop_event.is_set():
-            try:
-                conn, addr = self._sock.accept()
-            except socket.timeout:
+            for fd, _events in ep.poll(self._poll_timeout()):
+                if fd == listen_fd:
+                    self._accept_ready(hs_pool)
+                elif fd == wake_fd:
+                    self._drain_wakeups()
+                else:
+                    session = self._sessions.get(fd)
+                    if session is not None:
+                        self._dispatch(session, pool, hs_pool)
+            self._expire_handshakes()
+
+    def _run_selector(
+        self,
+        sel: selectors.BaseSelector,
+        pool: ThreadPoolExecutor,
+        hs_pool: ThreadPoolExecutor,
+    ) -> None:
+        """Run the event loop on a selector until stop() is called.
+
+        Args:
+            sel: The server's selector.
+            pool: Workers serving queries.
+            hs_pool: Workers accepting connections and running handshakes
+                (the same pool as `pool` without TLS).
+        """
+        assert self._sock is not None
+        sel.register(self._sock, selectors.EVENT_READ, None)
+        sel.register(self._wake_r, selectors.EVENT_READ, self._wake_r)
+
+        while not self._stop_event.is_set():
+            for key, _events in sel.select(self._poll_timeout()):
+                if key.data is None:
+                    self._accept_ready(hs_pool)
+                elif key.data is self._wake_r:
+                    self._drain_wakeups()
+                else:
+                    sel.unregister(key.fileobj)
+                    self._dispatch(key.data, pool, hs_pool)
+
+            while self._rearm:
+                session = self._rearm.popleft()
+                events = (
+                    selectors.EVENT_WRITE
+                    if session.want_write
+                    else selectors.EVENT_READ
+                )
+                try:
+                    sel.register(session.conn, events, session)
+                except (KeyError, ValueError, OSError):
+                    # Closed meanwhile (e.g. during shutdown).
+                    self._close_session(session)
+            self._expire_handshakes()
+
+    def _dispatch(
+        self,
+        session: _ClientSession,
+        pool: ThreadPoolExecutor,
+        hs_pool: ThreadPoolExecutor,
+    ) -> None:
+        """Hand a ready session to the pool matching its state."""
+        if session.handshake_deadline is not None:
+            hs_pool.submit(self._service_ready, session)
+        else:
+            pool.submit(self._service_ready, session)
+
+    def _poll_timeout(self) -> Optional[float]:
+        """Return seconds until the earliest handshake deadline.
+
+        Returns:
+            None (wait indefinitely) when no TLS handshake is pending.
+        """
+        if not self._handshake_deadlines:
+            return None
+        with self._deadline_lock:
+            if not self._handshake_deadlines:
+                return None
+            deadline = self._handshake_deadlines[0][0]
+        return max(0.0, deadline - time.monotonic())
+
+    def _add_handshake_deadline(self, session: _ClientSession) -> None:
+        """Track a new handshake deadline, waking the loop if it is next."""
+        assert session.handshake_deadline is not None
+        entry = (session.handshake_deadline, next(self._deadline_seq), session)
+        with self._deadline_lock:
+            heapq.heappush(self._handshake_deadlines, entry)
+            earliest = self._handshake_deadlines[0] is entry
+        if earliest:
+            # The loop may be waiting with no timeout, or a later one.
+            self._wake()
+
+    def _expire_handshakes(self) -> None:
+        """Disconnect clients whose TLS handshake ran past its deadline.
+
+        Runs on the loop thread. The socket is shut down rather than
+        closed, since a worker may be using it at this moment; the shutdown
+        makes it readable, and whichever worker handles it next finds the
+        deadline passed and closes the session.
+        """
+        if not self._handshake_deadlines:
+            return
+        now = time.monotonic()
+        expired: list[_ClientSession] = []
+        with self._deadline_lock:
+            heap = self._handshake_deadlines
+            while heap and heap[0][0] <= now:
+                expired.append(heapq.heappop(heap)[2])
+        for session in expired:
+            if session.handshake_deadline is None:
+                # Completed in time.
                 continue
+            try:
+                # The plain socket's shutdown, bypassing SSLSocket's, which
+                # also tears down the SSL object under the worker.
+                socket.socket.shutdown(session.conn, socket.SHUT_RDWR)
             except OSError:
-                break
-
-            t = threading.Thread(
-                target=self._handle_client_thread,
-                args=(conn, addr),
-                daemon=True,
-            )
-            t.start()
+                # Already closed.
+                pass
 
     def stop(self) -> None:
         """Signal the server to stop and close the listening socket."""
         self._stop_event.set()
+        self._wake()
         if self._sock is not None:
             try:
                 self._sock.close()
             except OSError:
                 pass
 
-    def _handle_client_thread(
+    def _wake(self) -> None:
+        """Interrupt a pending wait in the event loop."""
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            # Buffer full (a wakeup is already pending) or shut down.
+            pass
+
+    def _drain_wakeups(self) -> None:
+        """Consume pending wakeup bytes."""
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except OSError:
+            pass
+
+    def _accept_ready(self, pool: ThreadPoolExecutor) -> None:
+        """Accept all pending connections and open them on the pool."""
+        assert self._sock is not None
+        while True:
+            try:
+                conn, addr = self._sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # Listening socket closed by stop().
+                return
+            pool.submit(self._open_session, conn, addr)
+
+    def _schedule(self, session: _ClientSession) -> None:
+        """Arm a session's socket for its next readiness event.
+
+        Called from worker threads. With epoll this is one epoll_ctl() on
+        the session's fd; with the selector fallback the session is queued
+        for the loop thread, which is woken up to register it. The socket
+        is watched for writability if session.want_write is set, otherwise
+        for readability.
+        """
+        if self._epoll is None:
+            self._rearm.append(session)
+            self._wake()
+            return
+
+        events = (
+            _EPOLL_CLIENT_WRITE_EVENTS
+            if session.want_write
+            else _EPOLL_CLIENT_EVENTS
+        )
+        try:
+            if session.fd in self._sessions:
+                self._epoll.modify(session.fd, events)
+            else:
+                self._sessions[session.fd] = session
+                self._epoll.register(session.fd, events)
+        except (OSError, ValueError):
+            # epoll closed by shutdown or fd no longer valid.
+            self._close_session(session)
+
+    def _tune_socket(self, sock: socket.socket) -> None:
+        """Apply TCP_NODELAY and the configured buffer sizes to a socket.
+
+        Replies are written as soon as they are ready, so Nagle's algorithm
+        would only delay them behind the client's delayed ACKs.
+        """
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        size = self._cfg.socket_buffer_bytes
+        if size > 0:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, size)
+
+    def _close_session(self, session: _ClientSession) -> None:
+        """Close a client connection, ignoring errors."""
+        # Forget the fd before closing: the number can be reused at once.
+        if self._sessions.get(session.fd) is session:
+            del self._sessions[session.fd]
+        try:
+            session.conn.close()
+        except OSError:
+            pass
+
+    def _open_session(
         self, conn: socket.socket, addr: tuple[str, int]
     ) -> None:
-        """Handle a single client connection in a dedicated thread.
+        """Prepare an accepted connection and register it for reads.
 
-        If TLS is enabled, the socket is wrapped here (after accept) so TLS
-        negotiation does not block the main accept loop.
+        If TLS is enabled, the socket is wrapped without handshaking and
+        left non-blocking; the handshake is then driven step by step from
+        readiness events (see _continue_handshake()), so a slow or silent
+        client never holds a worker thread. The event loop disconnects it
+        once tls_handshake_timeout has passed.
 
         Args:
             conn: The accepted client socket.
             addr: The client address tuple (ip, port).
         """
+        client_ip, _client_port = addr
         try:
+            self._tune_socket(conn)
             if self._ssl_context is not None:
-                try:
-                    conn = self._ssl_context.wrap_socket(
-                        conn, server_side=True
-                    )
-                except ssl.SSLError:
-                    try:
-                        conn.close()
-                    except OSError:
-                        pass
-                    return
-
-            self._handle_client(conn, addr)
-
-        except Exception:
-            # Catch-all to prevent a per-client thread error from impacting
-            # overall server stability (unforeseen runtime errors).
+                conn.setblocking(False)
+                conn = self._ssl_context.wrap_socket(
+                    conn, server_side=True, do_handshake_on_connect=False
+                )
+            else:
+                conn.settimeout(CLIENT_IO_TIMEOUT_S)
+        except (OSError, ValueError):
             try:
                 conn.close()
             except OSError:
                 pass
+            return
 
-    def _handle_client(
-        self, conn: socket.socket, addr: tuple[str, int]
-    ) -> None:
-        """Serve a persistent client session.
+        session = _ClientSession(conn, client_ip)
+        if self._ssl_context is not None:
+            session.handshake_deadline = (
+                time.monotonic() + self._cfg.tls_handshake_timeout
+            )
+            self._add_handshake_deadline(session)
+        self._schedule(session)
+
+    def _continue_handshake(self, session: _ClientSession) -> bool:
+        """Advance a pending TLS handshake without blocking.
 
-        This handler reads newline-delimited queries in a loop and responds to
-        each query without closing the connection. Idle clients are not
-        disconnected; the server keeps waiting for the next query.
+        Args:
+            session: A session whose handshake has not completed yet.
+
+        Returns:
+            True once the handshake is complete and the socket is ready for
+            requests; it stays non-blocking. False if the session was
+            re-armed to wait for the client or for send-buffer room, or
+            closed because the handshake failed or ran past its deadline.
+        """
+        conn = session.conn
+        deadline = session.handshake_deadline
+        assert isinstance(conn, ssl.SSLSocket) and deadline is not None
+        if deadline - time.monotonic() <= 0:
+            self._close_session(session)
+            return False
+        try:
+            conn.do_handshake()
+        except ssl.SSLWantReadError:
+            session.want_write = False
+            self._schedule(session)
+            return False
+        except ssl.SSLWantWriteError:
+            session.want_write = True
+            self._schedule(session)
+            return False
+        except (OSError, ValueError):
+            self._close_session(session)
+            return False
+
+        session.handshake_deadline = None
+        session.want_write = False
+        return True
+
+    def _service_ready(self, session: _ClientSession) -> None:
+        """Serve a readable client connection, then re-arm or close it.
 
         Per query, the server sends:
         1) a DEBUG line with timing information
         2) a result line indicating whether the string exists
 
         Args:
-            conn: Connected client socket (plain or TLS-wrapped).
-            addr: The client address tuple (ip, port).
+            session: State of the connection that became readable.
         """
-        client_ip, _client_port = addr
+        if session.handshake_deadline is not None:
+            if not self._continue_handshake(session):
+                return
+            pending = getattr(session.conn, "pending", None)
+            if pending is None or not pending():
+                # Nothing decrypted yet; wait for the first request.
+                self._schedule(session)
+                return
+
+        try:
+            session.want_write = False
+            if session.out:
+                # Finish the reply a TLS socket could not take earlier
+                # before reading the client's next queries.
+                if not self._flush(session):
+                    self._close_session(session)
+                    return
+                if session.out:
+                    self._schedule(session)
+                    return
 
-        # Use a small timeout so threads can exit when server.stop() is called.
-        # This does NOT disconnect idle clients; we simply continue waiting.
-        conn.settimeout(1.0)
+            try:
+                received = session.recv()
+            except (ssl.SSLWantReadError, socket.timeout):
+                # Only part of a TLS record arrived; wait for the rest.
+                _quickack(session.conn)
+                self._schedule(session)
+                return
+            except ssl.SSLWantWriteError:
+                session.want_write = True
+                self._schedule(session)
+                return
+
+            if not received:
+                # Client closed the connection.
+                self._close_session(session)
+                return
+
+            # Answer every complete line received so far together.
+            raw_lines = session.take_lines()
+            if raw_lines:
+                session.out = self._answer_lines(
+                    session.debug_prefix, raw_lines
+                )
+                if not self._flush(session):
+                    self._close_session(session)
+                    return
+            if session.end:
+                # A partial line gets no reply to carry the ACK.
+                _quickack(session.conn)
+        except Exception:
+            # Catch-all to prevent a per-client error from impacting overall
+            # server stability (unforeseen runtime errors).
+            self._close_session(session)
+            return
 
-        buf = b""
+        self._schedule(session)
 
-        try:
-            while not self._stop_event.is_set():
-                try:
-                    chunk = conn.recv(4096)
-                except socket.timeout:
-                    # No data yet; keep waiting forever (like nc example).
-                    continue
+    def _flush(self, session: _ClientSession) -> bool:
+        """Send the session's pending reply bytes.
 
-                if not chunk:
-                    # Client closed the connection.
-                    break
-
-                buf += chunk
-
-                while b"\n" in buf:
-                    raw_line, buf = buf.split(b"\n", 1)
-
-                    # Trim CRLF and NULLs.
-                    raw_line = raw_line.rstrip(b"\r").rstrip(b"\x00")
-
-                    if len(raw_line) > MAX_PAYLOAD_BYTES:
-                        msg = (
-                            "DEBUG: error=ValueError: query too long\n"
-                        ).encode("utf-8")
-                        try:
-                            conn.sendall(msg)
-                            conn.sendall(RESPONSE_NOT_FOUND)
-                        except OSError:
-                            return
-                        continue
-
-                    query = raw_line.decode("utf-8", errors="replace")
-
-                    start = time.perf_counter()
-                    try:
-                        found = self._engine.exists(query)
-                    except EngineError:
-                        found = False
-
-                    elapsed_ms = (time.perf_counter() - start) * 1000.0
-                    debug = (
-                        f"DEBUG: ip={client_ip} "
-                        f"query={query!r} "
-                        f"elapsed_ms={elapsed_ms:.3f}\n"
-                    ).encode("utf-8")
-
-                    try:
-                        conn.sendall(debug)
-                        conn.sendall(
-                            RESPONSE_EXISTS if found else RESPONSE_NOT_FOUND
-                        )
-                    except OSError:
-                        return
-        finally:
+        Plain sockets send everything, blocking up to CLIENT_IO_TIMEOUT_S.
+        TLS sockets are non-blocking: bytes the socket cannot take yet stay
+        in session.out, and session.want_write tells the caller whether to
+        re-arm for writability (send buffer full) or readability (TLS needs
+        to read first), instead of waiting on a worker thread.
+
+        Args:
+            session: Session whose `out` holds the bytes to send.
+
+        Returns:
+            False if the client can no longer be written to, otherwise True.
+        """
+        out = session.out
+        conn = session.conn
+        if not isinstance(conn, ssl.SSLSocket):
             try:
-                conn.close()
+                conn.sendall(out)
             except OSError:
-                pass
+                return False
+            session.out = b""
+            return True
+
+        sent = 0
+        try:
+            with memoryview(out) as view:
+                while sent < len(view):
+                    sent += conn.send(view[sent:])
+        except ssl.SSLWantWriteError:
+            session.out = out[sent:]
+            session.want_write = True
+            return True
+        except ssl.SSLWantReadError:
+            session.out = out[sent:]
+            session.want_write = False
+            return True
+        except (OSError, ValueError):
+            return False
+        session.out = b""
+        return True
+
+    def _answer_lines(
+        self, debug_prefix: bytes, raw_lines: list[bytes]
+    ) -> bytes:
+        """Answer a run of pipelined query lines, in order.
+
+        Valid queries are looked up together via SearchEngine.exists_batch(),
+        so a client that pipelines many queries can have them answered by a
+        single scan of the data file. Each query still gets its own DEBUG and
+        result lines. elapsed_ms is each query's own lookup time, unless a
+        single batch scan answered them together; then it is the time taken by
+        that scan. The replies are returned as one buffer, to be sent with a
+        single write. With debug output disabled only the result lines are
+        produced.
+
+        Args:
+            debug_prefix: DEBUG line start for this client, up to the query.
+            raw_lines: Received lines without their trailing LF.
+
+        Returns:
+            The replies for every line, in order.
+        """
+        debug = self._cfg.debug_enabled
+        queries: list[Optional[str]] = []
+        echoes: list[bytes] = []
+        for raw_line in raw_lines:
+            # Trim CRLF and NULLs.
+            raw_line = raw_line.rstrip(b"\r").rstrip(b"\x00")
+            if len(raw_line) > MAX_PAYLOAD_BYTES:
+                queries.append(None)
+                continue
+            query = raw_line.decode("utf-8", errors="replace")
+            queries.append(query)
+            if not debug:
+                continue
+            if raw_line.translate(None, _REPR_PLAIN_BYTES):
+                echoes.append(repr(query).encode("utf-8"))
+            else:
+                echoes.append(b"'" + raw_line + b"'")
+
+        valid = [query for query in queries if query is not None]
+        # Without debug output nothing is timed, so the run is looked up in
+        # one call. With it, only queries answered by one batch scan share
+        # a timing; otherwise each query is looked up, and timed, on its own.
+        if not debug or self._engine.scans_in_batch(len(valid)):
+            groups = [valid]
+        else:
+            groups = [[query] for query in valid]
+        hits: list[bool] = []
+        timings: list[bytes] = []
+        for group in groups:
+            if debug:
+                start = _perf_ns()
+            try:
+                hits += self._engine.exists_batch(group)
+            except EngineError:
+                hits += [False] * len(group)
+            if debug:
+                # Integer microseconds, shown as milliseconds with 3 decimals.
+                elapsed_us = (_perf_ns() - start) // 1000
+                timings += [
+                    DEBUG_ELAPSED_PREFIX
+                    + b"%d.%03d\n" % divmod(elapsed_us, 1000)
+                ] * len(group)
+        results = iter(hits)
+
+        # All replies for the run go out in one write (one SSL_write with
+        # TLS), DEBUG and result lines interleaved per query.
+        out: list[bytes] = []
+        if not debug:
+            for query in queries:
+                if query is None or not next(results):
+                    out.append(RESPONSE_NOT_FOUND)
+                else:
+                    out.append(RESPONSE_EXISTS)
+        else:
+            echo = iter(echoes)
+            elapsed = iter(timings)
+            for query in queries:
+                if query is None:
+                    out.append(RESPONSE_TOO_LONG)
+                    continue
+                out += (debug_prefix, next(echo), next(elapsed))
+                out.append(
+                    RESPONSE_EXISTS if next(results) else RESPONSE_NOT_FOUND
+                )
+
+        return b"".join(out)
 
 
 def parse_args() -> argparse.Namespace:
@@ -247,7 +872,97 @@ def parse_args() -> argparse.Namespace:
         required=True,
         help="Path to configuration file (must include linuxpath=...)",
     )
-    return p.parse_args()
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Worker threads serving client connections.",
+    )
+    p.add_argument(
+        "--handshake-workers",
+        type=int,
+        default=HANDSHAKE_WORKERS,
+        help="Worker threads accepting and handshaking TLS connections.",
+    )
+    p.add_argument(
+        "--socket-buffer-bytes",
+        type=int,
+        default=SOCKET_BUFFER_BYTES,
+        help="SO_RCVBUF/SO_SNDBUF for client sockets (0 = OS default).",
+    )
+    p.add_argument(
+        "--no-debug",
+        dest="debug",
+        action="store_false",
+        help="Send only result lines, without DEBUG lines or timing.",
+    )
+    p.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Server processes sharing the port via SO_REUSEPORT.",
+    )
+    args = p.parse_args()
+    if args.workers < 1:
+        p.error("--workers must be >= 1")
+    if args.handshake_workers < 1:
+        p.error("--handshake-workers must be >= 1")
+    if args.socket_buffer_bytes < 0:
+        p.error("--socket-buffer-bytes must be >= 0")
+    if args.processes < 1:
+        p.error("--processes must be >= 1")
+    if args.processes > 1 and not (
+        hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT")
+    ):
+        p.error("--processes > 1 needs os.fork() and SO_REUSEPORT")
+    return args
+
+
+def _fork_servers(processes: int) -> list[int]:
+    """Fork the extra server processes.
+
+    Every process then binds its own listening socket to the same port with
+    SO_REUSEPORT, and the kernel spreads new connections across them, so
+    accepts and lookups are no longer confined to one interpreter (and one
+    GIL). This runs after the engine is warmed up, so the children share
+    the parent's cache pages copy-on-write instead of each building one,
+    and before any thread is started.
+
+    The caller blocks SIGTERM first; children unblock it right away, while
+    the parent keeps it blocked until its shutdown handler is installed.
+
+    Args:
+        processes: Total number of server processes, including this one.
+
+    Returns:
+        The child pids in the parent process; an empty list in a child.
+    """
+    children: list[int] = []
+    for _ in range(processes - 1):
+        pid = os.fork()
+        if pid == 0:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGTERM})
+            return []
+        children.append(pid)
+    return children
+
+
+def _stop_children(children: list[int]) -> None:
+    """Terminate forked server processes and wait for them.
+
+    Args:
+        children: Pids returned by _fork_servers().
+    """
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in children:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
 
 
 def _build_server_ssl_context(app_cfg) -> ssl.SSLContext | None:
@@ -277,6 +992,11 @@ def _build_server_ssl_context(app_cfg) -> ssl.SSLContext | None:
     )
 
     ctx.minimum_version = ssl.TLSVersion.TLSv1_2
+    ctx.set_ciphers(TLS12_CIPHERS)
+    # Both are OpenSSL defaults for a server context; keep them explicit.
+    ctx.options |= ssl.OP_NO_COMPRESSION | ssl.OP_CIPHER_SERVER_PREFERENCE
+    # TLS 1.3 tickets sent per full handshake, for client session reuse.
+    ctx.num_tickets = 2
     return ctx
 
 
@@ -297,19 +1017,46 @@ def main() -> None:
         except EngineError as exc:
             raise SystemExit(f"Engine error: {exc}") from exc
 
-    ssl_ctx = _build_server_ssl_context(app_cfg)
-
-    cfg = ServerConfig(host=args.host, port=args.port)
-    server = TCPStringLookupServer(cfg, engine=engine, ssl_context=ssl_ctx)
+    if args.processes > 1:
+        # Held back until the parent can shut down with its children.
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTERM})
+    children = _fork_servers(args.processes)
 
     try:
-        server.start()
-    except KeyboardInterrupt:
-        pass
-    except Exception as exc:
-        raise SystemExit(f"Fatal error: {exc}") from exc
+        if args.processes > 1 and not children:
+            try:
+                engine.after_fork()
+            except EngineError as exc:
+                raise SystemExit(f"Engine error: {exc}") from exc
+
+        ssl_ctx = _build_server_ssl_context(app_cfg)
+
+        cfg = ServerConfig(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            handshake_workers=args.handshake_workers,
+            socket_buffer_bytes=args.socket_buffer_bytes,
+            debug_enabled=args.debug,
+        )
+        server = TCPStringLookupServer(
+            cfg, engine=engine, ssl_context=ssl_ctx
+        )
+        if children:
+            # Shut down cleanly on SIGTERM so the children are stopped too.
+            signal.signal(signal.SIGTERM, lambda _sig, _frame: server.stop())
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGTERM})
+
+        try:
+            server.start()
+        except KeyboardInterrupt:
+            pass
+        except Exception as exc:
+            raise SystemExit(f"Fatal error: {exc}") from exc
+        finally:
+            server.stop()
     finally:
-        server.stop()
+        _stop_children(children)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,299 @@
+#!/usr/bin/python3
+"""
+Shared pytest fixtures.
+
+Provides:
+- wait_for_port: wait until a server subprocess accepts connections.
+- free_port: a localhost TCP port reserved for the test's server.
+- alpha_beta_gamma_file: a read-only three-line data file per module.
+- shared_server: one server subprocess reused by every test that needs
+  only the default protocol behaviour.
+- tls_certs / tls_server: a self-signed cert and key generated per
+  session, and one TLS server reused by the TLS tests; both skip when
+  the openssl CLI is not installed.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import pytest
+
+WaitForPort = Callable[..., None]
+
+# Lines served by shared_server; tests pick queries from these.
+SHARED_DATA_LINES = ("hello", "world", "one", "two", "three", "one;two")
+
+
+def _wait_for_port(
+    port: int,
+    proc: Optional[subprocess.Popen] = None,
+    host: str = "127.0.0.1",
+    timeout: float = 5.0,
+) -> None:
+    """Poll until something accepts TCP connections on (host, port).
+
+    Connection attempts back off exponentially from 1 ms to 20 ms, so a
+    server that binds quickly is used almost immediately instead of after a
+    fixed sleep.
+
+    Args:
+        port: TCP port the server is expected to listen on.
+        proc: Server subprocess; polling stops early if it exits, leaving
+            the caller's own early-exit check to report it.
+        host: Address the server binds to.
+        timeout: Seconds to wait before giving up.
+
+    Raises:
+        RuntimeError: If nothing listens on the port within timeout.
+    """
+    deadline = time.monotonic() + timeout
+    step = 0.001
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=0.05).close()
+            return
+        except OSError:
+            pass
+        if proc is not None and proc.poll() is not None:
+            return
+        if time.monotonic() >= deadline:
+            raise RuntimeError(f"Server did not listen on {host}:{port}")
+        time.sleep(step)
+        step = min(step * 2, 0.02)
+
+
+@pytest.fixture
+def wait_for_port() -> WaitForPort:
+    """Return a callable that waits for a server to accept connections."""
+    return _wait_for_port
+
+
+@pytest.fixture(scope="module")
+def alpha_beta_gamma_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Return a data file holding the lines alpha, beta and gamma.
+
+    The file is written once per module; tests must not modify it.
+    """
+    data = tmp_path_factory.mktemp("alpha_beta_gamma") / "data.txt"
+    data.write_text("alpha\nbeta\ngamma\n", encoding="utf-8")
+    return data
+
+
+@contextlib.contextmanager
+def _reserved_port(host: str = "127.0.0.1") -> Iterator[int]:
+    """Hold an ephemeral TCP port until the block exits.
+
+    Picking a port and closing the probe socket leaves a window in which
+    anything else could bind the port before the server does. Where
+    SO_REUSEPORT exists (the server always sets it), the probe instead
+    stays bound, without listening, while the server starts: the server
+    can bind alongside it, nothing else can, and since the probe never
+    listens every connection still reaches the server.
+
+    Args:
+        host: Address to reserve the port on.
+
+    Yields:
+        The reserved port number.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        if hasattr(socket, "SO_REUSEPORT"):
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            s.bind((host, 0))
+            yield int(s.getsockname()[1])
+            return
+        s.bind((host, 0))
+        port = int(s.getsockname()[1])
+    yield port
+
+
+@pytest.fixture
+def free_port() -> Iterator[int]:
+    """Reserve a localhost TCP port for the duration of one test."""
+    with _reserved_port() as port:
+        yield port
+
+
+@contextlib.contextmanager
+def _running_server(
+    host: str,
+    port: int,
+    cfg_file: Path,
+    *extra_args: str,
+) -> Iterator[None]:
+    """Run `python -m server` until the block exits.
+
+    The server's stderr goes to server.err next to cfg_file. A long-lived
+    server can fill an unread pipe and block; it cannot fill a file.
+
+    Args:
+        host: Address the server binds to.
+        port: Port the server binds to.
+        cfg_file: Config file passed via --config.
+        *extra_args: Further command-line flags for the server.
+
+    Raises:
+        RuntimeError: If the server exits or does not start listening.
+    """
+    err_log = cfg_file.parent / "server.err"
+    with err_log.open("wb") as err_file:
+        proc = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "server",
+                "--host",
+                host,
+                "--port",
+                str(port),
+                "--config",
+                str(cfg_file),
+                *extra_args,
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=err_file,
+        )
+
+    try:
+        _wait_for_port(port, proc, host=host)
+        rc = proc.poll()
+        if rc is not None:
+            err = err_log.read_text(encoding="utf-8", errors="replace")
+            raise RuntimeError(
+                "Server exited early.\n"
+                f"exit_code={rc}\n"
+                f"--- stderr ---\n{err}\n"
+            )
+        yield
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+@pytest.fixture(scope="session")
+def shared_server(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Iterator[tuple[str, int, Path]]:
+    """Run one linear_scan server for the whole test session.
+
+    Tests that do not need their own data, algorithm or command-line flags
+    connect to this server instead of paying for a subprocess start each.
+
+    Yields:
+        (host, port, data_file) of the running server.
+
+    Raises:
+        RuntimeError: If the server exits or does not start listening.
+    """
+    host = "127.0.0.1"
+    root = tmp_path_factory.mktemp("shared_server")
+
+    data_file = root / "data.txt"
+    data_file.write_text(
+        "".join(f"{line}\n" for line in SHARED_DATA_LINES), encoding="utf-8"
+    )
+
+    cfg_file = root / "app.conf"
+    cfg_file.write_text(
+        f"linuxpath={data_file}\n"
+        "reread_on_query=True\n"
+        "search_algo=linear_scan\n",
+        encoding="utf-8",
+    )
+
+    with _reserved_port(host) as port:
+        with _running_server(host, port, cfg_file):
+            yield host, port, data_file
+
+
+@pytest.fixture(scope="session")
+def tls_certs(tmp_path_factory: pytest.TempPathFactory) -> tuple[Path, Path]:
+    """Generate a self-signed localhost (certfile, keyfile) per session.
+
+    The pair is written to a session temp directory with the same openssl
+    command the README uses, so the tests need no key material on disk.
+    Skips every requesting test when the openssl CLI is not installed.
+    """
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        pytest.skip("openssl not found; it is needed to generate TLS certs.")
+
+    root = tmp_path_factory.mktemp("certs")
+    certfile = root / "server.crt"
+    keyfile = root / "server.key"
+    subprocess.run(
+        [
+            openssl,
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-keyout",
+            str(keyfile),
+            "-out",
+            str(certfile),
+            "-days",
+            "1",
+            "-nodes",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=DNS:localhost,IP:127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return certfile, keyfile
+
+
+@pytest.fixture(scope="session")
+def tls_server(
+    tmp_path_factory: pytest.TempPathFactory,
+    tls_certs: tuple[Path, Path],
+) -> Iterator[tuple[str, int, Path]]:
+    """Run one TLS-enabled server for the whole test session.
+
+    The server serves a data file holding "hello" and runs with
+    --workers 1, so tests can check that stalled handshakes never occupy
+    the only lookup worker. The yielded config file also works as the
+    packaged client's --config.
+
+    Yields:
+        (host, port, cfg_file) of the running server.
+
+    Raises:
+        RuntimeError: If the server exits or does not start listening.
+    """
+    host = "127.0.0.1"
+    certfile, keyfile = tls_certs
+    root = tmp_path_factory.mktemp("tls_server")
+
+    data_file = root / "data.txt"
+    data_file.write_text("hello\n", encoding="utf-8")
+
+    cfg_file = root / "app.conf"
+    cfg_file.write_text(
+        f"linuxpath={data_file}\n"
+        "reread_on_query=True\n"
+        "search_algo=linear_scan\n"
+        "ssl_enabled=True\n"
+        f"ssl_certfile={certfile}\n"
+        f"ssl_keyfile={keyfile}\n"
+        "ssl_verify=False\n",
+        encoding="utf-8",
+    )
+
+    with _reserved_port(host) as port:
+        with _running_server(host, port, cfg_file, "--workers", "1"):
+            yield host, port, cfg_file
@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""
+Tests for the client's response reader.
+
+These tests validate that recv_until_result():
+- Stops at a result terminator split across recv() chunks.
+- Returns whatever was received when the peer closes early.
+"""
+
+from __future__ import annotations
+
+from client import recv_until_result
+
+
+class _ChunkedSocket:
+    """Minimal socket stand-in returning predefined recv_into() chunks."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self._chunks = list(chunks)
+
+    def recv_into(self, buffer: memoryview) -> int:
+        """Copy the next chunk into buffer; return 0 once exhausted (EOF)."""
+        if not self._chunks:
+            return 0
+        chunk = self._chunks.pop(0)
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def test_terminator_split_across_chunks() -> None:
+    """A result line spanning several recv_into() calls ends the read."""
+    sock = _ChunkedSocket(
+        [b"DEBUG: q\nSTRING N", b"OT FO", b"UND\n", b"unexpected"]
+    )
+
+    assert recv_until_result(sock) == b"DEBUG: q\nSTRING NOT FOUND\n"
+
+
+def test_eof_before_terminator_returns_partial() -> None:
+    """EOF ends the read and returns the bytes seen so far."""
+    sock = _ChunkedSocket([b"DEBUG: q\n", b"STRING EX"])
+
+    assert recv_until_result(sock) == b"DEBUG: q\nSTRING EX"
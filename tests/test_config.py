@@ -15,7 +15,7 @@ from pathlib import Path
 
 import pytest
 
-from config import AppConfig, ConfigError, load_config
+from config import AppConfig, ConfigError, load_config, ssl_enabled_in
 
 
 def test_load_config_parses_linuxpath_among_noise(tmp_path: Path) -> None:
@@ -130,3 +130,13 @@ def test_load_config_unsupported_search_algo_raises(tmp_path: Path) -> None:
 
     with pytest.raises(ConfigError, match="Unsupported search_algo"):
         load_config(cfg)
+
+
+def test_ssl_enabled_in_reads_only_that_key(tmp_path: Path) -> None:
+    """Ensure ssl_enabled_in() needs no other valid keys."""
+    cfg = tmp_path / "app.conf"
+    cfg.write_text("# ssl_enabled=True\nfoo=bar\n", encoding="utf-8")
+    assert ssl_enabled_in(cfg) is False
+
+    cfg.write_text("ssl_enabled=False\nssl_enabled = yes\n", encoding="utf-8")
+    assert ssl_enabled_in(cfg) is True
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Persistent client tests.
+
+These tests validate that LookupClient:
+- Sends several queries over one connection.
+- Returns each response ending with the matching result line.
+- Reports a refused connection when it is constructed.
+- Falls through to the next resolved address when one is unreachable.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import socket
+
+import pytest
+
+from client import LookupClient
+
+
+def _get_free_port() -> int:
+    """Return an unused TCP port bound on localhost."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return int(s.getsockname()[1])
+
+
+def test_lookup_client_reuses_one_connection(
+    shared_server: tuple[str, int, Path],
+) -> None:
+    """Verify consecutive lookups share a connection and get own results."""
+    host, port, _data_file = shared_server
+
+    with LookupClient(host, port) as client:
+        first = client.lookup("hello")
+        second = client.lookup("missing")
+        third = client.lookup("world")
+
+    assert first.startswith(b"DEBUG:")
+    assert first.endswith(b"STRING EXISTS\n")
+    assert second.endswith(b"STRING NOT FOUND\n")
+    assert third.endswith(b"STRING EXISTS\n")
+
+
+def test_lookup_client_fails_fast_when_refused() -> None:
+    """Verify connect errors surface from the constructor, not lookup()."""
+    # Nothing listens on a port that was just released.
+    with pytest.raises(ConnectionRefusedError):
+        LookupClient("127.0.0.1", _get_free_port())
+
+
+def test_lookup_client_tries_each_resolved_address(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Verify an unreachable first address falls through to the next one."""
+    dead_port = _get_free_port()
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        listener.settimeout(5.0)
+        live_port = listener.getsockname()[1]
+
+        def fake_getaddrinfo(*_args: object, **_kwargs: object) -> list:
+            return [
+                (socket.AF_INET, socket.SOCK_STREAM, 0, "", ("127.0.0.1", p))
+                for p in (dead_port, live_port)
+            ]
+
+        monkeypatch.setattr("client._ADDR_CACHE", {})
+        monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+
+        with LookupClient("server.invalid", live_port):
+            conn, _addr = listener.accept()
+            conn.close()
@@ -5,21 +5,28 @@ Tests for reread_on_query behavior.
 These tests verify that the SearchEngine correctly reflects file changes
 depending on the reread_on_query configuration:
 - When True, file changes are visible immediately.
+- mmap_scan with rereads survives the file being truncated mid-query.
 - When False, cached results remain unchanged until restart/warmup.
+- Scanning algorithms memoize repeated queries only when False.
+- Cached algorithms are rejected with reread_on_query=True at construction.
 """
 
 from __future__ import annotations
 
+import dataclasses
+import threading
 from pathlib import Path
 
+import pytest
+
 from config import AppConfig
-from search_engine import SearchEngine
+from search_engine import EngineError, SearchEngine
 
 
 def test_reread_true_sees_file_changes(tmp_path: Path) -> None:
     """Ensure reread_on_query=True reflects file changes immediately."""
     data = tmp_path / "data.txt"
-    data.write_text("alpha\n", encoding="utf-8")
+    data.write_bytes(b"alpha\n")
 
     cfg = AppConfig(
         linuxpath=data,
@@ -31,7 +38,7 @@ def test_reread_true_sees_file_changes(tmp_path: Path) -> None:
     assert engine.exists("beta") is False
 
     # Modify file after engine creation.
-    data.write_text("alpha\nbeta\n", encoding="utf-8")
+    data.write_bytes(b"alpha\nbeta\n")
 
     # reread_on_query=True must see the new content.
     assert engine.exists("beta") is True
@@ -43,7 +50,7 @@ def test_reread_false_does_not_see_changes_without_restart(
     """Ensure reread_on_query=False
     does not reflect file changes without restart."""
     data = tmp_path / "data.txt"
-    data.write_text("alpha\n", encoding="utf-8")
+    data.write_bytes(b"alpha\n")
 
     cfg = AppConfig(
         linuxpath=data,
@@ -56,7 +63,110 @@ def test_reread_false_does_not_see_changes_without_restart(
     assert engine.exists("beta") is False
 
     # Modify file after warmup.
-    data.write_text("alpha\nbeta\n", encoding="utf-8")
+    data.write_bytes(b"alpha\nbeta\n")
 
     # reread_on_query=False should still return cached results.
     assert engine.exists("beta") is False
+
+
+def test_reread_true_mmap_scan_sees_file_changes(tmp_path: Path) -> None:
+    """Ensure mmap_scan with rereads follows rewrites of the file."""
+    data = tmp_path / "data.txt"
+    data.write_bytes(b"alpha\n")
+
+    cfg = AppConfig(
+        linuxpath=data,
+        reread_on_query=True,
+        search_algo="mmap_scan",
+    )
+    engine = SearchEngine.from_config(cfg)
+
+    assert engine.exists("alpha") is True
+    assert engine.exists("beta") is False
+
+    data.write_bytes(b"gamma\nbeta\n")
+    assert engine.exists("beta") is True
+    assert engine.exists("alpha") is False
+
+    data.write_bytes(b"")
+    assert engine.exists("beta") is False
+    engine.close()
+
+
+def test_reread_true_mmap_scan_survives_truncation(tmp_path: Path) -> None:
+    """Ensure mmap_scan queries survive in-place truncation of the file.
+
+    A writer thread keeps truncating and refilling the file while queries
+    run. A scan over a mapping would fault (SIGBUS) on pages past the new
+    end of the file; reading it only sees less data.
+    """
+    data = tmp_path / "data.txt"
+    content = b"".join(b"line%d\n" % i for i in range(100_000))
+    data.write_bytes(content)
+
+    cfg = AppConfig(
+        linuxpath=data,
+        reread_on_query=True,
+        search_algo="mmap_scan",
+    )
+    engine = SearchEngine.from_config(cfg)
+    stop = threading.Event()
+
+    def truncate_and_refill() -> None:
+        while not stop.is_set():
+            with data.open("r+b") as f:
+                f.truncate(0)
+                f.write(content)
+
+    writer = threading.Thread(target=truncate_and_refill)
+    writer.start()
+    try:
+        # "line" starts every line, so each scan checks many candidates.
+        for _ in range(20):
+            assert engine.exists("line") is False
+    finally:
+        stop.set()
+        writer.join()
+
+    assert engine.exists("line99999") is True
+    engine.close()
+
+
+def test_reread_false_scan_memoizes_repeated_queries(tmp_path: Path) -> None:
+    """Ensure repeated queries are answered from the memo without rereads."""
+    data = tmp_path / "data.txt"
+    data.write_bytes(b"alpha\n")
+
+    cfg = AppConfig(
+        linuxpath=data,
+        reread_on_query=False,
+        search_algo="linear_scan",
+    )
+    engine = SearchEngine.from_config(cfg)
+
+    assert engine.exists("alpha") is True
+    data.write_bytes(b"beta\n")
+
+    # The repeat is memoized; a new query still scans the file.
+    assert engine.exists("alpha") is True
+    assert engine.exists("beta") is True
+
+
+def test_incompatible_mode_is_rejected_once_at_construction(
+    tmp_path: Path,
+) -> None:
+    """Ensure the mode is validated up front and cannot change afterwards."""
+    data = tmp_path / "data.txt"
+    data.write_bytes(b"alpha\n")
+
+    with pytest.raises(EngineError, match="not compatible"):
+        SearchEngine(
+            file_path=data, reread_on_query=True, search_algo="set_cache"
+        )
+
+    engine = SearchEngine(
+        file_path=data, reread_on_query=False, search_algo="set_cache"
+    )
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        engine.reread_on_query = True  # type: ignore[misc]
+    assert engine.exists("alpha") is True
@@ -11,18 +11,59 @@ These tests ensure that all search algorithms:
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any, Callable, Iterator
 
 import pytest
 
+import search
 from search import (
+    BloomFilter,
+    GrepWorker,
+    HashSetCache,
+    build_bloom_sorted_list,
+    build_eytzinger_list,
+    build_hash_set,
     build_set_cache,
+    build_sorted_arena,
     build_sorted_list,
+    search_bloom_bisect,
+    search_eytzinger,
+    search_grep_fx,
+    search_hash_set,
     search_linear_scan,
     search_set_cache,
+    search_sorted_arena,
     search_sorted_bisect,
 )
 from config import AppConfig
-from search_engine import SearchEngine
+from search_engine import ALL_ALGOS, REREAD_ALGOS, SearchEngine
+
+# A search function paired with the index it queries.
+IndexedSearch = tuple[Callable[[Any, str], bool], Any]
+
+
+@pytest.fixture(scope="module")
+def alpha_beta_gamma_indexes(
+    alpha_beta_gamma_file: Path,
+) -> Iterator[list[IndexedSearch]]:
+    """Build every in-memory index over the shared file once per module.
+
+    Yields:
+        (search function, index) pairs, one per indexed algorithm.
+    """
+    data = alpha_beta_gamma_file
+    fingerprints = build_hash_set(data)
+    try:
+        yield [
+            (search_set_cache, build_set_cache(data)),
+            (search_sorted_bisect, build_sorted_list(data)),
+            (search_eytzinger, build_eytzinger_list(data)),
+            (search_bloom_bisect, build_bloom_sorted_list(data)),
+            (search_sorted_arena, build_sorted_arena(data)),
+            (search_hash_set, fingerprints),
+        ]
+    finally:
+        fingerprints.close()
 
 
 @pytest.mark.parametrize(
@@ -30,31 +71,74 @@ from search_engine import SearchEngine
     [("beta", True), ("bet", False), ("beta ", False)],
 )
 def test_algorithms_exact_match_consistency(
-    tmp_path: Path,
+    alpha_beta_gamma_file: Path,
+    alpha_beta_gamma_indexes: list[IndexedSearch],
     query: str,
     expected: bool,
 ) -> None:
     """Ensure all algorithms enforce exact full-line matching."""
+    assert search_linear_scan(alpha_beta_gamma_file, query) is expected
+
+    for search_fn, index in alpha_beta_gamma_indexes:
+        assert search_fn(index, query) is expected, search_fn.__name__
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    """Ensure every added value passes the filter, even in a tiny one."""
+    bloom = BloomFilter(m_bits=64)
+    values = [f"{i};{i * 7};" for i in range(200)] + ["", "é"]
+    for value in values:
+        bloom.add(value)
+
+    assert all(bloom.might_contain(value) for value in values)
+    assert BloomFilter().might_contain("anything") is False
+
+
+def test_hash_set_verifies_collisions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Ensure fingerprint collisions are resolved by reading the line."""
     data = tmp_path / "data.txt"
-    data.write_text("alpha\nbeta\ngamma\n", encoding="utf-8")
+    data.write_bytes(b"alpha\r\nbeta\nbeta\nbetamax")
+
+    # Every line and query shares one fingerprint, so only the
+    # verification read can tell them apart.
+    monkeypatch.setattr(search, "hash", lambda value: 7, raising=False)
+    cache = HashSetCache(data)
+    try:
+        for query in ["alpha", "beta", "betamax"]:
+            assert query in cache
+        for query in ["alph", "bet", "betam", "gamma", ""]:
+            assert query not in cache
+    finally:
+        cache.close()
 
-    assert search_linear_scan(data, query) is expected
 
-    cache = build_set_cache(data)
-    assert search_set_cache(cache, query) is expected
+@pytest.mark.parametrize("n", [0, 1, 2, 7, 8, 9, 31])
+def test_ordered_layouts_match_membership(tmp_path: Path, n: int) -> None:
+    """Ensure Eytzinger and arena lookups agree with membership at any size."""
+    words = [f"w{i:02d}" for i in range(0, 2 * n, 2)]
+    data = tmp_path / "data.txt"
+    data.write_text("".join(f"{w}\n" for w in words), encoding="utf-8")
 
-    sorted_lines = build_sorted_list(data)
-    assert search_sorted_bisect(sorted_lines, query) is expected
+    layout = build_eytzinger_list(data)
+    arena_index = build_sorted_arena(data)
+    for i in range(-1, 2 * n + 1):
+        query = f"w{i:02d}"
+        assert search_eytzinger(layout, query) is (query in words)
+        assert search_sorted_arena(arena_index, query) is (query in words)
 
 
 @pytest.mark.parametrize(
     "algo",
     ["linear_scan", "mmap_scan", "grep_fx"],
 )
-def test_reread_algorithms_consistency(tmp_path: Path, algo: str) -> None:
+def test_reread_algorithms_consistency(
+    alpha_beta_gamma_file: Path,
+    algo: str,
+) -> None:
     """Ensure reread-based algorithms behave consistently via SearchEngine."""
-    data = tmp_path / "data.txt"
-    data.write_text("alpha\nbeta\ngamma\n", encoding="utf-8")
+    data = alpha_beta_gamma_file
 
     cfg = AppConfig(
         linuxpath=data,
@@ -65,3 +149,73 @@ def test_reread_algorithms_consistency(tmp_path: Path, algo: str) -> None:
 
     assert engine.exists("beta") is True
     assert engine.exists("bet") is False
+
+
+@pytest.mark.parametrize(
+    "algo, reread_on_query",
+    [(algo, True) for algo in sorted(REREAD_ALGOS)]
+    + [(algo, False) for algo in sorted(ALL_ALGOS)],
+)
+def test_algorithms_agree_on_lines_that_are_not_utf8(
+    tmp_path: Path, algo: str, reread_on_query: bool
+) -> None:
+    """Ensure every algorithm matches invalid UTF-8 as it decodes.
+
+    Lines are read with errors="replace" and the server decodes queries the
+    same way, so the Latin-1 line b"caf\\xe9" is found as "caf\\ufffd".
+    """
+    data = tmp_path / "data.txt"
+    data.write_bytes(b"alpha\ncaf\xe9\ncaf\xc3\xa9\nmark\xef\xbf\xbd\n")
+
+    cfg = AppConfig(
+        linuxpath=data, reread_on_query=reread_on_query, search_algo=algo
+    )
+    engine = SearchEngine.from_config(cfg)
+
+    expected = {
+        "caf\ufffd": True,
+        "café": True,
+        "mark\ufffd": True,
+        "caf\ufffd\ufffd": False,
+        "caf": False,
+    }
+    try:
+        for query, found in expected.items():
+            assert engine.exists(query) is found, query
+        # Enough queries for the single-pass batch scans.
+        queries = list(expected) * 2
+        assert engine.exists_batch(queries) == [expected[q] for q in queries]
+    finally:
+        engine.close()
+
+
+def test_grep_worker_matches_one_shot_grep(tmp_path: Path) -> None:
+    """The persistent grep worker answers like the one-shot path."""
+    data = tmp_path / "data.txt"
+    data.write_text("alpha\n\nb.t*\n-e\nsp ace\n", encoding="utf-8")
+
+    worker = GrepWorker(data)
+    try:
+        for query in ["alpha", "", "b.t*", "bat", "-e", "sp ace", "alph"]:
+            assert worker.exists(query) is search_grep_fx(data, query)
+        assert worker.exists("\r") is False
+    finally:
+        worker.close()
+
+    # After close() lookups go through the one-shot fallback.
+    assert worker.exists("alpha") is True
+
+
+@pytest.mark.parametrize("algo", ["linear_scan", "mmap_scan"])
+def test_exists_batch_matches_exists(tmp_path: Path, algo: str) -> None:
+    """Ensure a batched single-pass lookup agrees with per-query lookups."""
+    data = tmp_path / "data.txt"
+    data.write_bytes(b"alpha\r\nbeta\n\ngamma\rdelta")
+
+    cfg = AppConfig(linuxpath=data, reread_on_query=True, search_algo=algo)
+    engine = SearchEngine.from_config(cfg)
+
+    queries = ["alpha", "beta", "", "gamma", "delta", "gam", "alpha\r"] * 2
+    assert engine.exists_batch(queries) == [
+        engine.exists(query) for query in queries
+    ]
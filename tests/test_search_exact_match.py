@@ -13,21 +13,20 @@ from pathlib import Path
 
 import pytest
 
-from search import SearchError, search_linear_scan
+import search
+from search import SearchError, search_linear_scan, search_mmap_scan
 
 
-def test_exact_match_found(tmp_path: Path) -> None:
+def test_exact_match_found(alpha_beta_gamma_file: Path) -> None:
     """Ensure an exact full-line match is detected."""
-    data = tmp_path / "data.txt"
-    data.write_text("alpha\nbeta\ngamma\n", encoding="utf-8")
+    data = alpha_beta_gamma_file
 
     assert search_linear_scan(data, "beta") is True
 
 
-def test_partial_match_not_found(tmp_path: Path) -> None:
+def test_partial_match_not_found(alpha_beta_gamma_file: Path) -> None:
     """Ensure partial and substring matches are not treated as valid hits."""
-    data = tmp_path / "data.txt"
-    data.write_text("alpha\nbeta\ngamma\n", encoding="utf-8")
+    data = alpha_beta_gamma_file
 
     assert search_linear_scan(data, "bet") is False
     assert search_linear_scan(data, "beta ") is False
@@ -35,6 +34,40 @@ def test_partial_match_not_found(tmp_path: Path) -> None:
     assert search_linear_scan(data, "betax") is False
 
 
+@pytest.mark.parametrize("chunk_bytes", [1, 3, 1 << 20])
+def test_match_across_chunks_and_line_endings(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    chunk_bytes: int,
+) -> None:
+    """Ensure matches straddling read chunks and CRLF lines are found."""
+    monkeypatch.setattr(search, "LINEAR_SCAN_CHUNK_BYTES", chunk_bytes)
+    data = tmp_path / "data.txt"
+    data.write_bytes(b"xbeta\r\nbeta\r\nalphabet\n\ngamma")
+
+    assert search_linear_scan(data, "beta") is True
+    assert search_linear_scan(data, "gamma") is True
+    assert search_linear_scan(data, "") is True
+    assert search_linear_scan(data, "alpha") is False
+    assert search_linear_scan(data, "bet") is False
+
+
+def test_mmap_scan_skips_mid_line_and_prefix_candidates(
+    tmp_path: Path,
+) -> None:
+    """Ensure mmap_scan only accepts candidates bounded as whole lines."""
+    data = tmp_path / "data.txt"
+    data.write_bytes(b"beta\rx\nxbeta\nbetax\nbeta\r\nlast\nbeta")
+
+    assert search_mmap_scan(data, "beta") is True
+    assert search_mmap_scan(data, "last") is True
+    assert search_mmap_scan(data, "bet") is False
+    assert search_mmap_scan(data, "x") is False
+
+    data.write_bytes(b"beta\rx\nxbeta\nbetax\n")
+    assert search_mmap_scan(data, "beta") is False
+
+
 def test_missing_file_raises(tmp_path: Path) -> None:
     """Ensure missing data files raise SearchError."""
     missing = tmp_path / "missing.txt"
@@ -8,20 +8,25 @@ required configuration files are missing or invalid.
 
 from __future__ import annotations
 
-import subprocess
 import sys
 from pathlib import Path
 
+import pytest
 
-def test_server_exits_with_error_when_config_missing(tmp_path: Path) -> None:
+from server import main
+
+
+def test_server_exits_with_error_when_config_missing(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
     """Ensure the server exits with an error
     when the config file is missing."""
     missing_cfg = tmp_path / "missing.conf"
-
-    proc = subprocess.Popen(
+    monkeypatch.setattr(
+        sys,
+        "argv",
         [
-            sys.executable,
-            "-m",
             "server",
             "--host",
             "127.0.0.1",
@@ -30,14 +35,16 @@ def test_server_exits_with_error_when_config_missing(tmp_path: Path) -> None:
             "--config",
             str(missing_cfg),
         ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
     )
 
-    out, err = proc.communicate(timeout=2)
-    assert proc.returncode != 0
+    # main() runs in-process: the failure happens before any socket or
+    # thread exists, so a child interpreter would only add startup time.
+    # SystemExit with a message exits non-zero and prints it to stderr.
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code not in (0, None)
 
-    combined = (out + "\n" + err).lower()
-    assert "config error" in combined
-    assert "not found" in combined
+    message = str(exc_info.value).lower()
+    assert "config error" in message
+    assert "not found" in message
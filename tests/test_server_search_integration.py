@@ -14,53 +14,172 @@ import subprocess
 import sys
 import time
 from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from client import recv_until_result
 
 RESULT_EXISTS = b"STRING EXISTS\n"
 RESULT_NOT_FOUND = b"STRING NOT FOUND\n"
 
 
-def _get_free_port() -> int:
-    """Return an unused TCP port bound on localhost."""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.bind(("127.0.0.1", 0))
-        return int(s.getsockname()[1])
+def test_server_matches_exact_lines_only(
+    shared_server: tuple[str, int, Path],
+) -> None:
+    """Ensure EXISTS needs a full-line match and partial queries get NOT FOUND.
 
+    The queries are sent one at a time, each after the previous reply, over
+    a single persistent connection.
+    """
+    host, port, _data_file = shared_server
+
+    cases = [
+        (b"two\n", "STRING EXISTS\n"),
+        (b"tw\n", "STRING NOT FOUND\n"),
+        (b"three\n", "STRING EXISTS\n"),
+        (b"hell\n", "STRING NOT FOUND\n"),
+    ]
+
+    with socket.create_connection((host, port), timeout=3) as s:
+        s.settimeout(3)
+        for query, result in cases:
+            s.sendall(query)
+            data = recv_until_result(s).decode("utf-8", errors="replace")
+            assert data.startswith("DEBUG:"), query
+            assert data.endswith(result), query
+
+
+def test_server_answers_pipelined_queries_in_order(
+    shared_server: tuple[str, int, Path],
+) -> None:
+    """Ensure queries sent in one write are each answered, in order."""
+    host, port, _data_file = shared_server
+
+    queries = ["one", "tw", "three", "x" * 2000, "two"] * 4
+    expected = [
+        RESULT_EXISTS, RESULT_NOT_FOUND, RESULT_EXISTS,
+        RESULT_NOT_FOUND, RESULT_EXISTS,
+    ] * 4
+
+    with socket.create_connection((host, port), timeout=3) as s:
+        s.settimeout(3)
+        s.sendall("".join(f"{q}\n" for q in queries).encode("utf-8"))
+        raw = b""
+        while raw.count(b"\nSTRING ") < len(queries):
+            part = s.recv(4096)
+            if not part:
+                break
+            raw += part
+
+    results = [
+        line + b"\n"
+        for line in raw.split(b"\n")
+        if line.startswith(b"STRING ")
+    ]
+    assert results == expected
+    assert raw.count(b"DEBUG:") == len(queries)
+
+
+def test_server_debug_line_echoes_query_repr(
+    shared_server: tuple[str, int, Path],
+) -> None:
+    """Ensure each DEBUG line shows the client ip and repr() of the query."""
+    host, port, _data_file = shared_server
+
+    queries = [
+        "hello", "it's", 'say "hi"', "back\\slash", "tab\there", "caf\u00e9",
+    ]
+
+    with socket.create_connection((host, port), timeout=3) as s:
+        s.settimeout(3)
+        s.sendall("".join(f"{q}\n" for q in queries).encode("utf-8"))
+        raw = b""
+        while raw.count(b"\nSTRING ") < len(queries):
+            part = s.recv(4096)
+            if not part:
+                break
+            raw += part
+
+    debug = [
+        line for line in raw.split(b"\n") if line.startswith(b"DEBUG:")
+    ]
+    assert len(debug) == len(queries)
+    for line, query in zip(debug, queries):
+        prefix = f"DEBUG: ip=127.0.0.1 query={query!r} elapsed_ms="
+        assert line.decode("utf-8").startswith(prefix)
+        float(line.rsplit(b"=", 1)[1])
+
+
+def test_server_without_debug_sends_only_results(
+    tmp_path: Path,
+    wait_for_port: Callable[..., None],
+    free_port: int,
+) -> None:
+    """Ensure --no-debug replies carry result lines and no DEBUG lines."""
+    port = free_port
 
-def _recv_until_result(conn: socket.socket, bufsize: int = 4096) -> bytes:
-    """Read from a socket until a terminal result line is observed.
+    data_file = tmp_path / "data.txt"
+    data_file.write_text("one\ntwo\n", encoding="utf-8")
 
-    The server may keep the connection open, so EOF is not guaranteed.
-    This helper reads until it detects one of the protocol result
-    terminators or a safety limit is reached.
+    cfg_file = tmp_path / "app.conf"
+    cfg_file.write_text(
+        f"linuxpath={data_file}\n"
+        "reread_on_query=False\n"
+        "search_algo=set_cache\n",
+        encoding="utf-8",
+    )
 
-    Args:
-        conn: Connected client socket.
-        bufsize: Bytes per recv() call.
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "server",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--config",
+            str(cfg_file),
+            "--no-debug",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
 
-    Returns:
-        Bytes received up to and including the first detected result line.
-    """
-    buf = b""
-    while True:
-        part = conn.recv(bufsize)
-        if not part:
-            break
+    queries = ["one", "x" * 2000, "three", "two"]
+    expected = RESULT_EXISTS + RESULT_NOT_FOUND * 2 + RESULT_EXISTS
 
-        buf += part
+    try:
+        wait_for_port(port, proc)
 
-        if RESULT_EXISTS in buf or RESULT_NOT_FOUND in buf:
-            break
+        with socket.create_connection(("127.0.0.1", port), timeout=3) as s:
+            s.settimeout(3)
+            s.sendall("".join(f"{q}\n" for q in queries).encode("utf-8"))
+            raw = b""
+            while len(raw) < len(expected):
+                part = s.recv(4096)
+                if not part:
+                    break
+                raw += part
 
-        # Safety: prevent unbounded growth if something goes wrong.
-        if len(buf) > 1024 * 1024:
-            break
+        assert raw == expected
 
-    return buf
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
 
 
-def test_server_returns_exists_for_exact_line(tmp_path: Path) -> None:
-    """Ensure the server returns EXISTS for an exact full-line match."""
-    port = _get_free_port()
+def test_server_serves_more_connections_than_workers(
+    tmp_path: Path,
+    wait_for_port: Callable[..., None],
+    free_port: int,
+) -> None:
+    """Ensure idle persistent connections do not hold worker threads."""
+    port = free_port
 
     data_file = tmp_path / "data.txt"
     data_file.write_text("one\ntwo\nthree\n", encoding="utf-8")
@@ -68,8 +187,8 @@ def test_server_returns_exists_for_exact_line(tmp_path: Path) -> None:
     cfg_file = tmp_path / "app.conf"
     cfg_file.write_text(
         f"linuxpath={data_file}\n"
-        "reread_on_query=True\n"
-        "search_algo=linear_scan\n",
+        "reread_on_query=False\n"
+        "search_algo=set_cache\n",
         encoding="utf-8",
     )
 
@@ -84,23 +203,29 @@ def test_server_returns_exists_for_exact_line(tmp_path: Path) -> None:
             str(port),
             "--config",
             str(cfg_file),
+            "--workers",
+            "2",
         ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
     )
 
     try:
-        time.sleep(0.3)
+        wait_for_port(port, proc)
 
-        with socket.create_connection(("127.0.0.1", port), timeout=3) as s:
-            s.settimeout(3)
-            s.sendall(b"two\n")
-            raw = _recv_until_result(s)
-
-        data = raw.decode("utf-8", errors="replace")
-        assert "DEBUG:" in data
-        assert data.endswith("STRING EXISTS\n")
+        conns = [
+            socket.create_connection(("127.0.0.1", port), timeout=3)
+            for _ in range(8)
+        ]
+        try:
+            # Query the newest connections first, while the others idle.
+            for s in reversed(conns):
+                s.settimeout(3)
+                s.sendall(b"two\n")
+                assert recv_until_result(s).endswith(RESULT_EXISTS)
+        finally:
+            for s in conns:
+                s.close()
 
     finally:
         proc.terminate()
@@ -110,18 +235,28 @@ def test_server_returns_exists_for_exact_line(tmp_path: Path) -> None:
             proc.kill()
 
 
-def test_server_returns_not_found_for_partial(tmp_path: Path) -> None:
-    """Ensure the server returns NOT FOUND for partial or substring queries."""
-    port = _get_free_port()
+@pytest.mark.parametrize("algo", ["set_cache", "grep_fx"])
+def test_server_processes_share_port_and_stop_together(
+    tmp_path: Path,
+    algo: str,
+    wait_for_port: Callable[..., None],
+    free_port: int,
+) -> None:
+    """Ensure --processes servers answer on one port and exit on SIGTERM.
+
+    The children are forked after warmup; grep_fx checks that each one
+    gets a working grep worker of its own.
+    """
+    port = free_port
 
     data_file = tmp_path / "data.txt"
-    data_file.write_text("one\ntwo\nthree\n", encoding="utf-8")
+    data_file.write_text("one\ntwo\n", encoding="utf-8")
 
     cfg_file = tmp_path / "app.conf"
     cfg_file.write_text(
         f"linuxpath={data_file}\n"
-        "reread_on_query=True\n"
-        "search_algo=linear_scan\n",
+        "reread_on_query=False\n"
+        f"search_algo={algo}\n",
         encoding="utf-8",
     )
 
@@ -136,27 +271,58 @@ def test_server_returns_not_found_for_partial(tmp_path: Path) -> None:
             str(port),
             "--config",
             str(cfg_file),
+            "--processes",
+            "3",
         ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
     )
 
     try:
-        time.sleep(0.3)
+        wait_for_port(port, proc)
+
+        for _ in range(6):
+            with socket.create_connection(
+                ("127.0.0.1", port), timeout=3
+            ) as s:
+                s.settimeout(3)
+                s.sendall(b"two\n")
+                assert recv_until_result(s).endswith(RESULT_EXISTS)
+                s.sendall(b"tw\n")
+                assert recv_until_result(s).endswith(RESULT_NOT_FOUND)
 
-        with socket.create_connection(("127.0.0.1", port), timeout=3) as s:
-            s.settimeout(3)
-            s.sendall(b"tw\n")
-            raw = _recv_until_result(s)
+        proc.terminate()
+        proc.wait(timeout=5)
 
-        data = raw.decode("utf-8", errors="replace")
-        assert "DEBUG:" in data
-        assert data.endswith("STRING NOT FOUND\n")
+        # The forked servers were stopped along with the parent.
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            assert s.connect_ex(("127.0.0.1", port)) != 0
 
     finally:
-        proc.terminate()
-        try:
-            proc.wait(timeout=2)
-        except subprocess.TimeoutExpired:
+        if proc.poll() is None:
             proc.kill()
+
+
+def test_server_acks_partial_lines_without_delay(
+    shared_server: tuple[str, int, Path],
+) -> None:
+    """Ensure a query split over two writes is not stalled by delayed ACKs.
+
+    The client keeps Nagle's algorithm on, so its second write waits for
+    the ACK of the first; without TCP_QUICKACK that costs ~40 ms.
+    """
+    host, port, _data_file = shared_server
+
+    with socket.create_connection((host, port), timeout=3) as s:
+        s.settimeout(3)
+        timings = []
+        for _ in range(30):
+            start = time.perf_counter()
+            s.sendall(b"one;")
+            s.sendall(b"two\n")
+            assert recv_until_result(s).endswith(RESULT_EXISTS)
+            timings.append(time.perf_counter() - start)
+
+    # Skip the connection's initial quick-ACK phase.
+    timings = sorted(timings[10:])
+    assert timings[len(timings) // 2] < 0.02
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""
+Tests for the server's per-connection receive buffer.
+
+These tests validate that _ClientSession:
+- Splits complete lines out of chunks and keeps a trailing partial line.
+- Grows for a line longer than the buffer and shrinks back afterwards.
+- Reports EOF as a read of zero bytes.
+"""
+
+from __future__ import annotations
+
+from server import RECV_BUFSIZE, _ClientSession
+
+
+class _ChunkedConn:
+    """Minimal socket stand-in returning predefined recv_into() chunks."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self._chunks = list(chunks)
+
+    def fileno(self) -> int:
+        """Return a placeholder descriptor."""
+        return -1
+
+    def recv_into(self, buffer: memoryview, nbytes: int = 0) -> int:
+        """Copy up to nbytes of the next chunk; return 0 once exhausted."""
+        if nbytes > len(buffer):
+            # Same check as socket.recv_into().
+            raise ValueError("buffer too small for requested bytes")
+        if not self._chunks:
+            return 0
+        chunk = self._chunks.pop(0)
+        size = min(len(chunk), nbytes or len(buffer), len(buffer))
+        buffer[:size] = chunk[:size]
+        if size < len(chunk):
+            self._chunks.insert(0, chunk[size:])
+        return size
+
+
+def test_lines_split_across_chunks_keep_partial_tail() -> None:
+    """Only complete lines are returned; the partial line waits."""
+    session = _ClientSession(
+        _ChunkedConn([b"one\ntw", b"o\r\nthr"]), "127.0.0.1"
+    )
+
+    assert session.recv() == 6
+    assert session.take_lines() == [b"one"]
+    assert session.recv() == 6
+    assert session.take_lines() == [b"two\r"]
+    assert session.take_lines() == []
+    assert bytes(session.buf[: session.end]) == b"thr"
+
+
+def test_long_line_grows_then_shrinks_buffer() -> None:
+    """A line longer than the buffer is kept whole, then memory is freed."""
+    long_line = b"x" * (RECV_BUFSIZE * 3)
+    session = _ClientSession(
+        _ChunkedConn([long_line, b"\nnext\n"]), "127.0.0.1"
+    )
+
+    while b"\n" not in session.buf[: session.end]:
+        assert session.recv() > 0
+
+    assert session.take_lines() == [long_line, b"next"]
+    assert len(session.buf) == RECV_BUFSIZE
+    assert session.end == 0
+
+
+def test_eof_reads_zero_bytes() -> None:
+    """A closed peer is reported as a zero-byte read."""
+    session = _ClientSession(_ChunkedConn([]), "127.0.0.1")
+
+    assert session.recv() == 0
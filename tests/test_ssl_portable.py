@@ -7,178 +7,361 @@ This test validates that:
   successfully communicate with it.
 - The provided client implementation, when configured with --config, can
   successfully connect and receive a well-formed response.
+- Clients that never complete a handshake do not tie up worker threads,
+  and are disconnected once the handshake timeout has passed.
+- A client that sends only part of a TLS record, or stops reading its
+  replies, does not hold a worker.
+- The server context offers only forward-secret AEAD suites for TLS 1.2.
 
-The test is portable: it skips unless cert/key files already exist in certs/.
+The test is portable: the cert and key are generated per session with
+the openssl CLI, and the TLS tests skip when it is not installed.
 """
 
 from __future__ import annotations
 
+import contextlib
 import socket
-import subprocess
+import ssl
 import sys
+import threading
 import time
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator
 
 import pytest
 
+import client
+from client import recv_until_result
+from config import AppConfig
+from search_engine import SearchEngine
+from server import (
+    ServerConfig,
+    TCPStringLookupServer,
+    _build_server_ssl_context,
+)
 
-def _get_free_port() -> int:
-    """Return an unused TCP port bound on localhost."""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.bind(("127.0.0.1", 0))
-        return int(s.getsockname()[1])
 
+@contextlib.contextmanager
+def _in_process_tls_server(
+    tmp_path: Path,
+    port: int,
+    tls_certs: tuple[Path, Path],
+    **cfg_fields: Any,
+) -> Iterator[None]:
+    """Run a TLS server on a background thread until the block exits.
 
-def _recv_all(conn: socket.socket, bufsize: int = 4096) -> bytes:
-    """Read all data from a socket until EOF.
+    Used where a test needs ServerConfig fields that have no command-line
+    flag. The data file holds the single line "hello".
 
     Args:
-        conn: Connected socket.
-        bufsize: Bytes per recv() call.
-
-    Returns:
-        All bytes received from the socket.
+        tmp_path: Directory for the data file.
+        port: Port to listen on.
+        tls_certs: (certfile, keyfile) for the server context.
+        **cfg_fields: Extra ServerConfig fields.
     """
-    chunks: list[bytes] = []
-    while True:
-        part = conn.recv(bufsize)
-        if not part:
-            break
-        chunks.append(part)
-    return b"".join(chunks)
+    certfile, keyfile = tls_certs
+    data_file = tmp_path / "data.txt"
+    data_file.write_text("hello\n", encoding="utf-8")
+
+    engine = SearchEngine.from_config(AppConfig(linuxpath=data_file))
+    ctx = _build_server_ssl_context(
+        SimpleNamespace(
+            ssl_enabled=True, ssl_certfile=certfile, ssl_keyfile=keyfile
+        )
+    )
+    server = TCPStringLookupServer(
+        ServerConfig(host="127.0.0.1", port=port, **cfg_fields),
+        engine=engine,
+        ssl_context=ctx,
+    )
+    thread = threading.Thread(target=server.start, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        server.stop()
+        thread.join(timeout=5)
 
 
-def _write_cfg(
+def _run_client(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    host: str,
+    port: int,
     cfg_file: Path,
-    data_file: Path,
-    *,
-    ssl_enabled: bool,
-    certfile: Path,
-    keyfile: Path,
-) -> None:
-    """Write a temporary config file used to start the TLS server.
+) -> str:
+    """Run the packaged client's main() in-process for the query "hello".
+
+    The client's TLS session cache is emptied first, so every call makes
+    a full handshake as a fresh `python -m client` process would.
 
     Args:
-        cfg_file: Output path for the config file.
-        data_file: Data file path referenced by linuxpath.
-        ssl_enabled: Whether to enable TLS.
-        certfile: Server certificate path.
-        keyfile: Server private key path.
+        monkeypatch: Fixture used to set sys.argv and reset the cache.
+        capsys: Fixture capturing what main() writes to stdout.
+        host: Server host.
+        port: Server port.
+        cfg_file: Client config file passed via --config.
+
+    Returns:
+        The client's stdout.
     """
-    cfg_file.write_text(
-        "\n".join(
-            [
-                f"linuxpath={data_file}",
-                "reread_on_query=True",
-                "search_algo=linear_scan",
-                f"ssl_enabled={'True' if ssl_enabled else 'False'}",
-                f"ssl_certfile={certfile}",
-                f"ssl_keyfile={keyfile}",
-                "ssl_verify=False",
-                "",
-            ]
-        ),
-        encoding="utf-8",
+    monkeypatch.setattr(client, "_TLS_SESSIONS", {})
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "client",
+            "--host",
+            host,
+            "--port",
+            str(port),
+            "--config",
+            str(cfg_file),
+            "hello",
+        ],
     )
+    capsys.readouterr()
+    client.main()
+    return capsys.readouterr().out
 
 
-def test_tls_enabled_requires_tls_client_or_it_resets(tmp_path: Path) -> None:
+def test_tls_enabled_requires_tls_client_or_it_resets(
+    tls_server: tuple[str, int, Path],
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
     """Verify TLS server rejects plain TCP and accepts the configured client.
 
-    The test starts a server with ssl_enabled=True
-        using existing cert/key files.
-    It then verifies:
+    The test uses the session's server with ssl_enabled=True, started
+    from a generated cert and key. It then verifies:
     1) A plain TCP client cannot successfully complete the request.
-    2) The packaged client with --config can connect and
-        receive a valid result.
+    2) The packaged client with --config can connect and receive a valid
+       result.
 
-    The test is skipped if certs are not present in certs/.
+    The test is skipped if openssl is not installed.
     """
-    port = _get_free_port()
+    host, port, cfg_file = tls_server
 
-    data_file = tmp_path / "data.txt"
-    data_file.write_text("hello\n", encoding="utf-8")
+    # The server resets a connection whose first bytes are not a
+    # ClientHello within about a millisecond; the short timeout only
+    # bounds how long a server that never answers can stall the test.
+    plain_failed = False
+    try:
+        with socket.create_connection((host, port), timeout=0.2) as s:
+            s.sendall(b"hello\n")
+            _ = recv_until_result(s)
+    except (ConnectionResetError, socket.timeout, OSError):
+        plain_failed = True
 
-    certfile = Path("certs/server.crt")
-    keyfile = Path("certs/server.key")
-    if not (certfile.exists() and keyfile.exists()):
-        pytest.skip(
-            "TLS cert/key not found in certs/. Generate certs to run test."
-        )
+    assert plain_failed is True
 
-    cfg_file = tmp_path / "app.conf"
-    _write_cfg(
-        cfg_file,
-        data_file,
-        ssl_enabled=True,
-        certfile=certfile,
-        keyfile=keyfile,
-    )
+    out = _run_client(monkeypatch, capsys, host, port, cfg_file)
+    assert "DEBUG:" in out
+    assert out.endswith(("STRING EXISTS\n", "STRING NOT FOUND\n"))
 
-    proc = subprocess.Popen(
-        [
-            sys.executable,
-            "-m",
-            "server",
-            "--host",
-            "127.0.0.1",
-            "--port",
-            str(port),
-            "--config",
-            str(cfg_file),
-        ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
 
+def test_tls_silent_clients_do_not_hold_workers(
+    tls_server: tuple[str, int, Path],
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Verify stalled handshakes leave the only worker free for others.
+
+    Several plain TCP connections are opened and never start a handshake;
+    with --workers 1, the packaged TLS client must still be answered well
+    before the handshake timeout would expire.
+    """
+    host, port, cfg_file = tls_server
+
+    silent = [
+        socket.create_connection((host, port), timeout=2)
+        for _ in range(3)
+    ]
     try:
-        time.sleep(0.35)
+        start = time.monotonic()
+        out = _run_client(monkeypatch, capsys, host, port, cfg_file)
+        elapsed = time.monotonic() - start
+    finally:
+        for s in silent:
+            s.close()
+
+    assert out.endswith("STRING EXISTS\n")
+    assert elapsed < 3.0
 
-        if proc.poll() is not None:
-            out, err = proc.communicate(timeout=1)
-            raise RuntimeError(
-                "Server exited early.\n"
-                f"--- stdout ---\n{out}\n"
-                f"--- stderr ---\n{err}\n"
-            )
 
-        plain_failed = False
+def test_tls_handshake_timeout_disconnects_stalled_clients(
+    tmp_path: Path,
+    wait_for_port: Callable[..., None],
+    free_port: int,
+    tls_certs: tuple[Path, Path],
+) -> None:
+    """Verify clients stalled mid-handshake are dropped at the deadline.
+
+    One client sends nothing at all and one sends a single byte of its
+    ClientHello; neither produces another readiness event, so the server
+    must enforce the deadline on its own.
+    """
+    timeout = 0.3
+    with _in_process_tls_server(
+        tmp_path, free_port, tls_certs, tls_handshake_timeout=timeout
+    ):
+        wait_for_port(free_port)
+        # wait_for_port()'s probe connection also starts a deadline.
+        start = time.monotonic()
+        silent = socket.create_connection(("127.0.0.1", free_port))
+        one_byte = socket.create_connection(("127.0.0.1", free_port))
         try:
-            with socket.create_connection(("127.0.0.1", port), timeout=2) as s:
-                s.settimeout(2)
-                s.sendall(b"hello\n")
-                _ = _recv_all(s)
-        except (ConnectionResetError, socket.timeout, OSError):
-            plain_failed = True
-
-        assert plain_failed is True
-
-        p2 = subprocess.run(
-            [
-                sys.executable,
-                "-m",
-                "client",
-                "--host",
-                "127.0.0.1",
-                "--port",
-                str(port),
-                "--config",
-                str(cfg_file),
-                "hello",
-            ],
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=5,
-        )
-        assert p2.returncode == 0, p2.stderr
-        assert "DEBUG:" in p2.stdout
-        assert p2.stdout.endswith(("STRING EXISTS\n", "STRING NOT FOUND\n"))
+            one_byte.sendall(b"\x16")
+            for s in (silent, one_byte):
+                s.settimeout(timeout + 2.0)
+                try:
+                    assert s.recv(1) == b""
+                except ConnectionResetError:
+                    pass
+            elapsed = time.monotonic() - start
+        finally:
+            silent.close()
+            one_byte.close()
 
-    finally:
-        proc.terminate()
+    assert timeout <= elapsed < timeout + 1.0
+
+
+def _tls_handshake_over_bio(
+    sock: socket.socket,
+) -> tuple[ssl.SSLObject, ssl.MemoryBIO]:
+    """Complete a client TLS handshake on sock through memory BIOs.
+
+    The caller can then encrypt data itself and choose how many of the
+    resulting record bytes to put on the wire.
+
+    Args:
+        sock: Connected blocking socket.
+
+    Returns:
+        The client SSLObject and its (now empty) outgoing BIO.
+    """
+    ctx = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    incoming, outgoing = ssl.MemoryBIO(), ssl.MemoryBIO()
+    tls = ctx.wrap_bio(incoming, outgoing)
+    while True:
         try:
-            proc.wait(timeout=2)
-        except subprocess.TimeoutExpired:
-            proc.kill()
+            tls.do_handshake()
+            break
+        except ssl.SSLWantReadError:
+            sock.sendall(outgoing.read())
+            data = sock.recv(65536)
+            if not data:
+                raise ConnectionError("server closed during handshake")
+            incoming.write(data)
+    sock.sendall(outgoing.read())
+    return tls, outgoing
+
+
+def test_tls_partial_record_does_not_hold_worker(
+    tmp_path: Path,
+    wait_for_port: Callable[..., None],
+    free_port: int,
+    tls_certs: tuple[Path, Path],
+) -> None:
+    """Verify a half-sent TLS record leaves the only worker free.
+
+    With workers=1, one client completes its handshake and then sends all
+    but the last byte of an encrypted query. A second client must still be
+    answered at once rather than after the first one's read times out.
+    """
+    with _in_process_tls_server(tmp_path, free_port, tls_certs, workers=1):
+        wait_for_port(free_port)
+        with socket.create_connection(
+            ("127.0.0.1", free_port), timeout=5
+        ) as stalled:
+            tls, outgoing = _tls_handshake_over_bio(stalled)
+            tls.write(b"hello\n")
+            stalled.sendall(outgoing.read()[:-1])
+            # Give the server time to pick up the partial record.
+            time.sleep(0.1)
+
+            ctx = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+            start = time.monotonic()
+            with ctx.wrap_socket(
+                socket.create_connection(("127.0.0.1", free_port), timeout=5)
+            ) as other:
+                other.sendall(b"hello\n")
+                reply = recv_until_result(other)
+            elapsed = time.monotonic() - start
+
+    assert reply.endswith(b"STRING EXISTS\n")
+    assert elapsed < 1.0
+
+
+def test_tls_unread_replies_do_not_hold_worker(
+    tmp_path: Path,
+    wait_for_port: Callable[..., None],
+    free_port: int,
+    tls_certs: tuple[Path, Path],
+) -> None:
+    """Verify a client that stops reading does not block the only worker.
+
+    Small socket buffers make the replies to one pipelined write overflow
+    them, so the server must park the rest of the reply and wait for the
+    socket to become writable. Meanwhile a second client is answered, and
+    the first still receives every reply once it reads.
+    """
+    ctx = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    queries = 2000
+
+    with _in_process_tls_server(
+        tmp_path, free_port, tls_certs, workers=1, socket_buffer_bytes=4096
+    ):
+        wait_for_port(free_port)
+        raw = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        raw.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        raw.settimeout(5)
+        raw.connect(("127.0.0.1", free_port))
+        with ctx.wrap_socket(raw) as slow:
+            slow.sendall(b"hello\n" * queries)
+            # Let the server fill the buffers and park the remainder.
+            time.sleep(0.2)
+
+            start = time.monotonic()
+            with ctx.wrap_socket(
+                socket.create_connection(("127.0.0.1", free_port), timeout=5)
+            ) as other:
+                other.sendall(b"hello\n")
+                reply = recv_until_result(other)
+            elapsed = time.monotonic() - start
+
+            received = b""
+            while received.count(b"STRING EXISTS\n") < queries:
+                part = slow.recv(65536)
+                if not part:
+                    break
+                received += part
+
+    assert reply.endswith(b"STRING EXISTS\n")
+    assert elapsed < 1.0
+    assert received.count(b"STRING EXISTS\n") == queries
+
+
+def test_server_context_offers_only_ecdhe_aead_suites(
+    tls_certs: tuple[Path, Path],
+) -> None:
+    """Verify the server context limits TLS 1.2 to ECDHE AEAD suites."""
+    certfile, keyfile = tls_certs
+
+    app_cfg = SimpleNamespace(
+        ssl_enabled=True, ssl_certfile=certfile, ssl_keyfile=keyfile
+    )
+    ctx = _build_server_ssl_context(app_cfg)
+
+    assert ctx is not None
+    for cipher in ctx.get_ciphers():
+        if cipher["protocol"] == "TLSv1.2":
+            assert cipher["name"].startswith("ECDHE-")
+            assert cipher["aead"]